@@ -1,7 +1,64 @@
-import pygame
+import time
+
+# 시작 시간 측정 기준 (--profile-startup)
+START_TIME = time.perf_counter()
+
+import argparse
+import importlib
 import sys
-from minesweeper_main import MainPage
+
+# 하위 명령 -> (인자를 정의하는 모듈, 도움말)
+# 모듈은 해당 명령을 실행할 때만 불러와서 게임 시작이 느려지지 않도록 함
+COMMANDS = {
+    "simulate": ("minesweeper_sim", "창 없이 게임 시뮬레이션 실행"),
+    "batch": ("minesweeper_batch", "보드 여러 개를 한꺼번에 진행하는 학습용 환경의 처리량 측정"),
+    "replay": ("minesweeper_replay", "리플레이 파일 재생"),
+    "export": ("minesweeper_export", "리플레이를 창 없이 이미지 시퀀스/RGB 스트림/썸네일로 내보내기"),
+    "stats": ("minesweeper_stats", "게임 통계와 난이도별 순위표 출력"),
+    "serve": ("minesweeper_server", "여러 게임 세션을 처리하는 서버 실행"),
+    "loadtest": ("minesweeper_loadtest", "가상 플레이어로 서버 처리량 측정"),
+}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="지뢰 찾기 게임")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="첫 화면이 그려질 때까지의 단계별 시간을 출력하고 종료")
+    subparsers = parser.add_subparsers(dest="command")
+
+    # 창 없이 게임 규칙만으로 대량 시뮬레이션, 기록된 게임 재생 (창에서 또는 창 없이 검증), 게임 서버
+    for name, (module, help) in COMMANDS.items():
+        command = subparsers.add_parser(name, help=help)
+        if name in argv:
+            importlib.import_module(module).add_arguments(command)
+
+    # 크기 제한이 없는 무한 모드
+    endless = subparsers.add_parser("endless", help="무한 모드로 시작")
+    endless.add_argument("--seed", type=int, default=None, help="세계 시드 (같은 시드는 같은 지뢰 배치)")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
-    # 메인 페이지 실행
-    MainPage()
+    args = parse_args(sys.argv[1:])
+    if args.profile_startup:
+        from minesweeper_perf import perf
+        perf.start_profile(START_TIME)
+    if args.command in COMMANDS:
+        sys.exit(importlib.import_module(COMMANDS[args.command][0]).main(args))
+    elif args.command == "endless":
+        from minesweeper_game import Minesweeper
+        from minesweeper_endless import EndlessGame
+        from minesweeper_scene import SceneManager
+        from minesweeper_perf import perf
+        perf.startup_mark("모듈 불러오기")
+        manager = SceneManager()
+        game = Minesweeper(manager=manager)
+        manager.push(game)
+        manager.push(EndlessGame(game, args.seed))
+        game.main_loop()
+    else:
+        # 메인 페이지 실행
+        from minesweeper_main import MainPage
+        from minesweeper_perf import perf
+        perf.startup_mark("모듈 불러오기")
+        MainPage()
@@ -0,0 +1,233 @@
+import time
+
+import numpy as np
+
+from minesweeper_engine import DIFFICULTY_LEVELS
+
+# 보상
+REWARD_WIN = 1.0
+REWARD_LOSS = -1.0
+REWARD_PROGRESS = 0.1  # 안전한 칸을 열었을 때
+REWARD_INVALID = -0.1  # 이미 열렸거나 깃발이 꽂힌 칸을 눌렀을 때 (아무 일도 일어나지 않음)
+
+
+def dilate(mask, height, width):
+    # (N, 칸 수) 불리언 배열의 각 칸을 주변 3x3 칸으로 넓힘
+    count = len(mask)
+    padded = np.zeros((count, height + 2, width + 2), dtype=bool)
+    padded[:, 1:-1, 1:-1] = mask.reshape(count, height, width)
+    result = padded[:, 1:-1, 1:-1].copy()
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                result |= padded[:, dr:dr + height, dc:dc + width]
+    return result.reshape(count, -1)
+
+
+class BatchEnv:
+    # 같은 크기의 보드 N개를 한꺼번에 진행하는 학습용 환경 (GameEngine과 같은 규칙)
+    # 보드 상태는 (N, 칸 수) 배열로 쌓아 두고, 단계마다 보드별 동작 하나씩을 한 번에 적용
+    # 동작: 0 <= a < 칸 수는 칸 a 좌클릭, 칸 수 <= a < 2 * 칸 수는 칸 (a - 칸 수) 깃발 토글
+    # 끝난 보드는 그 자리에서 새 게임으로 초기화되고, 지뢰는 첫 클릭 때 첫 클릭 주변을 피해 배치
+    def __init__(self, count, width, height, mines, seed=None):
+        cells = width * height
+        if not 0 <= mines <= cells - 9:
+            raise ValueError("지뢰 수가 보드 크기에 맞지 않습니다")
+        self.count = count
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.cells = cells
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.arange(count)
+
+        self.mine = np.zeros((count, cells), dtype=bool)
+        # 칸 자신을 포함한 3x3 지뢰 수 (0이면 지뢰가 아닌 빈 칸, 지뢰 칸의 값은 보이지 않음)
+        self.numbers = np.zeros((count, cells), dtype=np.uint8)
+        self.revealed = np.zeros((count, cells), dtype=bool)
+        self.flags = np.zeros((count, cells), dtype=bool)
+        self.first_click = np.ones(count, dtype=bool)
+        self.safe_left = np.full(count, cells - mines, dtype=np.int32)
+
+        # 칸별 3x3 이웃 칸 표 (보드 밖은 자기 자신으로 채움)
+        rows, cols = np.divmod(np.arange(cells), width)
+        neighbours = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = rows + dr, cols + dc
+                inside = (r >= 0) & (r < height) & (c >= 0) & (c < width)
+                neighbours.append(np.where(inside, r * width + c, np.arange(cells)))
+        self.neighbours = np.stack(neighbours, axis=1)
+
+        self.games = 0
+        self.wins = 0
+
+    @classmethod
+    def from_difficulty(cls, count, level, seed=None):
+        settings = DIFFICULTY_LEVELS[level]
+        return cls(count, settings["width"], settings["height"], settings["mines"], seed)
+
+    def place_mines(self, boards, first):
+        # 첫 클릭한 보드들의 지뢰를 한 번에 배치 (첫 클릭 칸과 주변 제외, 균등 무작위)
+        count = len(boards)
+        cells = self.cells
+        mine = np.zeros((count, cells), dtype=bool)
+        if self.mines:
+            keys = self.rng.random((count, cells), dtype=np.float32)
+            keys[np.arange(count)[:, None], self.neighbours[first]] = 2.0
+            positions = np.argpartition(keys, self.mines - 1, axis=1)[:, :self.mines]
+            mine[np.arange(count)[:, None], positions] = True
+
+        # 3x3 이웃 합으로 모든 칸의 주변 지뢰 수를 한 번에 계산
+        height, width = self.height, self.width
+        padded = np.zeros((count, height + 2, width + 2), dtype=np.uint8)
+        padded[:, 1:-1, 1:-1] = mine.reshape(count, height, width)
+        numbers = np.zeros((count, height, width), dtype=np.uint8)
+        for dr in range(3):
+            for dc in range(3):
+                numbers += padded[:, dr:dr + height, dc:dc + width]
+        numbers = numbers.reshape(count, cells)
+
+        self.mine[boards] = mine
+        self.numbers[boards] = numbers
+        self.safe_left[boards] = cells - self.mines
+        self.first_click[boards] = False
+
+    def open_cells(self, boards, starts):
+        # 빈 칸을 누른 보드들의 연쇄 열기를 한 번에 처리하고 새로 열린 칸 수 반환
+        # reveal()과 같은 칸을 여는 너비 우선 탐색을 단계별로 함: 직전 단계에 새로 열린 빈 칸의 주변 중
+        # 닫혀 있고 깃발이 없는 칸을 열고, 더 열리는 칸이 없는 보드는 다음 단계에서 뺌
+        count = len(boards)
+        zero = self.numbers[boards] == 0
+        closed = ~self.revealed[boards] & ~self.flags[boards]
+        opened = np.zeros_like(closed)
+        opened[np.arange(count), starts] = True
+        closed[np.arange(count), starts] = False
+        frontier = opened.copy()
+        active = np.arange(count)
+        while active.size:
+            grown = dilate(frontier[active] & zero[active], self.height, self.width) & closed[active]
+            opened[active] |= grown
+            closed[active] &= ~grown
+            frontier[active] = grown
+            active = active[grown.any(axis=1)]
+        self.revealed[boards] |= opened
+        return opened.sum(axis=1, dtype=np.int32)
+
+    def step(self, actions):
+        # 보드별 동작 하나씩을 적용하고 (관찰, 보상, 끝남, 승리) 반환
+        # 끝난 보드는 새 게임으로 초기화된 뒤의 관찰을 돌려줌
+        actions = np.asarray(actions, dtype=np.int64)
+        boards = self.boards
+        cells = self.cells
+        flag_action = actions >= cells
+        index = np.where(flag_action, actions - cells, actions)
+        revealed = self.revealed[boards, index]
+        flagged = self.flags[boards, index]
+        rewards = np.zeros(self.count, dtype=np.float32)
+        dones = np.zeros(self.count, dtype=bool)
+        wins = np.zeros(self.count, dtype=bool)
+
+        # 깃발 토글 (열린 칸은 무시)
+        toggle = flag_action & ~revealed
+        self.flags[boards[toggle], index[toggle]] = ~flagged[toggle]
+
+        # 좌클릭 (열렸거나 깃발이 꽂힌 칸은 무시)
+        click = ~flag_action & ~revealed & ~flagged
+        rewards[~flag_action & ~click] = REWARD_INVALID
+        if click.any():
+            first = click & self.first_click
+            if first.any():
+                self.place_mines(boards[first], index[first])
+            clicked = boards[click]
+            index = index[click]
+
+            # 지뢰를 클릭한 보드
+            hit = self.mine[clicked, index]
+            rewards[clicked[hit]] = REWARD_LOSS
+            dones[clicked[hit]] = True
+
+            # 숫자 칸은 그 칸만, 빈 칸은 연쇄로 열기
+            safe = clicked[~hit]
+            index = index[~hit]
+            zero = self.numbers[safe, index] == 0
+            opened = np.ones(len(safe), dtype=np.int32)
+            self.revealed[safe[~zero], index[~zero]] = True
+            if zero.any():
+                opened[zero] = self.open_cells(safe[zero], index[zero])
+            self.safe_left[safe] -= opened
+            rewards[safe] = REWARD_PROGRESS
+
+            # 지뢰가 아닌 칸이 모두 열렸으면 승리
+            won = safe[self.safe_left[safe] == 0]
+            rewards[won] = REWARD_WIN
+            dones[won] = True
+            wins[won] = True
+
+        if dones.any():
+            self.games += int(dones.sum())
+            self.wins += int(wins.sum())
+            self.reset(boards[dones])
+        return self.observe(), rewards, dones, wins
+
+    def reset(self, boards=None):
+        # 보드를 새 게임으로 초기화 (boards가 없으면 전체), 지뢰는 다음 첫 클릭 때 배치
+        if boards is None:
+            boards = self.boards
+        self.mine[boards] = False
+        self.revealed[boards] = False
+        self.flags[boards] = False
+        self.first_click[boards] = True
+        self.safe_left[boards] = self.cells - self.mines
+
+    def observe(self):
+        # (보이는 숫자, 열린 칸, 깃발) 각각 (N, 세로, 가로) 배열
+        # 닫힌 칸의 숫자는 0, 열린 칸/깃발 배열은 다음 단계에서 바뀌는 내부 배열을 그대로 보여 줌
+        shape = (self.count, self.height, self.width)
+        numbers = self.numbers * self.revealed
+        return numbers.reshape(shape), self.revealed.reshape(shape), self.flags.reshape(shape)
+
+    def random_actions(self):
+        # 보드마다 닫혀 있고 깃발이 없는 칸 하나를 무작위로 고른 좌클릭 동작
+        keys = self.rng.random((self.count, self.cells), dtype=np.float32)
+        keys[self.revealed | self.flags] = 2.0
+        return keys.argmin(axis=1)
+
+
+def run_batch(settings, boards, steps, seed=0):
+    # 무작위 플레이어로 steps 단계를 진행하고 처리량 요약 반환 (환경 시간만 따로 측정)
+    env = BatchEnv(boards, settings["width"], settings["height"], settings["mines"], seed)
+    env_seconds = 0.0
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = env.random_actions()
+        step_start = time.perf_counter()
+        env.step(actions)
+        env_seconds += time.perf_counter() - step_start
+    elapsed = time.perf_counter() - start
+    total = boards * steps
+    return {
+        "boards": boards,
+        "steps": total,
+        "games": env.games,
+        "wins": env.wins,
+        "seconds": elapsed,
+        "steps_per_second": total / env_seconds if env_seconds > 0 else 0.0,
+        "steps_per_second_with_policy": total / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("--difficulty", default="고급", choices=list(DIFFICULTY_LEVELS))
+    parser.add_argument("--boards", type=int, default=4096, help="함께 진행할 보드 수")
+    parser.add_argument("--steps", type=int, default=100, help="단계 수 (단계마다 보드별 동작 하나)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main(args):
+    report = run_batch(DIFFICULTY_LEVELS[args.difficulty], args.boards, args.steps, args.seed)
+    print(f"난이도: {args.difficulty}, 보드 {report['boards']}개, 동작 {report['steps']}개, {report['seconds']:.2f}초")
+    print(f"끝난 게임: {report['games']}개 (승리 {report['wins']})")
+    print(f"처리량: {report['steps_per_second']:.0f} 동작/초 "
+          f"(무작위 플레이어 포함 {report['steps_per_second_with_policy']:.0f} 동작/초)")
+    return 0
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# 창 없이 실행 (SDL 더미 드라이버)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from minesweeper_board import Board
+from minesweeper_engine import GameEngine
+
+# 벤치마크 보드 크기 (이름, 가로, 세로, 지뢰 수)
+BENCH_SIZES = [
+    ("초급", 9, 9, 10),
+    ("고급", 30, 16, 99),
+    ("1000x1000", 1000, 1000, 150000),
+]
+
+# 이 값보다 느려지면 회귀로 판단 (기준 대비 비율)
+DEFAULT_THRESHOLD = 0.25
+
+
+def legacy_place_mines(width, height, mines, first_row, first_col, rng):
+    # 기존 방식: 거절 샘플링 + 칸마다 주변 지뢰 수 세기 (비교용)
+    board = [[0 for _ in range(width)] for _ in range(height)]
+    safe_cells = []
+    for i in range(max(0, first_row-1), min(height, first_row+2)):
+        for j in range(max(0, first_col-1), min(width, first_col+2)):
+            safe_cells.append((i, j))
+
+    mines_placed = 0
+    while mines_placed < mines:
+        row = rng.randint(0, height - 1)
+        col = rng.randint(0, width - 1)
+        if (row, col) not in safe_cells and board[row][col] != -1:
+            board[row][col] = -1
+            mines_placed += 1
+
+    for i in range(height):
+        for j in range(width):
+            if board[i][j] != -1:
+                count = 0
+                for r in range(max(0, i-1), min(height, i+2)):
+                    for c in range(max(0, j-1), min(width, j+2)):
+                        if board[r][c] == -1:
+                            count += 1
+                board[i][j] = count
+    return board
+
+
+def fast_place_mines(width, height, mines, first_row, first_col, rng):
+    board = Board(width, height)
+    board.place_mines(first_row, first_col, mines, rng)
+    return board
+
+
+def time_call(func, repeat=5, setup=None):
+    # 여러 번 실행해서 가장 빠른 시간 (초), setup은 매번 측정 전에 실행
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func(state) if setup else func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def repeat_for(width, height, quick):
+    if width * height > 100000:
+        return 1
+    return 3 if quick else 20
+
+
+def bench_generation(results, quick, seed=0):
+    for name, width, height, mines in BENCH_SIZES:
+        repeat = repeat_for(width, height, quick)
+        first = (height // 2, width // 2)
+        if not (quick and width * height > 100000):
+            results[f"generation/legacy/{name}"] = time_call(
+                lambda: legacy_place_mines(width, height, mines, *first, random.Random(seed)), repeat)
+        results[f"generation/fast/{name}"] = time_call(
+            lambda: fast_place_mines(width, height, mines, *first, random.Random(seed)), repeat)
+
+
+def bench_cascade(results, quick):
+    # 최악의 연쇄 열기: 지뢰가 구석에 하나뿐이라 한 번의 클릭으로 보드 전체가 열림
+    for name, width, height, _ in BENCH_SIZES:
+        def setup():
+            board = Board(width, height)
+            board.set_mines([width * height - 1])
+            return board
+        results[f"cascade/{name}"] = time_call(
+            lambda board: board.reveal(0, 0), repeat_for(width, height, quick), setup)
+
+
+def bench_click_to_win(results, quick, seed=0):
+    # 모든 안전한 칸을 하나씩 클릭해서 승리할 때까지 (클릭마다 승리 판정 포함)
+    for name, width, height, mines in BENCH_SIZES:
+        if quick and width * height > 100000:
+            continue
+
+        def setup():
+            engine = GameEngine(width, height, mines, random.Random(seed))
+            engine.place_mines(height // 2, width // 2)
+            engine.first_click = False
+            safe = [divmod(i, width) for i, cell in enumerate(engine.board.cells) if not cell & 0x10]
+            return engine, safe
+
+        def play(state):
+            engine, safe = state
+            for row, col in safe:
+                engine.left_click(row, col)
+            assert engine.won
+
+        results[f"click_to_win/{name}"] = time_call(play, repeat_for(width, height, quick), setup)
+
+
+def bench_batch_env(results, quick):
+    # 학습용 배치 환경: 고급 보드 4096개를 무작위 동작으로 20단계 (단계마다 동작 4096개)
+    from minesweeper_batch import BatchEnv
+
+    def setup():
+        env = BatchEnv.from_difficulty(4096, "고급", seed=0)
+        return env, [env.rng.integers(0, env.cells, env.count) for _ in range(20)]
+
+    def run(state):
+        env, actions = state
+        for step in actions:
+            env.step(step)
+    results["batch_env/20_steps/고급x4096"] = time_call(run, 3 if quick else 10, setup)
+
+
+def make_game(width, height, mines, seed=0):
+    from minesweeper_game import Minesweeper
+    from minesweeper_scene import SceneManager
+    game = Minesweeper(seed=seed, manager=SceneManager(), record=False, save=False, stats=False)
+    if (width, height, mines) != (game.width, game.height, game.mines):
+        game.set_custom_difficulty(width, height, mines)
+    return game
+
+
+def bench_draw_board(results, quick):
+    for name, width, height, mines in BENCH_SIZES:
+        game = make_game(width, height, mines)
+        game.left_click(height // 2, width // 2)
+        repeat = repeat_for(width, height, quick)
+
+        # 전체 다시 그리기
+        def full():
+            game.renderer.invalidate()
+            game.draw_board()
+        results[f"draw_board/full/{name}"] = time_call(full, repeat)
+
+        # 변화 없는 프레임
+        game.draw_board()
+        results[f"draw_board/steady/{name}"] = time_call(game.draw_board, 20)
+
+        # 한 칸(깃발)만 바뀐 프레임
+        def one_cell():
+            for i, cell in enumerate(game.board.cells):
+                if not cell & 0x20:
+                    game.right_click(*divmod(i, width))
+                    break
+            game.draw_board()
+        results[f"draw_board/one_cell/{name}"] = time_call(one_cell, 20)
+
+
+def bench_explosion(results, quick):
+    from minesweeper_display import display
+    from minesweeper_game import Explosion
+    screen = display.set_mode((900, 700))
+    for particles in (20, 5000):
+        def setup():
+            return Explosion(450, 350, 30, num_particles=particles)
+
+        def run(explosion):
+            frames = 0
+            while explosion.update() and frames < 30:
+                explosion.draw(screen)
+                frames += 1
+        results[f"explosion/30_frames/{particles}"] = time_call(run, 3 if quick else 10, setup)
+
+
+def bench_main_page(results, quick):
+    from minesweeper_main import MainPage, MineField
+    from minesweeper_scene import SceneManager
+    page = MainPage(manager=SceneManager())
+    results["main_page/frame/15"] = time_call(page.draw_main_page, 20 if quick else 100)
+    page.mines = MineField(page.screen_width, page.screen_height, 500)
+    results["main_page/frame/500"] = time_call(page.draw_main_page, 20 if quick else 100)
+
+
+BENCHMARKS = {
+    "generation": bench_generation,
+    "cascade": bench_cascade,
+    "click_to_win": bench_click_to_win,
+    "batch_env": bench_batch_env,
+    "draw_board": bench_draw_board,
+    "explosion": bench_explosion,
+    "main_page": bench_main_page,
+}
+
+
+def run_benchmarks(names=None, quick=False):
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        bench(results, quick)
+    return results
+
+
+def compare(baseline, results, threshold):
+    # 기준 결과보다 threshold 비율 이상 느려진 항목 목록
+    regressions = []
+    for name, seconds in results.items():
+        old = baseline.get(name)
+        if old and seconds > old * (1 + threshold):
+            regressions.append((name, old, seconds))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="지뢰 찾기 벤치마크")
+    parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), help="실행할 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="반복 횟수를 줄이고 큰 보드 일부 생략")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="회귀로 판단할 느려짐 비율 (기본 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.quick)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'항목':<36}{'시간(ms)':>12}{'기준(ms)':>12}{'변화':>10}")
+    for name, seconds in results.items():
+        line = f"{name:<36}{seconds * 1000:>12.3f}"
+        if name in baseline:
+            old = baseline[name]
+            line += f"{old * 1000:>12.3f}{(seconds / old - 1) * 100 if old else 0:>+9.1f}%"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "quick": args.quick,
+                },
+                "results": results,
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        regressions = compare(baseline, results, args.threshold)
+        for name, old, new in regressions:
+            print(f"회귀: {name} {old * 1000:.3f}ms -> {new * 1000:.3f}ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
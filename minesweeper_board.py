@@ -0,0 +1,265 @@
+import re
+import sys
+import random
+
+import numpy as np
+
+# 셀 상태 비트 (셀 하나당 1바이트)
+# 하위 4비트: 주변 지뢰 수 (0~8)
+NUMBER_MASK = 0x0F
+MINE = 0x10
+REVEALED = 0x20
+FLAG = 0x40
+
+# 셀당 메모리 사용량 (바이트)
+BYTES_PER_CELL = 1
+
+# 연쇄 열기용 바이트 변환표
+# 칸 종류: 'z' 닫힌 빈 칸 (바이트 전체가 0), '.' 열렸거나 깃발이 꽂힌 칸, 'o' 그 밖의 닫힌 칸
+CELL_KIND = bytes(ord('z') if v == 0 else ord('.') if v & (REVEALED | FLAG) else ord('o') for v in range(256))
+# 모든 바이트에 열림 비트를 켬
+OPEN_CELL = bytes(v | REVEALED for v in range(256))
+OPEN_ZERO = bytes([REVEALED])
+ZERO_RUN = re.compile(rb"z+")
+CLOSED_RUN = re.compile(rb"o+")
+
+
+def max_mines(width, height):
+    # 첫 클릭이 어디든 배치할 수 있는 최대 지뢰 수
+    # 안전 구역(첫 클릭과 주변)이 가장 클 때 기준이고, 폭이나 높이가 3보다 작으면 안전 구역도 작아짐
+    return width * height - min(3, width) * min(3, height)
+
+
+class Board:
+    def __init__(self, width, height, debug=False):
+        self.width = width
+        self.height = height
+        # 모든 셀 상태를 하나의 연속된 바이트 배열에 저장
+        self.cells = bytearray(width * height)
+
+        # 변경될 때마다 갱신되는 카운터 (승패 판정을 상수 시간에 처리)
+        self.mine_count = 0
+        self.revealed_safe = 0  # 열린 안전한 칸 수
+        self.revealed_mines = 0  # 열린 지뢰 수
+        self.flag_count = 0
+        self.wrong_flags = 0  # 지뢰가 아닌 칸에 꽂힌 깃발 수
+
+        # 디버그 모드: 변경할 때마다 카운터를 전체 스캔 결과와 대조
+        self.debug = debug
+
+    def index(self, row, col):
+        return row * self.width + col
+
+    def position(self, index):
+        return divmod(index, self.width)
+
+    def is_mine(self, row, col):
+        return self.cells[row * self.width + col] & MINE != 0
+
+    def number(self, row, col):
+        return self.cells[row * self.width + col] & NUMBER_MASK
+
+    def is_revealed(self, row, col):
+        return self.cells[row * self.width + col] & REVEALED != 0
+
+    def is_flagged(self, row, col):
+        return self.cells[row * self.width + col] & FLAG != 0
+
+    def set_mine(self, row, col):
+        i = row * self.width + col
+        if self.cells[i] & MINE:
+            return
+        self.cells[i] |= MINE
+        self.mine_count += 1
+        if self.cells[i] & FLAG:
+            self.wrong_flags -= 1
+        if self.cells[i] & REVEALED:
+            self.revealed_safe -= 1
+            self.revealed_mines += 1
+        if self.debug:
+            self.verify_counters()
+
+    def set_number(self, row, col, count):
+        i = row * self.width + col
+        self.cells[i] = (self.cells[i] & ~NUMBER_MASK) | count
+
+    def set_revealed(self, row, col):
+        i = row * self.width + col
+        if self.cells[i] & REVEALED:
+            return
+        self.cells[i] |= REVEALED
+        if self.cells[i] & MINE:
+            self.revealed_mines += 1
+        else:
+            self.revealed_safe += 1
+        if self.debug:
+            self.verify_counters()
+
+    def set_flag(self, row, col, flagged):
+        i = row * self.width + col
+        if bool(self.cells[i] & FLAG) == flagged:
+            return
+        delta = 1 if flagged else -1
+        if flagged:
+            self.cells[i] |= FLAG
+        else:
+            self.cells[i] &= ~FLAG
+        self.flag_count += delta
+        if not self.cells[i] & MINE:
+            self.wrong_flags += delta
+        if self.debug:
+            self.verify_counters()
+
+    def safe_left(self):
+        # 아직 열리지 않은 안전한 칸 수
+        return self.width * self.height - self.mine_count - self.revealed_safe
+
+    def is_won(self):
+        return self.revealed_mines == 0 and self.safe_left() == 0
+
+    def is_lost(self):
+        return self.revealed_mines > 0
+
+    def verify_counters(self):
+        # 카운터를 전체 스캔 결과와 비교 (디버그용)
+        grid = self.grid()
+        mine = (grid & MINE) != 0
+        revealed = (grid & REVEALED) != 0
+        flag = (grid & FLAG) != 0
+        expected = {
+            "mine_count": int(mine.sum()),
+            "revealed_safe": int((revealed & ~mine).sum()),
+            "revealed_mines": int((revealed & mine).sum()),
+            "flag_count": int(flag.sum()),
+            "wrong_flags": int((flag & ~mine).sum()),
+        }
+        for name, value in expected.items():
+            actual = getattr(self, name)
+            if actual != value:
+                raise AssertionError(f"카운터 불일치: {name}={actual}, 전체 스캔={value}")
+
+    def grid(self):
+        # 셀 바이트 배열을 복사 없이 (height, width) 크기의 NumPy 배열로 보기
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    def safe_cells(self, first_row, first_col):
+        # 첫 번째 클릭 위치와 주변 칸의 인덱스 (오름차순)
+        return [i * self.width + j
+                for i in range(max(0, first_row - 1), min(self.height, first_row + 2))
+                for j in range(max(0, first_col - 1), min(self.width, first_col + 2))]
+
+    def place_mines(self, first_row, first_col, mines, rng=None, safe=None):
+        # 첫 번째 클릭 위치와 주변을 제외한 칸에서 중복 없이 한 번에 지뢰 위치 추출
+        # safe를 주면 그 칸들(오름차순 인덱스)을 안전 구역으로 사용
+        if rng is None:
+            rng = random
+        if safe is None:
+            safe = self.safe_cells(first_row, first_col)
+        free = self.width * self.height - len(safe)
+        if not 0 <= mines <= free:
+            raise ValueError(f"지뢰 {mines}개를 배치할 수 없습니다 (가능한 칸: {free}개)")
+
+        # 주어진 난수 생성기에서 시드를 뽑아 NumPy로 중복 없는 추출 (시드가 같으면 결과도 같음)
+        sampler = np.random.default_rng(rng.getrandbits(64))
+        positions = sampler.choice(free, size=mines, replace=False).astype(np.int64)
+        # 안전 구역 칸을 건너뛰도록 인덱스 보정 (오름차순으로 적용)
+        for s in safe:
+            positions[positions >= s] += 1
+
+        self.set_mines(positions)
+        return positions.tolist()
+
+    def set_mines(self, positions):
+        # 주어진 위치에 지뢰를 배치하고 모든 칸의 숫자를 계산
+        mine_grid = np.zeros(self.width * self.height, dtype=np.uint8)
+        mine_grid[np.asarray(positions, dtype=np.int64)] = 1
+        mine_grid = mine_grid.reshape(self.height, self.width)
+
+        # 3x3 이웃 합으로 모든 칸의 주변 지뢰 수를 한 번에 계산
+        padded = np.pad(mine_grid, 1)
+        counts = np.zeros((self.height, self.width), dtype=np.uint8)
+        for dr in range(3):
+            for dc in range(3):
+                counts += padded[dr:dr + self.height, dc:dc + self.width]
+
+        # 열림/깃발 상태는 유지하고 지뢰/숫자 비트만 새로 기록
+        grid = self.grid()
+        grid[...] = (grid & (REVEALED | FLAG)) | np.where(mine_grid == 1, MINE, counts)
+
+        # 새 지뢰 배치에 맞춰 카운터 재계산
+        mine = mine_grid == 1
+        revealed = (grid & REVEALED) != 0
+        flag = (grid & FLAG) != 0
+        self.mine_count = int(mine.sum())
+        self.revealed_mines = int((revealed & mine).sum())
+        self.revealed_safe = int(revealed.sum()) - self.revealed_mines
+        self.wrong_flags = int((flag & ~mine).sum())
+        if self.debug:
+            self.verify_counters()
+
+    def reveal(self, row, col):
+        # 연쇄 열기: 닫힌 빈 칸이 이어지는 가로 구간 단위로 채움 (줄 단위 구간 채우기)
+        # 구간의 끝 찾기, 열기, 위아래 줄 살펴보기를 모두 바이트 연산으로 처리해서
+        # 칸마다 파이썬 반복을 돌지 않고, 재귀를 쓰지 않으므로 보드 크기와 관계없이 안전함
+        # 반환값: 새로 열린 셀의 인덱스 목록 (순서는 정해져 있지 않음)
+        cells = self.cells
+        width = self.width
+        size = len(cells)
+        start = row * width + col
+        if cells[start] & (REVEALED | FLAG):
+            return []
+
+        if cells[start]:
+            # 숫자 칸이나 지뢰는 그 칸만 열림
+            cells[start] |= REVEALED
+            if cells[start] & MINE:
+                self.revealed_mines += 1
+            else:
+                self.revealed_safe += 1
+            if self.debug:
+                self.verify_counters()
+            return [start]
+
+        changed = []
+        seeds = [start]
+        while seeds:
+            i = seeds.pop()
+            if cells[i]:
+                # 이미 채운 구간
+                continue
+            base = i - i % width
+            end = base + width
+            # i에서 왼쪽/오른쪽으로 빈 칸이 이어지는 구간 [left, right)
+            before = cells[base:i]
+            left = i - (len(before) - len(before.rstrip(b"\0")))
+            after = cells[i:end]
+            right = i + (len(after) - len(after.lstrip(b"\0")))
+            cells[left:right] = OPEN_ZERO * (right - left)
+            changed.extend(range(left, right))
+
+            # 구간과 닿은 칸: 같은 줄의 양 끝 칸과 위아래 줄의 left - 1 ~ right 칸
+            # 닫힌 빈 칸은 다음 구간의 시작점으로 넣고, 나머지 닫힌 칸(숫자)은 바로 엶
+            low = left - 1 if left > base else left
+            high = right + 1 if right < end else right
+            for offset in (0, -width, width):
+                a = low + offset
+                if a < 0 or a >= size:
+                    continue
+                b = high + offset
+                kinds = cells[a:b].translate(CELL_KIND)
+                for match in ZERO_RUN.finditer(kinds):
+                    seeds.append(a + match.start())
+                for match in CLOSED_RUN.finditer(kinds):
+                    s, e = a + match.start(), a + match.end()
+                    cells[s:e] = cells[s:e].translate(OPEN_CELL)
+                    changed.extend(range(s, e))
+
+        # 연쇄로 열리는 칸은 모두 안전한 칸
+        self.revealed_safe += len(changed)
+        if self.debug:
+            self.verify_counters()
+        return changed
+
+    def memory_bytes(self):
+        # 보드 상태가 차지하는 실제 메모리 (바이트 배열 객체 포함)
+        return sys.getsizeof(self.cells)
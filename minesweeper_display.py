@@ -0,0 +1,115 @@
+import json
+import os
+
+import pygame
+
+from minesweeper_paths import data_path
+from minesweeper_perf import perf
+
+# 한글을 표시할 수 있는 글꼴의 운영체제별 기본 설치 경로 (파일이 있는지만 확인하므로 빠름)
+FONT_CANDIDATES = [
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/Library/Fonts/AppleGothic.ttf',
+    'C:/Windows/Fonts/malgun.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc',
+]
+# 기본 경로에 없을 때 시스템 글꼴 목록에서 찾을 이름
+# (목록 검색은 시스템의 모든 글꼴을 읽어서 느리므로 결과를 설정 파일에 저장해 두고 한 번만 함)
+FONT_NAMES = ['applesdgothicneo', 'applegothic', 'malgungothic', 'nanumgothic', 'notosanscjkkr', 'notosanscjk']
+
+# 찾은 글꼴 경로 등을 저장하는 설정 파일 (데이터 폴더 안, MINESWEEPER_CONFIG로 변경, 빈 값이면 저장하지 않음)
+DEFAULT_CONFIG_FILE = "minesweeper_config.json"
+
+
+def config_path():
+    path = os.environ.get("MINESWEEPER_CONFIG")
+    return path if path is not None else data_path(DEFAULT_CONFIG_FILE)
+
+
+def load_config():
+    path = config_path()
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def save_config(config):
+    path = config_path()
+    if not path:
+        return
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+
+def resolve_font_path():
+    # 한글 글꼴 경로 (찾지 못하면 빈 문자열: pygame 기본 글꼴 사용)
+    # 저장된 경로가 있으면 그대로 쓰고, 파일이 없어졌을 때만 다시 찾음
+    # 찾지 못한 결과는 저장하지 않음 (나중에 글꼴을 설치하면 다음 실행 때 찾도록)
+    config = load_config()
+    path = config.get("font_path")
+    if isinstance(path, str) and path and os.path.exists(path):
+        return path
+
+    path = next((candidate for candidate in FONT_CANDIDATES if os.path.exists(candidate)), None)
+    if path is None:
+        path = pygame.font.match_font(FONT_NAMES) or ""
+    if path:
+        config["font_path"] = path
+        save_config(config)
+    elif "font_path" in config:
+        del config["font_path"]
+        save_config(config)
+    return path
+
+
+class Display:
+    # 메인 페이지, 게임, 무한 모드가 함께 쓰는 화면과 글꼴
+    # pygame 초기화와 글꼴 찾기는 한 번만 하고, 화면은 크기가 바뀔 때만 다시 만듦
+    def __init__(self):
+        self.initialized = False
+        self.screen = None
+        self.font_path = None
+        self.fonts = {}
+
+    def init(self):
+        # 화면과 글꼴 모듈만 초기화 (pygame.init()은 쓰지 않는 오디오 장치까지 초기화해서 느림)
+        if self.initialized:
+            return
+        pygame.display.init()
+        pygame.font.init()
+        self.initialized = True
+        perf.startup_mark("pygame 초기화")
+
+    def set_mode(self, size, caption=None):
+        self.init()
+        if self.screen is None or self.screen.get_size() != tuple(size):
+            self.screen = pygame.display.set_mode(size)
+            perf.startup_mark("화면 생성")
+        if caption is not None:
+            pygame.display.set_caption(caption)
+        return self.screen
+
+    def font(self, size):
+        # 크기별 글꼴 (같은 크기는 모든 장면이 같은 객체를 씀)
+        font = self.fonts.get(size)
+        if font is None:
+            self.init()
+            if self.font_path is None:
+                self.font_path = resolve_font_path()
+                perf.startup_mark("글꼴 찾기")
+            font = self.fonts[size] = pygame.font.Font(self.font_path or None, size)
+        return font
+
+
+display = Display()
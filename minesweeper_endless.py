@@ -0,0 +1,209 @@
+import os
+import random
+
+import pygame
+
+from minesweeper_display import display
+from minesweeper_paths import data_path
+from minesweeper_perf import perf
+from minesweeper_render import TileAtlas, tile_of
+from minesweeper_scene import Scene
+from minesweeper_world import EndlessBoard, ChunkStore
+
+# 색상 정의
+WHITE = (255, 255, 255)
+GRAY = (192, 192, 192)
+DARK_GRAY = (128, 128, 128)
+
+# 무한 모드 화면 설정
+SCREEN_WIDTH = 900
+SCREEN_HEIGHT = 660
+TOP_HEIGHT = 60
+CELL_SIZE = 30
+# 마우스를 이만큼(픽셀) 이상 끌면 클릭이 아니라 화면 이동
+DRAG_THRESHOLD = 5
+
+# 바뀐 청크 저장소 (데이터 폴더 안, MINESWEEPER_ENDLESS_STORE로 변경, 빈 값이면 메모리에만 보관)
+DEFAULT_STORE = "endless_chunks"
+
+
+class EndlessGame(Scene):
+    # 크기 제한이 없는 보드를 화면 크기만큼만 보여 주는 무한 모드
+    # 글꼴과 이미지는 원래 게임의 것을 함께 쓰고, Esc로 원래 게임으로 돌아감
+    # 조작: 좌클릭 열기, 우클릭 깃발, 끌기/방향키로 화면 이동, 얼굴 클릭으로 새 세계
+    # 저장소가 있으면 시드를 주지 않았을 때 지난번 세계를 다시 열고, 새 세계를 만들 때만 저장소를 비움
+    fps = 30
+
+    def __init__(self, game, seed=None):
+        self.game = game
+        self.screen = display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), "지뢰 찾기 - 무한 모드")
+        self.atlas = TileAtlas(CELL_SIZE, game.font, game.images)
+        path = os.environ.get("MINESWEEPER_ENDLESS_STORE")
+        if path is None:
+            path = data_path(DEFAULT_STORE)
+        self.store = ChunkStore(path) if path else None
+        self.drag_start = None
+        self.dragging = False
+        world = EndlessBoard.reopen(self.store) if self.store and seed is None else None
+        if world:
+            self.open_world(world)
+        else:
+            self.new_world(seed)
+
+    def new_world(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(63)
+        if self.store:
+            self.store.clear()
+        self.open_world(EndlessBoard(seed, store=self.store))
+        self.world.reveal(0, 0)
+        if self.store:
+            self.store.save_world(self.world)
+
+    def open_world(self, world):
+        self.world = world
+        self.game_over = world.is_lost()
+        self.face_button = 'sad' if self.game_over else 'smile'
+        # 화면 왼쪽 위 모서리의 세계 좌표 (픽셀), 시작 지점 (0, 0)이 화면 가운데
+        self.camera_x = -SCREEN_WIDTH // 2 + CELL_SIZE // 2
+        self.camera_y = -(SCREEN_HEIGHT - TOP_HEIGHT) // 2 + CELL_SIZE // 2
+        self.needs_redraw = True
+
+    def cell_at(self, pos):
+        x, y = pos
+        if y < TOP_HEIGHT:
+            return None
+        return (x + self.camera_x) // CELL_SIZE, (y - TOP_HEIGHT + self.camera_y) // CELL_SIZE
+
+    def face_rect(self):
+        rect = self.game.images[self.face_button].get_rect()
+        rect.midtop = (SCREEN_WIDTH // 2, 30)
+        return rect
+
+    def draw(self):
+        # 화면 이동이나 클릭이 있을 때만 보이는 칸을 모두 다시 그림
+        if not self.needs_redraw:
+            return
+        self.needs_redraw = False
+        screen = self.screen
+        screen.fill(GRAY)
+
+        # 보이는 칸만 타일 모음에서 한 번의 blits 호출로 그림
+        first_x = self.camera_x // CELL_SIZE
+        first_y = self.camera_y // CELL_SIZE
+        offset_x = -(self.camera_x % CELL_SIZE)
+        offset_y = TOP_HEIGHT - self.camera_y % CELL_SIZE
+        columns = (SCREEN_WIDTH - offset_x) // CELL_SIZE + 1
+        rows = (SCREEN_HEIGHT - offset_y) // CELL_SIZE + 1
+        world = self.world
+        areas = self.atlas.areas
+        atlas_surface = self.atlas.surface
+        blits = [(atlas_surface, (offset_x + i * CELL_SIZE, offset_y + j * CELL_SIZE),
+                  areas[tile_of(world.cell(first_x + i, first_y + j), self.game_over)])
+                 for j in range(rows) for i in range(columns)]
+        screen.set_clip(pygame.Rect(0, TOP_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - TOP_HEIGHT))
+        screen.blits(blits, doreturn=False)
+        screen.set_clip(None)
+        perf.count_blits(len(blits))
+        # 그리면서 불러온 청크가 많으면 오래된 청크 내보내기
+        world.evict()
+
+        # 상단 정보 영역
+        pygame.draw.rect(screen, DARK_GRAY, (0, 0, SCREEN_WIDTH, TOP_HEIGHT))
+        texts = [
+            (self.game.font, f"점수: {world.revealed_safe}", {"topleft": (10, 20)}),
+            (self.game.font, f"깃발: {world.flag_count}", {"topright": (SCREEN_WIDTH - 10, 20)}),
+            (self.game.small_font, f"청크 {len(world.chunks)}", {"topright": (SCREEN_WIDTH - 10, 42)}),
+        ]
+        for font, text, position in texts:
+            surface = font.render(text, True, WHITE)
+            perf.count_surfaces()
+            screen.blit(surface, surface.get_rect(**position))
+            perf.count_blits()
+        screen.blit(self.game.images[self.face_button], self.face_rect())
+        perf.count_blits()
+
+        perf.enter("flip")
+        pygame.display.update()
+        perf.leave()
+
+    def redraw(self):
+        self.needs_redraw = True
+
+    def move_camera(self, dx, dy):
+        self.camera_x += dx
+        self.camera_y += dy
+        self.needs_redraw = True
+
+    def left_click(self, x, y):
+        if self.game_over:
+            return
+        perf.enter("logic")
+        changed = self.world.reveal(x, y)
+        perf.leave()
+        if self.world.is_lost():
+            self.game_over = True
+            self.face_button = 'sad'
+        if changed:
+            self.needs_redraw = True
+
+    def right_click(self, x, y):
+        if not self.game_over and self.world.toggle_flag(x, y):
+            self.needs_redraw = True
+
+    def close(self):
+        # 원래 게임 화면으로 돌아감
+        self.on_quit()
+        self.manager.pop()
+        self.game.set_difficulty(self.game.current_difficulty)
+        self.game.update_caption()
+
+    def on_quit(self):
+        self.world.flush()
+        if self.store:
+            self.store.close()
+            self.store = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            step = CELL_SIZE * (10 if event.mod & pygame.KMOD_SHIFT else 1)
+            if event.key == pygame.K_ESCAPE:
+                self.close()
+            elif event.key in (pygame.K_LEFT, pygame.K_a):
+                self.move_camera(-step, 0)
+            elif event.key in (pygame.K_RIGHT, pygame.K_d):
+                self.move_camera(step, 0)
+            elif event.key in (pygame.K_UP, pygame.K_w):
+                self.move_camera(0, -step)
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.move_camera(0, step)
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:
+                self.drag_start = event.pos
+                self.dragging = False
+            elif event.button == 3:
+                cell = self.cell_at(event.pos)
+                if cell:
+                    self.right_click(*cell)
+
+        elif event.type == pygame.MOUSEMOTION and self.drag_start:
+            if not self.dragging:
+                dx = event.pos[0] - self.drag_start[0]
+                dy = event.pos[1] - self.drag_start[1]
+                self.dragging = abs(dx) + abs(dy) >= DRAG_THRESHOLD
+            if self.dragging:
+                self.move_camera(-event.rel[0], -event.rel[1])
+
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.drag_start:
+            dragging = self.dragging
+            self.drag_start = None
+            self.dragging = False
+            if dragging:
+                return
+            if self.face_rect().collidepoint(event.pos):
+                self.new_world()
+                return
+            cell = self.cell_at(event.pos)
+            if cell:
+                self.left_click(*cell)
@@ -0,0 +1,91 @@
+import random
+
+from minesweeper_board import Board
+
+# 난이도 설정 (pygame 없이도 사용할 수 있도록 여기에 정의)
+DIFFICULTY_LEVELS = {
+    "초급": {"width": 9, "height": 9, "mines": 10, "cell_size": 40},
+    "중급": {"width": 16, "height": 16, "mines": 40, "cell_size": 30},
+    "고급": {"width": 30, "height": 16, "mines": 99, "cell_size": 30}
+}
+
+
+class GameEngine:
+    # 화면 없이 동작하는 게임 규칙 (창 게임, 시뮬레이션에서 함께 사용)
+    def __init__(self, width, height, mines, rng=None, debug=False):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        # 지뢰 배치용 난수 생성기 (시드를 고정하면 같은 게임이 재현됨)
+        self.rng = rng if rng is not None else random.Random()
+        self.debug = debug
+        self.reset()
+
+    def reset(self):
+        self.board = Board(self.width, self.height, debug=self.debug)
+        self.game_over = False
+        self.won = False
+        self.first_click = True
+        self.mines_left = self.mines
+        self.clicks = 0
+        # 미리 정해 둔 지뢰 위치 (예: 추측이 필요 없는 보드), 없으면 첫 클릭 때 무작위 배치
+        self.preset_mines = None
+
+    def place_mines(self, first_row, first_col):
+        # 첫 번째 클릭 위치와 주변에는 지뢰를 배치하지 않음
+        if self.preset_mines is not None:
+            self.board.set_mines(self.preset_mines)
+            self.preset_mines = None
+            return
+        self.board.place_mines(first_row, first_col, self.mines, self.rng)
+
+    def left_click(self, row, col):
+        # 이번 클릭으로 새로 열린 셀의 인덱스 목록을 반환
+        if self.game_over or self.board.is_flagged(row, col) or self.board.is_revealed(row, col):
+            return []
+        self.clicks += 1
+
+        # 첫 번째 클릭인 경우
+        if self.first_click:
+            self.place_mines(row, col)
+            self.first_click = False
+
+        # 지뢰를 클릭한 경우
+        if self.board.is_mine(row, col):
+            self.board.set_revealed(row, col)
+            self.game_over = True
+            return [self.board.index(row, col)]
+
+        # 빈 칸을 클릭한 경우
+        changed = self.reveal_cell(row, col)
+
+        # 승리 조건 확인
+        if self.check_win():
+            self.game_over = True
+            self.won = True
+
+        return changed
+
+    def right_click(self, row, col):
+        # 깃발을 토글했으면 True
+        if self.game_over or self.board.is_revealed(row, col):
+            return False
+        self.clicks += 1
+
+        # 깃발 토글
+        if not self.board.is_flagged(row, col):
+            self.board.set_flag(row, col, True)
+            self.mines_left -= 1
+        else:
+            self.board.set_flag(row, col, False)
+            self.mines_left += 1
+        return True
+
+    def reveal_cell(self, row, col):
+        # 칸 열기 (빈 칸(0)인 경우 주변 칸 자동 열기)
+        # 새로 열린 셀의 인덱스 목록을 반환 (이미 열렸거나 깃발이면 빈 목록)
+        return self.board.reveal(row, col)
+
+    def check_win(self):
+        # 지뢰가 아닌 칸이 모두 열렸으면 승리 (카운터로 상수 시간 판정)
+        return self.board.is_won()
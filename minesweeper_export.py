@@ -0,0 +1,278 @@
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 창 없이 그림 (SDL 더미 드라이버의 화면은 메모리에만 있는 표면)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# 표준 출력으로 프레임을 내보낼 수 있도록 pygame 시작 메시지를 끔
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from minesweeper_replay import iter_replays, replay_path, LEFT
+
+# 내보내기 형식
+#   png:  게임마다 OUTPUT/game_00000/frame_00000.png 이미지 시퀀스
+#   raw:  RGB24 프레임을 이어 붙인 스트림 (OUTPUT이 "-"이면 표준 출력, 예: ffmpeg -f rawvideo -pix_fmt rgb24)
+#   none: 프레임 없이 썸네일만 (마지막 화면만 그림)
+FORMATS = ("png", "raw", "none")
+
+# 작업자 프로세스마다 하나씩 만들어 모든 게임에 다시 쓰는 게임 화면과 썸네일 표면
+worker_game = None
+thumbnail_surfaces = {}
+
+
+def frame_size(game):
+    return game.screen_width, game.screen_height
+
+
+class PngSink:
+    # 프레임마다 PNG 파일 하나 (화면이 바뀌지 않은 프레임은 인코딩하지 않고 이전 파일을 복사)
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.previous = None
+
+    def write(self, screen, number, dirty):
+        path = os.path.join(self.directory, f"frame_{number:05d}.png")
+        if dirty or self.previous is None:
+            pygame.image.save(screen, path)
+        else:
+            shutil.copyfile(self.previous, path)
+        self.previous = path
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    # RGB24 프레임 스트림
+    # 프레임 버퍼는 게임마다 한 번만 만들고, 프레임마다 화면에서 바뀐 영역만 복사해서 그대로 씀
+    def __init__(self, out, size, close=True):
+        self.out = out
+        self.buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self.filled = False
+        self.close_out = close
+
+    def write(self, screen, number, dirty):
+        if not self.filled:
+            dirty = [screen.get_rect()]
+            self.filled = True
+        if dirty:
+            # 화면 픽셀을 복사 없이 (가로, 세로, 3) 배열로 보고 바뀐 영역만 (세로, 가로, 3) 버퍼에 옮김
+            pixels = pygame.surfarray.pixels3d(screen)
+            for rect in dirty:
+                rect = rect.clip(screen.get_rect())
+                self.buffer[rect.top:rect.bottom, rect.left:rect.right] = \
+                    pixels[rect.left:rect.right, rect.top:rect.bottom].transpose(1, 0, 2)
+            del pixels
+        self.out.write(self.buffer.data)
+
+    def close(self):
+        self.out.flush()
+        if self.close_out:
+            self.out.close()
+
+
+def click_schedule(replay, speed, max_gap_ms):
+    # 클릭별 (내보낸 영상에서의 시각 ms, 실제 게임 시각 ms)
+    # 오래 멈춰 있던 구간은 max_gap_ms로 줄이고, 영상 시각은 speed배 빠르게
+    schedule = []
+    video = recorded = 0.0
+    for delay, _, _ in replay.clicks:
+        recorded += delay
+        video += min(delay, max_gap_ms) / speed
+        schedule.append((video, recorded))
+    return schedule
+
+
+def play_click(game, kind, index):
+    row, col = divmod(index, game.width)
+    if kind == LEFT:
+        game.left_click(row, col)
+    else:
+        game.right_click(row, col)
+
+
+def save_thumbnail(game, path, width):
+    # 마지막 화면을 가로 width 픽셀로 줄여서 저장 (줄인 표면은 크기별로 한 번만 만듦)
+    screen = game.screen
+    size = (width, max(1, screen.get_height() * width // screen.get_width()))
+    surface = thumbnail_surfaces.get(size)
+    if surface is None:
+        surface = thumbnail_surfaces[size] = pygame.Surface(size, 0, screen)
+    pygame.transform.smoothscale(screen, size, surface)
+    pygame.image.save(surface, path)
+
+
+def thumbnail_directory(options):
+    # 썸네일 폴더 (기본: png/none은 출력 폴더, raw는 출력 파일이 있는 폴더)
+    if options["thumbnails"]:
+        return options["thumbnails"]
+    if options["format"] == "raw":
+        return os.path.dirname(options["output"]) or "."
+    return options["output"]
+
+
+def open_sink(game, number, options):
+    output = options["output"]
+    if options["format"] == "png":
+        return PngSink(os.path.join(output, f"game_{number:05d}"))
+    if options["format"] == "raw":
+        if output == "-":
+            return RawSink(sys.stdout.buffer, frame_size(game), close=False)
+        return RawSink(open(output.format(game=number), "wb"), frame_size(game))
+    return None
+
+
+def export_replay(game, number, replay, options):
+    # 게임 하나를 기록된 시간 간격대로 다시 실행하며 fps에 맞춰 프레임을 내보냄
+    # 반환값: (내보낸 프레임 수, 프레임 크기)
+    game.start_replay(replay)
+    sink = open_sink(game, number, options)
+    clicks = replay.clicks
+    schedule = click_schedule(replay, options["speed"], options["max_gap"] * 1000)
+    first_click = next((recorded for (_, recorded), (_, kind, _) in zip(schedule, clicks) if kind == LEFT), None)
+
+    if sink is None:
+        # 썸네일만: 모든 클릭을 실행하고 폭발이 끝난 마지막 화면만 그림
+        for _, kind, index in clicks:
+            play_click(game, kind, index)
+        if game.explosion:
+            game.explosion = None
+            game.show_restart_modal = True
+        if first_click is not None and schedule:
+            game.elapsed_time = int((schedule[-1][1] - first_click) / 1000)
+        game.draw_board()
+        frames = 0
+    else:
+        frame_ms = 1000 / options["fps"]
+        hold_frames = int(options["hold"] * options["fps"])
+        frames = 0
+        played = 0
+        while True:
+            now = frames * frame_ms
+            while played < len(clicks) and schedule[played][0] <= now:
+                play_click(game, *clicks[played][1:])
+                played += 1
+            # 상단 타이머는 실제 게임 시각 (줄인 구간에서는 다음 클릭 시각에서 멈춤)
+            if played and first_click is not None and not game.game_over:
+                video, recorded = schedule[played - 1]
+                limit = schedule[played][1] if played < len(clicks) else float("inf")
+                game.elapsed_time = int((min(recorded + (now - video) * options["speed"], limit) - first_click) / 1000)
+            dirty = game.draw_board()
+            sink.write(game.screen, frames, dirty)
+            frames += 1
+            # 모든 클릭과 폭발 효과가 끝난 뒤 마지막 화면을 hold초 동안 유지
+            if played == len(clicks) and not game.explosion:
+                if hold_frames <= 0:
+                    break
+                hold_frames -= 1
+        sink.close()
+
+    if options["thumbnail_width"]:
+        directory = thumbnail_directory(options)
+        os.makedirs(directory, exist_ok=True)
+        save_thumbnail(game, os.path.join(directory, f"game_{number:05d}.png"), options["thumbnail_width"])
+    return frames, frame_size(game)
+
+
+def init_worker():
+    global worker_game
+    from minesweeper_game import Minesweeper
+    from minesweeper_scene import SceneManager
+    worker_game = Minesweeper(manager=SceneManager(), record=False, save=False, stats=False)
+
+
+def export_task(task):
+    # 작업자 프로세스에서 실행되는 게임 하나 내보내기: (게임 번호, 프레임 수, 프레임 크기, 걸린 시간) 반환
+    number, replay, options = task
+    if worker_game is None:
+        init_worker()
+    start = time.perf_counter()
+    frames, size = export_replay(worker_game, number, replay, options)
+    return number, frames, size, time.perf_counter() - start
+
+
+def run_export(path, options, games=None, workers=None):
+    # 리플레이 파일의 게임들을 프로세스 풀에 나눠 내보내고 결과 요약 반환
+    tasks = [(number, replay, options) for number, replay in enumerate(iter_replays(path))
+             if games is None or number in games]
+    if options["format"] == "raw" and options["output"] == "-":
+        # 하나의 스트림에 순서대로 써야 하므로 이 프로세스에서 실행
+        workers = 1
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = list(map(export_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(export_task, tasks))
+    elapsed = time.perf_counter() - start
+
+    frames = sum(result[1] for result in results)
+    busy = sum(result[3] for result in results)
+    return {
+        "games": len(results),
+        "frames": frames,
+        "sizes": sorted({result[2] for result in results}),
+        "workers": workers,
+        "seconds": elapsed,
+        "frames_per_second": frames / elapsed if elapsed > 0 else 0.0,
+        # 작업자가 실제로 일한 시간 기준 (코어 하나의 처리량)
+        "frames_per_second_per_core": frames / busy if busy > 0 else 0.0,
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("file", nargs="?", default=None, help="리플레이 파일 (기본: 게임이 기록하는 파일)")
+    parser.add_argument("--output", required=True,
+                        help="png: 출력 폴더, raw: 출력 파일 ('-'는 표준 출력, 여러 게임이면 {game} 포함)")
+    parser.add_argument("--format", default="png", choices=FORMATS)
+    parser.add_argument("--games", type=int, nargs="*", default=None, help="내보낼 게임 번호 (기본: 전체)")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 속도 배율")
+    parser.add_argument("--max-gap", type=float, default=2.0, help="클릭 사이 최대 대기 시간 (초, 더 길면 줄임)")
+    parser.add_argument("--hold", type=float, default=1.0, help="마지막 화면을 유지할 시간 (초)")
+    parser.add_argument("--thumbnail-width", type=int, default=0, help="마지막 화면 썸네일의 가로 크기 (0이면 만들지 않음)")
+    parser.add_argument("--thumbnails", default=None,
+                        help="썸네일 폴더 (기본: --output, raw는 출력 파일이 있는 폴더, 표준 출력이면 꼭 지정)")
+    parser.add_argument("--workers", type=int, default=None)
+
+
+def main(args):
+    if args.format == "none" and not args.thumbnail_width:
+        print("--format none은 --thumbnail-width와 함께 써야 합니다")
+        return 1
+    if args.format == "raw" and args.output == "-" and args.thumbnail_width and not args.thumbnails:
+        print("표준 출력으로 내보낼 때 썸네일을 만들려면 --thumbnails를 지정하세요", file=sys.stderr)
+        return 1
+    games = set(args.games) if args.games is not None else None
+    if args.format == "raw" and args.output != "-" and "{game}" not in args.output and (games is None or len(games) > 1):
+        print("여러 게임을 raw로 내보내려면 --output에 {game}을 넣으세요")
+        return 1
+    options = {
+        "output": args.output,
+        "format": args.format,
+        "fps": args.fps,
+        "speed": args.speed,
+        "max_gap": args.max_gap,
+        "hold": args.hold,
+        "thumbnail_width": args.thumbnail_width,
+        "thumbnails": args.thumbnails,
+    }
+    report = run_export(args.file if args.file is not None else replay_path(), options, games, args.workers)
+    # 표준 출력으로 프레임을 내보내는 중이면 요약은 표준 에러로
+    out = sys.stderr if args.format == "raw" and args.output == "-" else sys.stdout
+    print(f"게임 {report['games']}개, 프레임 {report['frames']}개, 작업자 {report['workers']}개, "
+          f"{report['seconds']:.2f}초", file=out)
+    if report["sizes"]:
+        print("프레임 크기: " + ", ".join(f"{width}x{height}" for width, height in report["sizes"]), file=out)
+    print(f"처리량: {report['frames_per_second']:.0f} 프레임/초 "
+          f"(코어당 {report['frames_per_second_per_core']:.0f} 프레임/초)", file=out)
+    return 0
@@ -1,8 +1,22 @@
 import pygame
 import random
 import time
-import sys
 import math
+import os
+import numpy as np
+from minesweeper_engine import GameEngine, DIFFICULTY_LEVELS
+from minesweeper_board import MINE, REVEALED, FLAG, max_mines
+from minesweeper_render import (
+    BoardRenderer, Camera, MIN_VIEW_WIDTH, MAX_VIEW_WIDTH, MAX_VIEW_HEIGHT, HEAT_LEVELS, NO_HEAT,
+)
+from minesweeper_scene import Scene, SceneManager
+from minesweeper_display import display
+from minesweeper_solver import Solver, HINT_SEARCH_NODES
+from minesweeper_perf import perf
+from minesweeper_replay import open_writer, LEFT, RIGHT, WON, LOST, ABANDONED
+from minesweeper_save import open_saver
+from minesweeper_stats import open_store, difficulty_key
+from minesweeper_history import History, counters, DEFAULT_HISTORY_BYTES
 
 # 색상 정의
 WHITE = (255, 255, 255)
@@ -20,34 +34,81 @@ TURQUOISE = (64, 224, 208)
 DARK_BLUE = (0, 0, 128)
 DARK_GREEN = (0, 100, 0)
 
+# 파티클 색상과 투명도 단계 수 (스프라이트 캐시 키)
+PARTICLE_COLORS = [RED, ORANGE, YELLOW]
+ALPHA_BUCKETS = 16
+
+# 진행 중인 게임을 자동 저장하는 간격 (초)
+AUTOSAVE_SECONDS = 10
+
+# 난이도 메뉴의 무한 모드 항목
+ENDLESS_LEVEL = "무한 모드"
+
+# 방향키로 화면을 움직이는 최소 거리 (픽셀, Shift를 누르면 10배)
+PAN_STEP = 40
+# 셀이 작게 보여도 폭발 효과는 이 크기 이상으로 그림
+MIN_EXPLOSION_SIZE = 20
+
+# 지뢰 확률을 계산하는 동안 결과가 나왔는지 확인하는 간격 (밀리초)
+HEATMAP_POLL_MS = 50
+
+# (크기, 색상 번호, 투명도 단계) -> 미리 그려 둔 원 스프라이트
+particle_sprites = {}
+# (반지름, 투명도) -> 미리 그려 둔 폭발 원
+blast_sprites = {}
+
+def get_particle_sprite(size, color_idx, bucket):
+    key = (size, color_idx, bucket)
+    sprite = particle_sprites.get(key)
+    if sprite is None:
+        alpha = 255 * bucket // (ALPHA_BUCKETS - 1)
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        perf.count_surfaces()
+        pygame.draw.circle(sprite, PARTICLE_COLORS[color_idx] + (alpha,), (size, size), size)
+        particle_sprites[key] = sprite
+    return sprite
+
+def get_blast_sprite(radius, alpha):
+    key = (radius, alpha)
+    sprite = blast_sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        perf.count_surfaces()
+        pygame.draw.circle(sprite, (255, 100, 0, alpha), (radius, radius), radius)
+        blast_sprites[key] = sprite
+    return sprite
+
 class Explosion:
-    def __init__(self, x, y, size):
+    def __init__(self, x, y, size, num_particles=20):
         self.x = x
         self.y = y
         self.size = size
         self.radius = 5
         self.max_radius = size * 2
         self.growing = True
-        self.particles = []
-        self.create_particles()
-        
-    def create_particles(self):
-        num_particles = 20
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            size = random.randint(2, 8)
-            color_idx = random.randint(0, 2)
-            color = [RED, ORANGE, YELLOW][color_idx]
-            self.particles.append({
-                'x': self.x,
-                'y': self.y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'size': size,
-                'color': color,
-                'life': random.uniform(0.5, 1.0)
-            })
+        
+        # 파티클은 속성별 연속 배열로 저장 (한 번의 벡터 연산으로 갱신)
+        self.px = np.empty(0, dtype=np.float32)
+        self.py = np.empty(0, dtype=np.float32)
+        self.vx = np.empty(0, dtype=np.float32)
+        self.vy = np.empty(0, dtype=np.float32)
+        self.life = np.empty(0, dtype=np.float32)
+        self.psize = np.empty(0, dtype=np.int32)
+        self.color_idx = np.empty(0, dtype=np.int32)
+        self.add_burst(x, y, num_particles)
+    
+    def add_burst(self, x, y, num_particles):
+        # (x, y)에서 파티클 무리 추가 (연쇄 폭발은 여러 번 호출)
+        rng = np.random.default_rng()
+        angle = rng.uniform(0, 2 * math.pi, num_particles)
+        speed = rng.uniform(1, 5, num_particles)
+        self.px = np.concatenate([self.px, np.full(num_particles, x, dtype=np.float32)])
+        self.py = np.concatenate([self.py, np.full(num_particles, y, dtype=np.float32)])
+        self.vx = np.concatenate([self.vx, (np.cos(angle) * speed).astype(np.float32)])
+        self.vy = np.concatenate([self.vy, (np.sin(angle) * speed).astype(np.float32)])
+        self.life = np.concatenate([self.life, rng.uniform(0.5, 1.0, num_particles).astype(np.float32)])
+        self.psize = np.concatenate([self.psize, rng.integers(2, 9, num_particles, dtype=np.int32)])
+        self.color_idx = np.concatenate([self.color_idx, rng.integers(0, 3, num_particles, dtype=np.int32)])
     
     def update(self):
         # 원형 폭발 효과 업데이트
@@ -58,79 +119,109 @@ class Explosion:
         else:
             self.radius -= 2
             
-        # 파티클 업데이트
-        for p in self.particles[:]:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['life'] -= 0.02
-            if p['life'] <= 0:
-                self.particles.remove(p)
+        # 파티클 업데이트 (모든 파티클을 한 번에 이동하고 수명이 다한 것은 제거)
+        self.px += self.vx
+        self.py += self.vy
+        self.life -= 0.02
+        alive = self.life > 0
+        if not alive.all():
+            self.px = self.px[alive]
+            self.py = self.py[alive]
+            self.vx = self.vx[alive]
+            self.vy = self.vy[alive]
+            self.life = self.life[alive]
+            self.psize = self.psize[alive]
+            self.color_idx = self.color_idx[alive]
                 
-        return self.radius > 0 or len(self.particles) > 0
+        return self.radius > 0 or len(self.life) > 0
+    
+    def get_rect(self):
+        # 폭발 효과가 그려지는 전체 영역 (화면 부분 갱신용)
+        rect = pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
+        if len(self.life):
+            left = int((self.px - self.psize).min())
+            top = int((self.py - self.psize).min())
+            right = int((self.px + self.psize).max()) + 1
+            bottom = int((self.py + self.psize).max()) + 1
+            rect.union_ip(pygame.Rect(left, top, right - left, bottom - top))
+        return rect.inflate(2, 2)
     
     def draw(self, screen):
         # 원형 폭발 효과 그리기
         if self.radius > 0:
-            alpha = int(255 * (self.radius / self.max_radius))
-            if not self.growing:
-                alpha = int(255 * (self.radius / self.max_radius))
-            
-            s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (255, 100, 0, alpha), (self.radius, self.radius), self.radius)
-            screen.blit(s, (self.x - self.radius, self.y - self.radius))
-        
-        # 파티클 그리기
-        for p in self.particles:
-            alpha = int(255 * p['life'])
-            color = list(p['color'])
-            color.append(alpha)
-            s = pygame.Surface((p['size'] * 2, p['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, color, (p['size'], p['size']), p['size'])
-            screen.blit(s, (p['x'] - p['size'], p['y'] - p['size']))
+            alpha = min(255, int(255 * (self.radius / self.max_radius)))
+            screen.blit(get_blast_sprite(self.radius, alpha), (self.x - self.radius, self.y - self.radius))
+            perf.count_blits()
+        
+        # 파티클 그리기 (캐시된 스프라이트를 한 번의 blits 호출로)
+        if len(self.life):
+            buckets = (self.life * (ALPHA_BUCKETS - 1)).astype(np.int32).clip(0, ALPHA_BUCKETS - 1)
+            xs = (self.px - self.psize).astype(np.int32).tolist()
+            ys = (self.py - self.psize).astype(np.int32).tolist()
+            screen.blits(
+                [(get_particle_sprite(size, color, bucket), (x, y))
+                 for size, color, bucket, x, y in zip(self.psize.tolist(), self.color_idx.tolist(), buckets.tolist(), xs, ys)],
+                doreturn=False,
+            )
+            perf.count_blits(len(self.life))
 
-class Minesweeper:
-    def __init__(self):
-        pygame.init()
+class Minesweeper(Scene):
+    fps = 30
+    
+    def __init__(self, seed=None, manager=None, record=True, save=True, stats=True):
+        display.init()
         pygame.display.set_caption("지뢰 찾기")
         
-        # 폰트 초기화
-        pygame.font.init()
-        
-        # macOS에서 한글 지원 폰트 시도
-        try:
-            # macOS 한글 폰트 경로
-            font_path = '/System/Library/Fonts/AppleSDGothicNeo.ttc'
-            self.font = pygame.font.Font(font_path, 20)
-            self.small_font = pygame.font.Font(font_path, 16)
-            self.large_font = pygame.font.Font(font_path, 30)
-        except:
-            try:
-                # 시스템 한글 폰트 시도
-                self.font = pygame.font.SysFont('AppleGothic', 20)
-                self.small_font = pygame.font.SysFont('AppleGothic', 16)
-                self.large_font = pygame.font.SysFont('AppleGothic', 30)
-            except:
-                # 기본 폰트로 대체
-                self.font = pygame.font.SysFont('Arial', 20)
-                self.small_font = pygame.font.SysFont('Arial', 16)
-                self.large_font = pygame.font.SysFont('Arial', 30)
+        # 폰트 (메인 페이지와 같은 글꼴 객체를 함께 씀)
+        self.font = display.font(20)
+        self.small_font = display.font(16)
+        self.large_font = display.font(30)
         
         # 게임 설정
-        self.difficulty_levels = {
-            "초급": {"width": 9, "height": 9, "mines": 10, "cell_size": 40},
-            "중급": {"width": 16, "height": 16, "mines": 40, "cell_size": 30},
-            "고급": {"width": 30, "height": 16, "mines": 99, "cell_size": 30}
-        }
+        self.difficulty_levels = {level: dict(settings) for level, settings in DIFFICULTY_LEVELS.items()}
+        
+        # 사용자 정의 보드 설정 (수백만 칸 크기까지 지원, 셀당 BYTES_PER_CELL 바이트)
+        self.custom_settings = {"width": 1000, "height": 1000, "mines": 150000, "cell_size": 1}
+        self.difficulty_levels["사용자 정의"] = self.custom_settings
+        
+        # 디버그 모드: 카운터를 매번 전체 스캔과 대조 (MINESWEEPER_DEBUG=1)
+        self.debug = os.environ.get("MINESWEEPER_DEBUG") == "1"
+        
+        # 되돌리기 기록이 쓸 수 있는 최대 메모리 (MINESWEEPER_HISTORY_BYTES, 바이트)
+        self.history_bytes = int(os.environ.get("MINESWEEPER_HISTORY_BYTES", DEFAULT_HISTORY_BYTES))
+        
+        # 지뢰 배치용 난수 생성기 (seed를 주면 같은 보드가 재현됨)
+        self.rng = random.Random(seed)
+        
+        # 플레이한 게임을 리플레이 파일에 기록 (MINESWEEPER_REPLAY_FILE)
+        self.recorder = open_writer() if record else None
+        
+        # 진행 중인 게임 자동 저장 (MINESWEEPER_SAVE_FILE, 다음 실행 때 이어서 시작)
+        self.saver = open_saver() if save else None
+        self.last_autosave = time.time()
+        
+        # 끝난 게임의 통계와 순위표 (MINESWEEPER_STATS_FILE, 쓰기는 백그라운드 스레드)
+        self.stats = open_store() if stats else None
+        self.result_text = None
+        
+        # 추측 없는 모드 (N 키로 전환, 보드는 백그라운드에서 미리 생성)
+        self.no_guess = False
+        self.no_guess_pool = None
+        
+        # 연습 모드 (T 키로 전환, 끝난 게임도 되돌릴 수 있고 통계에 기록하지 않음)
+        self.practice = False
+        
+        # 지뢰 확률 표시 (P 키로 전환, 계산은 백그라운드 프로세스에서 하고 끝난 결과만 반영)
+        self.show_heatmap = False
+        self.heatmap = None
+        self.heat = None  # 칸별 확률 단계 (height, width), 표시하지 않으면 None
         
         self.current_difficulty = "초급"
         self.set_difficulty(self.current_difficulty)
         
         # 게임 상태
-        self.game_over = False
-        self.first_click = True
         self.start_time = 0
         self.elapsed_time = 0
-        self.mines_left = self.mines
         
         # 폭발 효과
         self.explosion = None
@@ -139,11 +230,19 @@ class Minesweeper:
         # 이미지 로드
         self.load_images()
         
-        # 게임 초기화
+        # 바뀐 부분만 다시 그리는 렌더러
+        self.renderer = BoardRenderer(self)
+        
+        # 게임 초기화 (저장된 게임이 있으면 이어서 시작)
         self.initialize_game()
+        if self.saver and self.saver.exists():
+            self.resume_game()
         
-        # 메인 루프
-        self.main_loop()
+        # 장면 관리자가 없으면 (단독 실행) 직접 만들어 메인 루프 실행
+        self.manager = manager
+        if manager is None:
+            SceneManager().push(self)
+            self.main_loop()
     
     def set_difficulty(self, level):
         self.current_difficulty = level
@@ -153,18 +252,40 @@ class Minesweeper:
         self.cell_size = self.difficulty_levels[level]["cell_size"]
         
         # 화면 크기 계산
+        # 보드가 최대 크기보다 크면 셀을 줄이지 않고 카메라로 이동/확대하며 봄
         self.top_height = 60  # 상단 정보 표시 영역 높이
-        self.screen_width = self.width * self.cell_size
-        self.screen_height = self.height * self.cell_size + self.top_height
+        view_width = min(max(self.width * self.cell_size, MIN_VIEW_WIDTH), MAX_VIEW_WIDTH)
+        view_height = min(self.height * self.cell_size, MAX_VIEW_HEIGHT)
+        self.camera = Camera(self.width, self.height, view_width, view_height, self.cell_size)
+        self.screen_width = view_width
+        self.screen_height = view_height + self.top_height
         
-        # 화면이 너무 크면 최대 크기 제한
-        max_width = 900
-        if self.screen_width > max_width:
-            self.screen_width = max_width
-            self.cell_size = max_width // self.width
-            self.screen_height = self.height * self.cell_size + self.top_height
+        # 화면 크기가 같으면 창을 다시 만들지 않음
+        self.screen = display.set_mode((self.screen_width, self.screen_height))
         
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        # 새 난이도의 추측 없는 보드를 미리 만들어 둠
+        if self.no_guess:
+            self.no_guess_pool.prefetch(self.width, self.height, self.mines)
+        
+        # 화면 크기가 바뀌었으므로 렌더러 표면도 새로 만듦
+        if hasattr(self, 'renderer'):
+            self.renderer.resize()
+    
+    def set_custom_difficulty(self, width, height, mines):
+        # 사용자 정의 보드 크기와 지뢰 수 설정
+        if width < 1 or height < 1:
+            raise ValueError("보드 크기는 1 이상이어야 합니다")
+        if not 0 <= mines <= max_mines(width, height):
+            raise ValueError("지뢰 수가 보드 크기에 맞지 않습니다")
+        self.custom_settings["width"] = width
+        self.custom_settings["height"] = height
+        self.custom_settings["mines"] = mines
+        self.set_difficulty("사용자 정의")
+        self.initialize_game()
+    
+    def board_memory_bytes(self):
+        # 현재 보드 상태가 차지하는 메모리 (셀당 BYTES_PER_CELL 바이트)
+        return self.board.memory_bytes()
     
     def load_images(self):
         # 이모지 대신 텍스트 사용
@@ -178,161 +299,102 @@ class Minesweeper:
             'cool': self.font.render('😎', True, BLACK)
         }
     
-    def initialize_game(self):
-        # 게임 보드 초기화
-        self.board = [[0 for _ in range(self.width)] for _ in range(self.height)]
-        self.revealed = [[False for _ in range(self.width)] for _ in range(self.height)]
-        self.flags = [[False for _ in range(self.width)] for _ in range(self.height)]
+    # 게임 규칙 상태는 엔진에 있음
+    @property
+    def board(self):
+        return self.engine.board
+    
+    @property
+    def game_over(self):
+        return self.engine.game_over
+    
+    @property
+    def first_click(self):
+        return self.engine.first_click
+    
+    @property
+    def mines_left(self):
+        return self.engine.mines_left
+    
+    def initialize_game(self, seed=None):
+        # 게임 보드와 규칙 상태 초기화
+        # 게임마다 시드를 따로 정해서 리플레이에 시드만 남기면 같은 보드가 재현되도록 함
+        self.game_seed = self.rng.getrandbits(63) if seed is None else seed
+        self.engine = GameEngine(self.width, self.height, self.mines, random.Random(self.game_seed), debug=self.debug)
+        if self.recorder:
+            self.recorder.finish(ABANDONED)
+            self.recorder.reset_clock()
+        # 이어서 시작한 게임은 시드만으로 재현할 수 없으므로 리플레이에 기록하지 않음
+        self.replayable = True
+        if self.saver:
+            self.saver.mark_all()
+        # 되돌리기/다시 하기 기록 (수마다 바뀐 칸만 저장), 되돌린 게임은 통계에 넣지 않음
+        self.history = History(self.width * self.height, self.history_bytes)
+        self.rewound = False
+        # 힌트/자동 풀이용 풀이기 (처음 쓸 때 만들고, 이후 칸이 열릴 때마다 제약 조건 갱신)
+        self.solver = None
+        self.hint = None
+        # 이전 게임의 확률 계산은 버림
+        if self.heatmap:
+            self.heatmap.cancel()
+        self.heat = None
         
-        # 게임 상태 초기화
-        self.game_over = False
-        self.first_click = True
+        # 화면 상태 초기화
         self.start_time = 0
         self.elapsed_time = 0
-        self.mines_left = self.mines
         self.face_button = 'smile'
         self.explosion = None
         self.show_restart_modal = False
-    
-    def place_mines(self, first_row, first_col):
-        # 첫 번째 클릭 위치와 주변에는 지뢰를 배치하지 않음
-        safe_cells = []
-        for i in range(max(0, first_row-1), min(self.height, first_row+2)):
-            for j in range(max(0, first_col-1), min(self.width, first_col+2)):
-                safe_cells.append((i, j))
-        
-        # 지뢰 배치
-        mines_placed = 0
-        while mines_placed < self.mines:
-            row = random.randint(0, self.height - 1)
-            col = random.randint(0, self.width - 1)
-            if (row, col) not in safe_cells and self.board[row][col] != -1:
-                self.board[row][col] = -1
-                mines_placed += 1
-        
-        # 숫자 계산 (주변 지뢰 수)
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.board[i][j] != -1:
-                    self.board[i][j] = self.count_adjacent_mines(i, j)
-    
-    def count_adjacent_mines(self, row, col):
-        count = 0
-        for i in range(max(0, row-1), min(self.height, row+2)):
-            for j in range(max(0, col-1), min(self.width, col+2)):
-                if self.board[i][j] == -1:
-                    count += 1
-        return count
+        self.result_text = None
+        
+        # 새 게임이므로 화면 전체 다시 그리기
+        self.renderer.invalidate()
     
     def draw_board(self):
-        # 배경 그리기
-        self.screen.fill(GRAY)
-        
-        # 상단 정보 영역 그리기
-        pygame.draw.rect(self.screen, DARK_GRAY, (0, 0, self.screen_width, self.top_height))
-        
-        # 지뢰 카운터 표시
-        mines_text = self.font.render(f"지뢰: {self.mines_left}", True, WHITE)
-        self.screen.blit(mines_text, (10, 20))
-        
-        # 타이머 표시
-        timer_text = self.font.render(f"시간: {self.elapsed_time}", True, WHITE)
-        timer_rect = timer_text.get_rect()
-        timer_rect.midtop = (self.screen_width // 2, 20)
-        self.screen.blit(timer_text, timer_rect)
-        
-        # 제작자 정보 표시
-        creator_text = self.small_font.render("Made by hyeongeol", True, WHITE)
-        creator_rect = creator_text.get_rect()
-        creator_rect.topright = (self.screen_width - 10, 10)
-        self.screen.blit(creator_text, creator_rect)
-        
-        # 재시작 버튼 (이모티콘)
-        face_rect = self.images[self.face_button].get_rect()
-        face_rect.midtop = (self.screen_width // 2, 45)
-        self.screen.blit(self.images[self.face_button], face_rect)
-        
-        # 게임 보드 그리기
-        for row in range(self.height):
-            for col in range(self.width):
-                x = col * self.cell_size
-                y = row * self.cell_size + self.top_height
-                
-                # 셀 테두리
-                pygame.draw.rect(self.screen, DARK_GRAY, (x, y, self.cell_size, self.cell_size), 1)
-                
-                if self.revealed[row][col]:
-                    # 열린 셀
-                    pygame.draw.rect(self.screen, WHITE, (x+1, y+1, self.cell_size-2, self.cell_size-2))
-                    
-                    # 지뢰인 경우
-                    if self.board[row][col] == -1:
-                        if self.game_over:
-                            # 게임 오버 시 폭발한 지뢰
-                            pygame.draw.rect(self.screen, RED, (x+1, y+1, self.cell_size-2, self.cell_size-2))
-                            mine_rect = self.images['explosion'].get_rect()
-                            mine_rect.center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                            self.screen.blit(self.images['explosion'], mine_rect)
-                    
-                    # 숫자인 경우
-                    elif self.board[row][col] > 0:
-                        # 숫자에 따른 색상
-                        colors = [BLUE, GREEN, RED, PURPLE, MAROON, TURQUOISE, BLACK, DARK_GRAY]
-                        number_text = self.font.render(str(self.board[row][col]), True, colors[self.board[row][col]-1])
-                        number_rect = number_text.get_rect()
-                        number_rect.center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                        self.screen.blit(number_text, number_rect)
-                
-                else:
-                    # 닫힌 셀
-                    pygame.draw.rect(self.screen, GRAY, (x+1, y+1, self.cell_size-2, self.cell_size-2))
-                    
-                    # 깃발이 있는 경우
-                    if self.flags[row][col]:
-                        flag_rect = self.images['flag'].get_rect()
-                        flag_rect.center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                        self.screen.blit(self.images['flag'], flag_rect)
-                    
-                    # 게임 오버 시 잘못된 깃발 표시
-                    if self.game_over and self.flags[row][col] and self.board[row][col] != -1:
-                        wrong_rect = self.images['wrong'].get_rect()
-                        wrong_rect.center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                        self.screen.blit(self.images['wrong'], wrong_rect)
-                    
-                    # 게임 오버 시 지뢰 표시
-                    if self.game_over and self.board[row][col] == -1 and not self.flags[row][col]:
-                        mine_rect = self.images['mine'].get_rect()
-                        mine_rect.center = (x + self.cell_size // 2, y + self.cell_size // 2)
-                        self.screen.blit(self.images['mine'], mine_rect)
-        
-        # 폭발 효과 그리기
+        # 폭발 효과 업데이트
         if self.explosion:
+            perf.enter("logic")
             if not self.explosion.update():
                 self.explosion = None
                 self.show_restart_modal = True
-            else:
-                self.explosion.draw(self.screen)
+            perf.leave()
         
-        # 재시작 모달 그리기
-        if self.show_restart_modal:
-            self.draw_restart_modal()
-        
-        pygame.display.update()
+        # 바뀐 칸과 상단 정보 영역만 다시 그리고 해당 영역만 화면에 반영 (바뀐 영역 목록 반환)
+        dirty_rects = self.renderer.render()
+        if dirty_rects:
+            perf.enter("flip")
+            pygame.display.update(dirty_rects)
+            perf.leave()
+        return dirty_rects
     
-    def draw_restart_modal(self):
+    def get_restart_modal_rect(self):
         modal_width = 300
         modal_height = 150
         modal_x = (self.screen_width - modal_width) // 2
         modal_y = (self.screen_height - modal_height) // 2
+        return pygame.Rect(modal_x, modal_y, modal_width, modal_height)
+    
+    def draw_restart_modal(self):
+        modal_rect = self.get_restart_modal_rect()
+        modal_y = modal_rect.y
         
         # 모달 배경
-        pygame.draw.rect(self.screen, WHITE, (modal_x, modal_y, modal_width, modal_height))
-        pygame.draw.rect(self.screen, BLACK, (modal_x, modal_y, modal_width, modal_height), 2)
+        pygame.draw.rect(self.screen, WHITE, modal_rect)
+        pygame.draw.rect(self.screen, BLACK, modal_rect, 2)
         
         # 게임 오버 메시지
         game_over_text = self.large_font.render("게임 오버!", True, RED)
-        game_over_rect = game_over_text.get_rect(center=(self.screen_width // 2, modal_y + 40))
+        game_over_rect = game_over_text.get_rect(center=(self.screen_width // 2, modal_y + 35))
         self.screen.blit(game_over_text, game_over_rect)
+        perf.count_surfaces()
+        perf.count_blits()
+        
+        # 이번 기록과 최고 기록
+        if self.result_text:
+            result_text = self.small_font.render(self.result_text, True, BLACK)
+            self.screen.blit(result_text, result_text.get_rect(center=(self.screen_width // 2, modal_y + 63)))
+            perf.count_surfaces()
+            perf.count_blits()
         
         # 재시작 버튼
         restart_button_width = 120
@@ -347,84 +409,403 @@ class Minesweeper:
         restart_text = self.font.render("재시작", True, WHITE)
         restart_text_rect = restart_text.get_rect(center=self.restart_button_rect.center)
         self.screen.blit(restart_text, restart_text_rect)
+        perf.count_surfaces()
+        perf.count_blits()
     
     def get_cell_at_pos(self, pos):
+        # 화면 좌표 -> 카메라를 거쳐 보드의 (행, 열)
         x, y = pos
         if y < self.top_height:
             return None
-        
-        col = x // self.cell_size
-        row = (y - self.top_height) // self.cell_size
-        
-        if 0 <= row < self.height and 0 <= col < self.width:
-            return (row, col)
-        return None
+        return self.camera.cell_at(x, y - self.top_height)
+    
+    def move_camera(self, dx, dy):
+        if self.camera.pan(dx, dy):
+            self.renderer.camera_changed()
+    
+    def zoom_camera(self, step, pos=None):
+        # 확대 단계 변경 (pos: 기준이 되는 화면 좌표, 없으면 보드 영역 가운데)
+        anchor = (pos[0], pos[1] - self.top_height) if pos else None
+        if self.camera.zoom_step(step, anchor):
+            self.cell_size = self.camera.zoom
+            self.renderer.camera_changed()
     
     def left_click(self, row, col):
-        if self.game_over or self.flags[row][col] or self.revealed[row][col] or self.show_restart_modal:
-            return
+        # 이번 클릭으로 새로 열린 셀의 인덱스 목록을 반환
+        if self.show_restart_modal:
+            return []
+        perf.enter("logic")
+        changed = self.play_left_click(row, col)
+        perf.leave()
+        return changed
+    
+    def play_left_click(self, row, col):
+        # 좌클릭 처리 본체 (left_click에서 logic 구간으로 시간 측정)
+        first_click = self.first_click
+        if first_click and self.no_guess and self.engine.preset_mines is None and self.can_place(row, col):
+            # 미리 검증된 추측 없는 보드 사용
+            self.engine.preset_mines = self.no_guess_pool.take(self.width, self.height, self.mines, row, col)
+            self.update_caption()
+        preset = self.engine.preset_mines if first_click else None
+        before = counters(self.engine)
+        changed = self.engine.left_click(row, col)
+        if not changed:
+            return changed
+        # 첫 클릭은 되돌렸다가 다시 할 때 같은 보드가 되도록 지뢰 위치도 기록
+        mines = np.flatnonzero(self.board.grid() & MINE) if first_click else None
+        self.history.record(changed, (), before, counters(self.engine), mines)
+        self.record_click(LEFT, row, col, preset)
+        if self.saver:
+            # 첫 클릭은 지뢰 배치로 모든 칸의 숫자가 바뀜
+            if first_click:
+                self.saver.mark_all()
+            else:
+                self.saver.mark(changed)
+        if self.solver:
+            self.solver.on_reveal(changed)
+        self.clear_hint()
+        if self.show_heatmap:
+            self.request_heatmap()
         
-        # 첫 번째 클릭인 경우
-        if self.first_click:
-            self.place_mines(row, col)
-            self.first_click = False
+        # 첫 번째 클릭인 경우 타이머 시작
+        if first_click:
             self.start_time = time.time()
         
         # 지뢰를 클릭한 경우
-        if self.board[row][col] == -1:
-            self.revealed[row][col] = True
-            self.game_over = True
+        if self.game_over and not self.engine.won:
             self.face_button = 'sad'
             
-            # 폭발 효과 생성
-            x = col * self.cell_size + self.cell_size // 2
-            y = row * self.cell_size + self.top_height + self.cell_size // 2
-            self.explosion = Explosion(x, y, self.cell_size)
-            return
+            # 폭발 효과 생성 (화면 좌표)
+            rect = self.camera.cell_rect(row, col)
+            self.explosion = Explosion(rect.centerx, rect.centery + self.top_height,
+                                       max(self.cell_size, MIN_EXPLOSION_SIZE))
+            self.renderer.mark_game_over()
+            self.record_result()
+            return changed
         
-        # 빈 칸을 클릭한 경우
-        self.reveal_cell(row, col)
+        self.renderer.mark_cells(changed)
         
-        # 승리 조건 확인
-        if self.check_win():
-            self.game_over = True
+        # 승리한 경우
+        if self.engine.won:
             self.face_button = 'cool'
             self.show_restart_modal = True
+            self.record_result()
+        
+        return changed
     
     def right_click(self, row, col):
-        if self.game_over or self.revealed[row][col] or self.show_restart_modal:
+        if self.show_restart_modal:
             return
         
-        # 깃발 토글
-        if not self.flags[row][col]:
-            self.flags[row][col] = True
-            self.mines_left -= 1
+        # 깃발 토글 (풀이기는 깃발을 추론에 쓰지 않으므로 힌트만 지움)
+        perf.enter("logic")
+        before = counters(self.engine)
+        if self.engine.right_click(row, col):
+            self.history.record((), (row * self.width + col,), before, counters(self.engine))
+            self.record_click(RIGHT, row, col)
+            if self.saver:
+                self.saver.mark([row * self.width + col])
+            self.renderer.mark_cell(row, col)
+            self.clear_hint()
+        perf.leave()
+    
+    def can_place(self, row, col):
+        # 클릭할 수 있는 칸인지 (첫 클릭 전 보드 준비 여부 판단용)
+        return not self.board.is_flagged(row, col) and not self.board.is_revealed(row, col)
+    
+    def toggle_no_guess(self):
+        # 추측 없는 모드 전환 (다음 게임부터 적용)
+        self.no_guess = not self.no_guess
+        if self.no_guess:
+            if self.no_guess_pool is None:
+                # 프로세스 풀 모듈은 시작 시간을 줄이기 위해 처음 켤 때 불러옴
+                from minesweeper_noguess import NoGuessPool
+                self.no_guess_pool = NoGuessPool(seed=self.rng.getrandbits(64))
+            self.no_guess_pool.prefetch(self.width, self.height, self.mines)
+        self.update_caption()
+    
+    def update_caption(self):
+        caption = "지뢰 찾기"
+        if self.no_guess:
+            stats = self.no_guess_pool.stats()
+            caption += f" - 추측 없는 모드 (준비 {stats['ready']}, 적중 {stats['hits']}, 미스 {stats['misses']})"
+        if self.practice:
+            caption += " - 연습 모드"
+        pygame.display.set_caption(caption)
+    
+    def record_click(self, kind, row, col, preset=None):
+        # 실제로 상태를 바꾼 클릭만 기록 (게임 시작 기록은 첫 클릭 때)
+        recorder = self.recorder
+        if not recorder or not self.replayable:
+            return
+        if not recorder.recording:
+            recorder.start_game(self.game_seed, self.width, self.height, self.mines, self.no_guess)
+        if preset is not None:
+            recorder.mines(preset)
+        recorder.click(kind, row * self.width + col)
+        if self.game_over:
+            recorder.finish(WON if self.engine.won else LOST)
+    
+    def record_result(self):
+        # 끝난 게임을 통계에 기록하고 재시작 모달에 보여 줄 기록 문구를 정함
+        # (저장은 백그라운드에서 묶어서 처리, 최고 기록은 메모리에 둔 값과 비교)
+        # 연습 모드이거나 되돌린 적이 있는 게임은 기록하지 않음
+        if not self.stats or self.practice or self.rewound:
+            return
+        time_ms = (time.time() - self.start_time) * 1000
+        difficulty = difficulty_key(self.current_difficulty, self.width, self.height, self.mines)
+        best = self.stats.best_time(difficulty)
+        if self.engine.won:
+            if best is None or time_ms < best:
+                self.result_text = f"새 최고 기록! {time_ms / 1000:.2f}초"
+            else:
+                self.result_text = f"기록 {time_ms / 1000:.2f}초 (최고 {best / 1000:.2f}초)"
+        elif best is not None:
+            self.result_text = f"최고 기록 {best / 1000:.2f}초"
+        self.stats.record(difficulty, self.board, self.engine.won, time_ms,
+                          self.engine.clicks, self.no_guess)
+    
+    def start_replay(self, replay):
+        # 기록된 게임과 같은 보드로 새 게임 시작
+        for level, settings in self.difficulty_levels.items():
+            if (settings["width"], settings["height"], settings["mines"]) == (replay.width, replay.height, replay.mines):
+                self.set_difficulty(level)
+                break
         else:
-            self.flags[row][col] = False
-            self.mines_left += 1
+            self.set_custom_difficulty(replay.width, replay.height, replay.mines)
+        self.initialize_game(seed=replay.seed)
+        self.engine.preset_mines = replay.mine_positions
     
-    def reveal_cell(self, row, col):
-        # 이미 열린 칸이거나 깃발이 있는 경우
-        if self.revealed[row][col] or self.flags[row][col]:
+    def game_state(self):
+        # 저장 파일 머리말에 들어가는 게임 상태
+        if self.game_over or self.first_click:
+            elapsed_ms = self.elapsed_time * 1000
+        else:
+            elapsed_ms = int((time.time() - self.start_time) * 1000)
+        return {
+            "difficulty": self.current_difficulty,
+            "width": self.width,
+            "height": self.height,
+            "mines": self.mines,
+            "cell_size": self.difficulty_levels[self.current_difficulty]["cell_size"],
+            "first_click": self.first_click,
+            "game_over": self.game_over,
+            "won": self.engine.won,
+            "no_guess": self.no_guess,
+            "seed": self.game_seed,
+            "elapsed_ms": elapsed_ms,
+            "clicks": self.engine.clicks,
+            "mines_left": self.mines_left,
+        }
+    
+    def autosave(self):
+        # 진행 중인 게임만 저장 (끝났거나 아무것도 하지 않은 게임은 저장 파일 삭제)
+        if not self.saver:
+            return
+        self.last_autosave = time.time()
+        if self.game_over or (self.first_click and not self.board.flag_count):
+            self.saver.delete()
+        elif self.saver.changed or self.saver.exists():
+            self.saver.mark_state()
+            self.saver.save(self.game_state(), self.board)
+    
+    def resume_game(self):
+        # 저장된 게임 불러오기 (파일이 손상되었으면 삭제하고 새 게임)
+        try:
+            state, board = self.saver.load()
+        except (OSError, ValueError):
+            self.saver.delete()
             return
+        level = state["difficulty"]
+        if level not in self.difficulty_levels or level == "사용자 정의":
+            level = "사용자 정의"
+            self.custom_settings.update(width=state["width"], height=state["height"],
+                                        mines=state["mines"], cell_size=state["cell_size"])
+        self.set_difficulty(level)
+        if (self.width, self.height, self.mines) != (state["width"], state["height"], state["mines"]):
+            self.saver.delete()
+            self.initialize_game()
+            return
+        self.initialize_game(seed=state["seed"])
+        self.saver.full = False
+        self.replayable = False
         
-        # 칸 열기
-        self.revealed[row][col] = True
+        engine = self.engine
+        board.debug = self.debug
+        engine.board = board
+        engine.first_click = state["first_click"]
+        engine.game_over = state["game_over"]
+        engine.won = state["won"]
+        engine.mines_left = state["mines_left"]
+        engine.clicks = state["clicks"]
+        # 풀이기는 힌트를 처음 요청할 때 만듦 (큰 보드도 바로 이어서 시작하도록)
+        self.solver = None
+        self.elapsed_time = state["elapsed_ms"] // 1000
+        self.start_time = time.time() - state["elapsed_ms"] / 1000
+        if state["no_guess"] and not self.no_guess:
+            self.toggle_no_guess()
+        if self.show_heatmap:
+            self.request_heatmap()
+        self.renderer.invalidate()
+    
+    def ensure_solver(self):
+        if self.solver is None:
+            self.solver = Solver(self.board, self.mines, HINT_SEARCH_NODES)
+        return self.solver
+    
+    def on_quit(self):
+        if self.heatmap:
+            self.heatmap.shutdown()
+        if self.no_guess_pool:
+            self.no_guess_pool.shutdown()
+        if self.recorder:
+            self.recorder.close()
+        if self.stats:
+            self.stats.close()
+        self.autosave()
+    
+    def show_hint(self):
+        # 다음 수 추천을 보드에 표시
+        if self.game_over or self.show_restart_modal:
+            return
+        self.clear_hint()
+        perf.enter("logic")
+        self.hint = self.ensure_solver().hint()
+        perf.leave()
+        if self.hint:
+            self.renderer.mark_cells([self.hint[1]])
+    
+    def clear_hint(self):
+        if self.hint:
+            self.renderer.mark_cells([self.hint[1]])
+            self.hint = None
+    
+    def toggle_heatmap(self):
+        # 지뢰 확률 표시 전환
+        self.show_heatmap = not self.show_heatmap
+        if self.show_heatmap:
+            if self.heatmap is None:
+                # 프로세스 풀 모듈은 시작 시간을 줄이기 위해 처음 켤 때 불러옴
+                from minesweeper_heatmap import Heatmap
+                self.heatmap = Heatmap()
+            self.request_heatmap()
+        else:
+            self.heatmap.cancel()
+            self.clear_heat()
+    
+    def request_heatmap(self):
+        # 현재 보드의 확률 계산 요청 (첫 클릭 전과 게임이 끝난 뒤에는 표시하지 않음)
+        # 같은 상태를 계산한 적이 있으면 캐시된 결과를 바로 반영
+        if self.first_click or self.game_over:
+            self.heatmap.cancel()
+            self.clear_heat()
+            return
+        self.heatmap.request(self.board, self.mines)
+        self.poll_heatmap()
+    
+    def poll_heatmap(self):
+        # 새로 끝난 계산 결과를 확률 단계로 바꿔 반영하고 단계가 바뀐 칸만 다시 그림
+        # 결과가 늦게 와도 가장 최근에 끝난 결과를 보여 줌 (그 뒤에 열린 칸은 렌더러가 칠하지 않음)
+        probabilities = self.heatmap.poll()
+        if probabilities is None:
+            return
+        heat = np.where(np.isnan(probabilities), NO_HEAT, np.rint(probabilities * (HEAT_LEVELS - 1)))
+        heat = heat.astype(np.uint8).reshape(self.height, self.width)
+        old = self.heat
+        self.heat = heat
+        changed = heat != old if old is not None else heat != NO_HEAT
+        self.renderer.mark_cells(np.flatnonzero(changed).tolist())
+    
+    def clear_heat(self):
+        if self.heat is not None:
+            self.renderer.mark_cells(np.flatnonzero(self.heat != NO_HEAT).tolist())
+            self.heat = None
+    
+    def toggle_practice(self):
+        # 연습 모드 전환 (진행 중인 게임에도 바로 적용)
+        self.practice = not self.practice
+        self.update_caption()
+    
+    def undo(self):
+        # 마지막 좌클릭/우클릭 되돌리기 (끝난 게임은 연습 모드에서만, 지뢰를 누른 수도 되돌릴 수 있음)
+        self.step_history(redo=False)
+    
+    def redo(self):
+        self.step_history(redo=True)
+    
+    def step_history(self, redo):
+        if self.game_over and not self.practice:
+            return
+        perf.enter("logic")
+        was_over = self.game_over
+        was_first = self.first_click
+        changed = self.history.redo(self.engine) if redo else self.history.undo(self.engine)
+        if changed is not None:
+            self.history_changed(*changed, was_over, was_first, redo)
+        perf.leave()
+    
+    def history_changed(self, revealed, flags, was_over, was_first, redo):
+        # 되돌리기/다시 하기로 바뀐 칸만 저장, 풀이기, 화면에 반영
+        changed = np.concatenate((revealed, flags)).tolist()
+        # 기록된 클릭과 달라지므로 리플레이와 통계에서 뺌
+        if self.recorder and self.replayable:
+            self.recorder.finish(ABANDONED)
+        self.replayable = False
+        self.rewound = True
+        if self.saver:
+            self.saver.mark(changed)
+        if self.solver and len(revealed):
+            # 다시 연 칸은 제약 조건에 더하고, 닫은 칸이 있으면 다음 힌트 때 새로 만듦
+            if redo:
+                self.solver.on_reveal(revealed.tolist())
+            else:
+                self.solver = None
+        self.clear_hint()
         
-        # 빈 칸(0)인 경우 주변 칸 자동 열기
-        if self.board[row][col] == 0:
-            for i in range(max(0, row-1), min(self.height, row+2)):
-                for j in range(max(0, col-1), min(self.width, col+2)):
-                    if (i != row or j != col) and not self.revealed[i][j]:
-                        self.reveal_cell(i, j)
+        if was_over and not self.game_over:
+            # 끝난 게임을 되돌리면 타이머는 멈춘 시각부터 다시 감
+            self.face_button = 'smile'
+            self.explosion = None
+            self.show_restart_modal = False
+            self.result_text = None
+            self.start_time = time.time() - self.elapsed_time
+            self.renderer.mark_game_over()
+        elif self.game_over and not was_over:
+            self.face_button = 'cool' if self.engine.won else 'sad'
+            self.show_restart_modal = True
+            self.renderer.mark_game_over()
+        if self.first_click != was_first:
+            # 첫 클릭을 되돌리면 지뢰 배치가 없어지고 타이머도 처음으로, 다시 하면 지금부터 다시 잼
+            if self.first_click:
+                self.start_time = 0
+                self.elapsed_time = 0
+            else:
+                self.start_time = time.time()
+            if self.saver:
+                self.saver.mark_all()
+        self.renderer.mark_cells(changed)
+        if self.show_heatmap:
+            self.request_heatmap()
+    
+    def auto_solve(self):
+        # 확실히 안전한 칸을 더 이상 없을 때까지 모두 열기
+        # 풀이기는 깃발을 보지 않으므로 플레이어가 깃발을 꽂은 안전한 칸은 건너뜀
+        while not self.game_over and not self.show_restart_modal:
+            safe = self.ensure_solver().safe_cells()
+            opened = False
+            for index in sorted(safe):
+                if not self.board.cells[index] & (REVEALED | FLAG):
+                    opened = bool(self.left_click(*divmod(index, self.width))) or opened
+            if not opened:
+                break
+    
+    def reveal_cell(self, row, col):
+        # 칸 열기 (빈 칸(0)인 경우 주변 칸 자동 열기)
+        # 새로 열린 셀의 인덱스 목록을 반환 (이미 열렸거나 깃발이면 빈 목록)
+        return self.engine.reveal_cell(row, col)
     
     def check_win(self):
-        for row in range(self.height):
-            for col in range(self.width):
-                # 지뢰가 아닌 칸이 아직 열리지 않았으면 승리하지 않음
-                if self.board[row][col] != -1 and not self.revealed[row][col]:
-                    return False
-        return True
+        return self.engine.check_win()
     
     def check_face_button_click(self, pos):
         x, y = pos
@@ -444,104 +825,246 @@ class Minesweeper:
         return False
     
     def show_difficulty_menu(self):
+        # 난이도 메뉴를 게임 위에 모달 장면으로 띄움 (게임 루프를 막지 않음)
+        self.manager.push(DifficultyMenu(self))
+    
+    def update(self):
+        # 타이머 업데이트
+        if not self.game_over and not self.first_click:
+            self.elapsed_time = int(time.time() - self.start_time)
+        
+        # 백그라운드에서 끝난 확률 계산 결과 반영
+        if self.show_heatmap and self.heatmap.pending:
+            self.poll_heatmap()
+        
+        # 주기적으로 바뀐 영역만 자동 저장
+        if self.saver and self.saver.changed and time.time() - self.last_autosave >= AUTOSAVE_SECONDS:
+            self.autosave()
+        
+        # 클릭 사이가 길어도 모아 둔 리플레이 기록이 오래 남지 않도록 씀
+        if self.recorder:
+            self.recorder.flush_due()
+    
+    def draw(self):
+        self.draw_board()
+    
+    def redraw(self):
+        self.renderer.invalidate()
+    
+    def frame_delay(self):
+        # 폭발 효과가 진행 중이면 fps에 맞춰 계속 그림
+        if self.explosion:
+            return 0
+        # 타이머가 돌아가는 중이면 다음 초가 될 때까지만 기다림
+        delay = None
+        if not self.game_over and not self.first_click:
+            delay = 1000 - int((time.time() - self.start_time) * 1000) % 1000
+        # 확률 계산 중이면 결과가 나왔는지 자주 확인
+        if self.show_heatmap and self.heatmap.pending:
+            delay = HEATMAP_POLL_MS if delay is None else min(delay, HEATMAP_POLL_MS)
+        # 그 외에는 입력이 올 때까지 대기
+        return delay
+    
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_h:  # 힌트
+                self.show_hint()
+            elif event.key == pygame.K_a:  # 안전한 칸 자동으로 열기
+                self.auto_solve()
+            elif event.key == pygame.K_n:  # 추측 없는 모드 전환
+                self.toggle_no_guess()
+            elif event.key == pygame.K_p:  # 지뢰 확률 표시 전환
+                self.toggle_heatmap()
+            elif event.key == pygame.K_t:  # 연습 모드 전환
+                self.toggle_practice()
+            elif event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:  # 되돌리기 (Shift를 누르면 다시 하기)
+                if event.mod & pygame.KMOD_SHIFT:
+                    self.redo()
+                else:
+                    self.undo()
+            elif event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL:  # 다시 하기
+                self.redo()
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):  # 확대
+                self.zoom_camera(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):  # 축소
+                self.zoom_camera(-1)
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):  # 화면 이동
+                step = max(self.cell_size, PAN_STEP) * (10 if event.mod & pygame.KMOD_SHIFT else 1)
+                dx = {pygame.K_LEFT: -step, pygame.K_RIGHT: step}.get(event.key, 0)
+                dy = {pygame.K_UP: -step, pygame.K_DOWN: step}.get(event.key, 0)
+                self.move_camera(dx, dy)
+        
+        elif event.type == pygame.MOUSEWHEEL:
+            # 마우스 휠: 커서 위치를 기준으로 확대/축소
+            pos = pygame.mouse.get_pos()
+            if event.y and pos[1] >= self.top_height:
+                self.zoom_camera(event.y, pos)
+        
+        elif event.type == pygame.MOUSEMOTION:
+            # 가운데 버튼으로 끌어서 화면 이동
+            if event.buttons[1]:
+                self.move_camera(-event.rel[0], -event.rel[1])
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # 휠(4, 5번 버튼)과 가운데 버튼은 카메라 조작에만 씀
+            if event.button not in (1, 3):
+                return
+            pos = event.pos
+            
+            # 재시작 모달 버튼 클릭 확인
+            if self.check_restart_button_click(pos):
+                return
+            
+            # 재시작 버튼 클릭 확인
+            if self.check_face_button_click(pos):
+                return
+            
+            # 난이도 메뉴 열기 (상단 영역 더블 클릭)
+            if event.button == 1 and pos[1] < self.top_height:
+                if hasattr(self, 'last_click_time') and time.time() - self.last_click_time < 0.3:
+                    self.show_difficulty_menu()
+                self.last_click_time = time.time()
+            
+            cell = self.get_cell_at_pos(pos)
+            if cell:
+                row, col = cell
+                if event.button == 1:  # 좌클릭
+                    self.left_click(row, col)
+                elif event.button == 3:  # 우클릭
+                    self.right_click(row, col)
+    
+    def main_loop(self):
+        self.manager.run()
+        pygame.quit()
+
+class DifficultyMenu(Scene):
+    # 난이도 선택 모달 (게임 화면 위에 그려짐)
+    def __init__(self, game):
+        self.game = game
+        self.drawn = False
+        
         menu_width = 300
-        menu_height = 200
-        menu_x = (self.screen_width - menu_width) // 2
-        menu_y = (self.screen_height - menu_height) // 2
+        levels = list(game.difficulty_levels) + [ENDLESS_LEVEL]
+        menu_height = 80 + len(levels) * 50
+        self.menu_x = (game.screen_width - menu_width) // 2
+        self.menu_y = (game.screen_height - menu_height) // 2
         
-        menu_surface = pygame.Surface((menu_width, menu_height))
-        menu_surface.fill(WHITE)
-        pygame.draw.rect(menu_surface, BLACK, (0, 0, menu_width, menu_height), 2)
+        self.menu_surface = pygame.Surface((menu_width, menu_height))
+        self.menu_surface.fill(WHITE)
+        pygame.draw.rect(self.menu_surface, BLACK, (0, 0, menu_width, menu_height), 2)
         
-        title_text = self.font.render("난이도 선택", True, BLACK)
+        title_text = game.font.render("난이도 선택", True, BLACK)
         title_rect = title_text.get_rect(center=(menu_width // 2, 30))
-        menu_surface.blit(title_text, title_rect)
+        self.menu_surface.blit(title_text, title_rect)
         
         button_height = 40
         button_width = 200
         button_margin = 10
         button_x = (menu_width - button_width) // 2
         
-        buttons = []
+        self.buttons = []
         
-        for i, level in enumerate(self.difficulty_levels.keys()):
+        for i, level in enumerate(levels):
             button_y = 60 + i * (button_height + button_margin)
             button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
-            buttons.append((button_rect, level))
+            self.buttons.append((button_rect, level))
             
-            pygame.draw.rect(menu_surface, DARK_GRAY, button_rect)
-            pygame.draw.rect(menu_surface, BLACK, button_rect, 2)
+            pygame.draw.rect(self.menu_surface, DARK_GRAY, button_rect)
+            pygame.draw.rect(self.menu_surface, BLACK, button_rect, 2)
             
-            level_text = self.font.render(level, True, WHITE)
+            level_text = game.font.render(level, True, WHITE)
             text_rect = level_text.get_rect(center=button_rect.center)
-            menu_surface.blit(level_text, text_rect)
-        
-        self.screen.blit(menu_surface, (menu_x, menu_y))
-        pygame.display.update()
-        
-        # 메뉴 이벤트 처리
-        menu_active = True
-        while menu_active:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_pos = pygame.mouse.get_pos()
-                    relative_pos = (mouse_pos[0] - menu_x, mouse_pos[1] - menu_y)
-                    
-                    for button_rect, level in buttons:
-                        if button_rect.collidepoint(relative_pos):
-                            self.set_difficulty(level)
-                            self.initialize_game()
-                            menu_active = False
-                            break
+            self.menu_surface.blit(level_text, text_rect)
     
-    def main_loop(self):
-        running = True
-        while running:
-            # 타이머 업데이트
-            if not self.game_over and not self.first_click:
-                self.elapsed_time = int(time.time() - self.start_time)
-            
-            # 이벤트 처리
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    
-                    # 재시작 모달 버튼 클릭 확인
-                    if self.check_restart_button_click(pos):
-                        continue
-                    
-                    # 재시작 버튼 클릭 확인
-                    if self.check_face_button_click(pos):
-                        continue
-                    
-                    # 난이도 메뉴 열기 (상단 영역 더블 클릭)
-                    if event.button == 1 and pos[1] < self.top_height and event.button == 1:
-                        if hasattr(self, 'last_click_time') and time.time() - self.last_click_time < 0.3:
-                            self.show_difficulty_menu()
-                        self.last_click_time = time.time()
-                    
-                    cell = self.get_cell_at_pos(pos)
-                    if cell:
-                        row, col = cell
-                        if event.button == 1:  # 좌클릭
-                            self.left_click(row, col)
-                        elif event.button == 3:  # 우클릭
-                            self.right_click(row, col)
-            
-            # 화면 그리기
-            self.draw_board()
-            
-            # 프레임 제한
-            pygame.time.Clock().tick(30)
+    def draw(self):
+        # 메뉴는 변하지 않으므로 처음 한 번만 그림
+        if not self.drawn:
+            rect = self.game.screen.blit(self.menu_surface, (self.menu_x, self.menu_y))
+            perf.count_blits()
+            perf.enter("flip")
+            pygame.display.update(rect)
+            perf.leave()
+            self.drawn = True
+    
+    def redraw(self):
+        # 게임 화면을 다시 그린 뒤 그 위에 메뉴를 다시 그림
+        self.game.redraw()
+        self.game.draw_board()
+        self.drawn = False
+    
+    def close(self):
+        self.manager.pop()
+        # 메뉴에 가려졌던 부분을 다시 그리도록 전체 다시 그리기
+        self.game.renderer.invalidate()
+    
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.close()
         
-        pygame.quit()
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            relative_pos = (event.pos[0] - self.menu_x, event.pos[1] - self.menu_y)
+            
+            for button_rect, level in self.buttons:
+                if button_rect.collidepoint(relative_pos):
+                    if level == ENDLESS_LEVEL:
+                        # 무한 모드는 게임 위에 별도 장면으로 실행 (Esc로 돌아옴)
+                        from minesweeper_endless import EndlessGame
+                        self.manager.pop()
+                        self.manager.push(EndlessGame(self.game))
+                        break
+                    self.game.set_difficulty(level)
+                    self.game.initialize_game()
+                    self.manager.pop()
+                    break
+
+class ReplayPlayer(Scene):
+    # 기록된 게임을 창에서 재생하는 장면 (기록된 시간 간격대로 클릭을 다시 실행)
+    # Esc로 재생을 멈추고 게임으로 돌아감
+    def __init__(self, game, replay, speed=1.0):
+        self.game = game
+        self.fps = game.fps
+        self.replay = replay
+        self.speed = speed
+        game.start_replay(replay)
+        self.next_click = 0
+        self.next_time = time.perf_counter() + self.click_delay(0)
+    
+    def click_delay(self, number):
+        if number >= len(self.replay.clicks):
+            return 0
+        return self.replay.clicks[number][0] / 1000 / self.speed
+    
+    def update(self):
+        clicks = self.replay.clicks
+        now = time.perf_counter()
+        while self.next_click < len(clicks) and now >= self.next_time:
+            _, kind, index = clicks[self.next_click]
+            row, col = divmod(index, self.game.width)
+            if kind == LEFT:
+                self.game.left_click(row, col)
+            else:
+                self.game.right_click(row, col)
+            self.next_click += 1
+            self.next_time += self.click_delay(self.next_click)
+        self.game.update()
+    
+    def draw(self):
+        self.game.draw_board()
+    
+    def redraw(self):
+        self.game.redraw()
+    
+    def frame_delay(self):
+        delay = self.game.frame_delay()
+        if self.next_click < len(self.replay.clicks):
+            wait = max(0, int((self.next_time - time.perf_counter()) * 1000))
+            delay = wait if delay is None else min(delay, wait)
+        return delay
+    
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.manager.pop()
+            self.game.redraw()
 
 if __name__ == "__main__":
     game = Minesweeper()
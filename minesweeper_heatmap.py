@@ -0,0 +1,144 @@
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from minesweeper_board import Board, MINE, REVEALED, NUMBER_MASK
+from minesweeper_solver import Solver
+
+# 보드 상태별 결과 캐시 크기 (확률 배열 바이트 수의 합)
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+# 작업자 프로세스 상태: 가장 최근에 요청된 작업 번호(공유 메모리)와
+# 연결 성분별 계산 캐시 (제약 조건이 같으면 보드가 달라도 결과가 같으므로 작업 사이에 유지)
+latest_job = None
+component_cache = {}
+
+
+class Cancelled(Exception):
+    pass
+
+
+def init_worker(latest):
+    global latest_job
+    latest_job = latest
+
+
+def visible_cells(board):
+    # 플레이어에게 보이는 정보만 남긴 셀 바이트 (닫힌 칸의 지뢰와 깃발은 지움)
+    # 풀이기는 깃발을 쓰지 않으므로 깃발만 바뀐 상태는 같은 지문이 됨
+    grid = board.grid()
+    return np.where(grid & REVEALED, grid & (REVEALED | MINE | NUMBER_MASK), 0).astype(np.uint8).tobytes()
+
+
+def fingerprint(width, height, mines, cells):
+    return width, height, mines, hashlib.blake2b(cells, digest_size=16).digest()
+
+
+def compute_probabilities(width, height, mines, cells, job=None):
+    # 칸별 지뢰 확률 배열 (float32, 열린 칸과 확률을 구하지 못한 칸은 NaN)
+    # job이 가장 최근 작업이 아니게 되면 다음 연결 성분으로 넘어가기 전에 Cancelled
+    def check():
+        if job is not None and latest_job is not None and latest_job.value != job:
+            raise Cancelled
+
+    check()
+    board = Board(width, height)
+    board.cells = bytearray(cells)
+    solver = Solver(board, mines)
+    solver.cache = component_cache
+    frontier, other, skipped = solver.probabilities(check)
+
+    result = np.full(width * height, np.nan, dtype=np.float32)
+    if other is not None:
+        # 경계 밖 닫힌 칸만 other (탐색 한도를 넘은 성분의 칸은 확률을 모르므로 NaN으로 남김)
+        result[(np.frombuffer(cells, dtype=np.uint8) & REVEALED) == 0] = other
+        if skipped:
+            result[np.asarray(skipped, dtype=np.int64)] = np.nan
+    if frontier:
+        result[np.fromiter(frontier.keys(), dtype=np.int64, count=len(frontier))] = list(frontier.values())
+    return result
+
+
+def heatmap_task(task):
+    # 작업자 프로세스에서 실행되는 확률 계산 작업 (취소되면 None)
+    width, height, mines, cells, job = task
+    try:
+        return compute_probabilities(width, height, mines, cells, job)
+    except Cancelled:
+        return None
+
+
+class Heatmap:
+    # 지뢰 확률을 백그라운드 프로세스에서 계산하는 작업자
+    # 보드가 바뀌면 이전 작업은 취소하고 (대기 중이면 바로, 실행 중이면 다음 연결 성분에서) 최신 상태만 계산
+    # 결과는 보드 상태 지문별로 캐시해서 같은 상태를 다시 요청하면 바로 돌려줌
+    def __init__(self):
+        self.latest = multiprocessing.Value('Q', 0, lock=False)
+        self.executor = ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(self.latest,))
+        self.job = 0
+        self.future = None
+        self.running = None  # 계산 중인 상태의 지문
+        self.result = None  # 아직 가져가지 않은 완료된 결과
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def pending(self):
+        return self.future is not None or self.result is not None
+
+    def request(self, board, mines):
+        # 보드 상태의 확률 계산 요청 (캐시에 있으면 다음 poll()에서 바로 받음)
+        cells = visible_cells(board)
+        key = fingerprint(board.width, board.height, mines, cells)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            self.cancel()
+            self.result = cached
+            return
+        if key == self.running:
+            return
+        self.misses += 1
+        self.cancel()
+        self.running = key
+        self.future = self.executor.submit(heatmap_task, (board.width, board.height, mines, cells, self.job))
+
+    def cancel(self):
+        # 대기 중이거나 실행 중인 작업을 버림 (작업 번호를 올리면 실행 중인 작업도 곧 멈춤)
+        self.job += 1
+        self.latest.value = self.job
+        if self.future is not None:
+            self.future.cancel()
+        self.future = None
+        self.running = None
+        self.result = None
+
+    def poll(self):
+        # 새로 완료된 확률 배열 (없으면 None)
+        future = self.future
+        if future is not None and future.done():
+            key = self.running
+            self.future = None
+            self.running = None
+            if not future.cancelled() and future.exception() is None and future.result() is not None:
+                self.store(key, future.result())
+                self.result = future.result()
+        result, self.result = self.result, None
+        return result
+
+    def store(self, key, probabilities):
+        self.cache[key] = probabilities
+        self.cache_bytes += probabilities.nbytes
+        while self.cache_bytes > MAX_CACHE_BYTES and len(self.cache) > 1:
+            _, old = self.cache.popitem(last=False)
+            self.cache_bytes -= old.nbytes
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
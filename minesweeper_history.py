@@ -0,0 +1,162 @@
+from collections import deque
+
+import numpy as np
+
+from minesweeper_board import MINE, REVEALED, FLAG
+
+# 되돌리기 기록이 쓸 수 있는 최대 메모리 (바이트, MINESWEEPER_HISTORY_BYTES로 변경)
+DEFAULT_HISTORY_BYTES = 8 * 1024 * 1024
+# 수 하나에 드는 고정 메모리 (객체와 상태 튜플, 대략값)
+MOVE_OVERHEAD = 256
+# 예산을 넘으면 이 비율 아래가 될 때까지 오래된 수를 합침 (합치는 일이 매번 일어나지 않도록)
+TRIM_RATIO = 0.75
+
+
+def counters(engine):
+    # 수 전후로 바뀌는 카운터와 규칙 상태
+    # 깃발 카운터는 저장하지 않고 되돌릴 때 바뀐 칸에서 다시 셈
+    # (첫 클릭 전에 꽂은 깃발은 지뢰 배치 뒤에 틀린 깃발 수가 달라지므로)
+    board = engine.board
+    return (board.revealed_safe, board.revealed_mines,
+            engine.clicks, engine.mines_left, engine.game_over, engine.won, engine.first_click)
+
+
+def restore_counters(engine, state):
+    board = engine.board
+    (board.revealed_safe, board.revealed_mines,
+     engine.clicks, engine.mines_left, engine.game_over, engine.won, engine.first_click) = state
+
+
+class Move:
+    # 수 하나(또는 합쳐진 여러 수)로 바뀐 칸과 전후 카운터
+    # 열림 비트와 깃발 비트가 바뀐 칸을 따로 저장하고, 되돌리기와 다시 하기 모두 같은 비트를 뒤집음
+    # 칸은 인덱스 배열(int32)로 저장하고, 칸이 많아서 비트 배열이 더 작으면 칸당 1비트로 저장
+    # 첫 클릭은 지뢰 위치도 저장해서 되돌리면 지뢰를 걷어 내고 (다음 클릭이 다시 첫 클릭), 다시 하면 그대로 배치
+    __slots__ = ("revealed", "flags", "packed", "before", "after", "mines")
+
+    def __init__(self, revealed, flags, before, after, packed=False, mines=None):
+        self.revealed = revealed
+        self.flags = flags
+        self.packed = packed
+        self.before = before
+        self.after = after
+        self.mines = mines
+
+    @property
+    def nbytes(self):
+        mines = self.mines.nbytes if self.mines is not None else 0
+        return self.revealed.nbytes + self.flags.nbytes + mines + MOVE_OVERHEAD
+
+    def indices(self, cells):
+        # (열림이 바뀐 칸, 깃발이 바뀐 칸) 인덱스 배열
+        if not self.packed:
+            return self.revealed, self.flags
+        return (np.flatnonzero(np.unpackbits(self.revealed, count=cells)),
+                np.flatnonzero(np.unpackbits(self.flags, count=cells)))
+
+    def apply(self, engine, state):
+        # 바뀐 칸의 비트를 뒤집고 카운터를 state로 맞춤 (바뀐 칸 수에 비례하는 시간)
+        board = engine.board
+        grid = board.grid().reshape(-1)
+        revealed, flags = self.indices(grid.size)
+        if self.mines is not None and state is self.after:
+            board.set_mines(self.mines)
+        grid[revealed] ^= REVEALED
+        if len(flags):
+            cells = grid[flags]
+            # 깃발이 생긴 칸은 +1, 없어진 칸은 -1
+            delta = np.where(cells & FLAG, -1, 1)
+            board.flag_count += int(delta.sum())
+            board.wrong_flags += int(delta[(cells & MINE) == 0].sum())
+            grid[flags] = cells ^ FLAG
+        if self.mines is not None and state is self.before:
+            board.set_mines(())
+        restore_counters(engine, state)
+        if board.debug:
+            board.verify_counters()
+        return revealed, flags
+
+
+def merge(moves, cells):
+    # 연속된 수들을 하나의 체크포인트로 합침
+    # 열림은 앞으로만 진행하므로 겹치지 않고, 같은 칸의 깃발 토글은 짝수 번이면 서로 지워짐
+    revealed = np.zeros(cells, dtype=bool)
+    flags = np.zeros(cells, dtype=bool)
+    for move in moves:
+        moved_revealed, moved_flags = move.indices(cells)
+        revealed[moved_revealed] ^= True
+        flags[moved_flags] ^= True
+    # 인덱스 배열(칸당 4바이트)과 비트 배열 두 개 중 작은 쪽으로 저장
+    changed = int(revealed.sum()) + int(flags.sum())
+    if changed * 4 > 2 * ((cells + 7) // 8):
+        return Move(np.packbits(revealed), np.packbits(flags), moves[0].before, moves[-1].after,
+                    packed=True, mines=moves[0].mines)
+    return Move(np.flatnonzero(revealed).astype(np.int32), np.flatnonzero(flags).astype(np.int32),
+                moves[0].before, moves[-1].after, mines=moves[0].mines)
+
+
+class History:
+    # 좌클릭/우클릭 되돌리기와 다시 하기
+    # 수마다 보드 전체가 아니라 바뀐 칸과 카운터만 저장하고, 전체 크기가 예산을 넘으면
+    # 가장 오래된 수들을 하나의 체크포인트로 합침 (합친 수들은 한 번에 되돌려짐)
+    # 합쳐도 크기가 줄지 않으면 가장 오래된 기록부터 버림
+    def __init__(self, cells, max_bytes=DEFAULT_HISTORY_BYTES):
+        self.cells = cells
+        self.max_bytes = max_bytes
+        self.undo_moves = deque()  # 오래된 수부터
+        self.redo_moves = []  # 마지막에 되돌린 수가 끝에
+        self.bytes = 0
+
+    def can_undo(self):
+        return bool(self.undo_moves)
+
+    def can_redo(self):
+        return bool(self.redo_moves)
+
+    def record(self, revealed, flags, before, after, mines=None):
+        # 새 수 기록 (다시 하기 기록은 버림), mines: 첫 클릭으로 배치된 지뢰 위치
+        for move in self.redo_moves:
+            self.bytes -= move.nbytes
+        self.redo_moves.clear()
+        if mines is not None:
+            mines = np.asarray(mines, dtype=np.int32)
+        move = Move(np.asarray(revealed, dtype=np.int32), np.asarray(flags, dtype=np.int32), before, after,
+                    mines=mines)
+        self.undo_moves.append(move)
+        self.bytes += move.nbytes
+        if self.bytes > self.max_bytes:
+            self.trim()
+
+    def trim(self):
+        # 오래된 수부터 목표 크기만큼 묶어서 한 번에 하나의 체크포인트로 합침
+        # (맨 앞이 이미 체크포인트면 함께 합쳐짐, 한 번 합치면 예산의 1/4 이상이 비므로 자주 일어나지 않음)
+        target = int(self.max_bytes * TRIM_RATIO)
+        moves = []
+        freed = 0
+        while self.undo_moves and self.bytes - freed > target:
+            move = self.undo_moves.popleft()
+            moves.append(move)
+            freed += move.nbytes
+        if len(moves) > 1:
+            moves = [merge(moves, self.cells)]
+            self.bytes += moves[0].nbytes - freed
+        self.undo_moves.extendleft(moves)
+        # 합쳐도 목표 크기를 넘으면 가장 오래된 기록을 버림 (그 이전으로는 되돌릴 수 없음)
+        while self.bytes > target and self.undo_moves:
+            self.bytes -= self.undo_moves.popleft().nbytes
+
+    def undo(self, engine):
+        # 마지막 수를 되돌리고 (열림이 바뀐 칸, 깃발이 바뀐 칸) 반환 (기록이 없으면 None)
+        if not self.undo_moves:
+            return None
+        move = self.undo_moves.pop()
+        self.redo_moves.append(move)
+        return move.apply(engine, move.before)
+
+    def redo(self, engine):
+        # 마지막으로 되돌린 수를 다시 적용하고 (열림이 바뀐 칸, 깃발이 바뀐 칸) 반환 (없으면 None)
+        if not self.redo_moves:
+            return None
+        move = self.redo_moves.pop()
+        self.undo_moves.append(move)
+        return move.apply(engine, move.after)
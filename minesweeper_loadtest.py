@@ -0,0 +1,234 @@
+import asyncio
+import json
+import random
+import time
+
+from minesweeper_board import MINE, REVEALED, FLAG
+from minesweeper_engine import DIFFICULTY_LEVELS
+from minesweeper_server import (
+    LENGTH, REQUEST, RESPONSE, NEW_GAME, CLICK, SESSION, CLICK_RESULT, READ_SIZE,
+    NEW, LEFT, RIGHT, CLOSE, STATS, OK, STATE_GAME_OVER, STATE_WON,
+    CELL_MINE, CELL_FLAG, CELL_CLOSED, CELL_HIDDEN_MINE,
+    DEFAULT_HOST, DEFAULT_PORT, GameServer, decode_cells, percentiles, print_stats,
+)
+from minesweeper_sim import POLICIES, LEFT as SIM_LEFT
+
+
+class ServerError(Exception):
+    pass
+
+
+class Client:
+    # 연결 하나를 여러 플레이어가 함께 쓰는 클라이언트
+    # 요청마다 번호를 붙여 응답을 기다리지 않고 이어서 보내고(파이프라이닝), 응답은 번호로 찾아 돌려줌
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_request = 1
+        self.pending = {}  # 요청 번호 -> Future
+        self.reader_task = asyncio.ensure_future(self.read_responses())
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def request(self, kind, payload=b""):
+        request_id = self.next_request
+        self.next_request = (self.next_request + 1) & 0xFFFFFFFF
+        body = REQUEST.pack(kind, request_id) + payload
+        self.writer.write(LENGTH.pack(len(body)) + body)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        return future
+
+    async def read_responses(self):
+        buffer = bytearray()
+        try:
+            while True:
+                data = await self.reader.read(READ_SIZE)
+                if not data:
+                    break
+                buffer += data
+                offset = 0
+                while len(buffer) - offset >= LENGTH.size:
+                    length, = LENGTH.unpack_from(buffer, offset)
+                    end = offset + LENGTH.size + length
+                    if len(buffer) < end:
+                        break
+                    body = bytes(buffer[offset + LENGTH.size:end])
+                    _, request_id, status = RESPONSE.unpack_from(body)
+                    future = self.pending.pop(request_id, None)
+                    if future is not None and not future.done():
+                        if status == OK:
+                            future.set_result(body[RESPONSE.size:])
+                        else:
+                            future.set_exception(ServerError(body[RESPONSE.size:].decode("utf-8", "replace")))
+                    offset = end
+                del buffer[:offset]
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("서버 연결이 끊겼습니다"))
+            self.pending.clear()
+
+    async def new_game(self, width, height, mines, seed=0):
+        payload = await self.request(NEW, NEW_GAME.pack(width, height, mines, seed))
+        return SESSION.unpack(payload)[0]
+
+    async def click(self, kind, session_id, index):
+        # (게임 상태, 남은 지뢰 수, [(칸 인덱스, 값)]) 반환
+        payload = await self.request(kind, CLICK.pack(session_id, index))
+        state, mines_left, count = CLICK_RESULT.unpack_from(payload)
+        return state, mines_left, decode_cells(payload, CLICK_RESULT.size, count)
+
+    async def close_game(self, session_id):
+        await self.request(CLOSE, SESSION.pack(session_id))
+
+    async def stats(self):
+        return json.loads(await self.request(STATS))
+
+    async def close(self):
+        self.writer.close()
+        await self.reader_task
+
+
+class RemoteBoard:
+    # 서버에서 받은 바뀐 칸만으로 유지하는 보드 사본 (Board와 같은 셀 상태 바이트 형식)
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+
+
+class RemoteGame:
+    # 시뮬레이션 플레이어(minesweeper_sim)가 GameEngine 대신 볼 수 있는 게임 상태
+    def __init__(self, width, height, mines):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.board = RemoteBoard(width, height)
+        self.first_click = True
+        self.game_over = False
+        self.won = False
+        self.mines_left = mines
+        self.clicks = 0
+
+    def apply(self, kind, result):
+        # 클릭 응답을 반영하고 새로 열린 칸 목록 반환
+        state, self.mines_left, cells = result
+        self.clicks += 1
+        if kind == LEFT:
+            self.first_click = False
+        self.game_over = bool(state & STATE_GAME_OVER)
+        self.won = bool(state & STATE_WON)
+        board = self.board.cells
+        revealed = []
+        for index, value in cells:
+            if value == CELL_FLAG:
+                board[index] = FLAG
+            elif value == CELL_CLOSED:
+                board[index] = 0
+            elif value == CELL_HIDDEN_MINE:
+                board[index] |= MINE
+            else:
+                board[index] = REVEALED | (MINE if value == CELL_MINE else value)
+                revealed.append(index)
+        return revealed
+
+
+async def play(client, settings, policy_name, games, rng, latencies, totals):
+    # 플레이어 하나: games개의 게임을 끝까지 플레이
+    width, height, mines = settings["width"], settings["height"], settings["mines"]
+    for _ in range(games):
+        session_id = await client.new_game(width, height, mines, rng.getrandbits(63) | 1)
+        game = RemoteGame(width, height, mines)
+        policy = POLICIES[policy_name](random.Random(rng.getrandbits(64)))
+        policy.start(game)
+        while not game.game_over:
+            button, row, col = policy.choose(game)
+            kind = LEFT if button == SIM_LEFT else RIGHT
+            start = time.perf_counter()
+            result = await client.click(kind, session_id, row * width + col)
+            latencies.append(time.perf_counter() - start)
+            changed = game.apply(kind, result)
+            policy.observe(game, button, row, col, changed)
+        await client.close_game(session_id)
+        totals["games"] += 1
+        totals["wins"] += game.won
+        totals["clicks"] += game.clicks
+
+
+async def run_load_test(host, port, players, connections, games, settings, policy="deduction", seed=0):
+    # players명의 플레이어를 connections개의 연결에 나눠 동시에 실행하고 결과 요약 반환
+    clients = [await Client.connect(host, port) for _ in range(connections)]
+    rng = random.Random(seed)
+    latencies = []
+    totals = {"games": 0, "wins": 0, "clicks": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        play(clients[number % connections], settings, policy, games, random.Random(rng.getrandbits(64)),
+             latencies, totals)
+        for number in range(players)
+    ])
+    elapsed = time.perf_counter() - start
+    server_stats = await clients[0].stats()
+    for client in clients:
+        await client.close()
+    return {
+        **totals,
+        "players": players,
+        "connections": connections,
+        "seconds": elapsed,
+        "clicks_per_second": totals["clicks"] / elapsed if elapsed > 0 else 0.0,
+        "latency_us": percentiles(latencies),
+        "server": server_stats,
+    }
+
+
+def print_report(report):
+    print(f"플레이어 {report['players']}명, 연결 {report['connections']}개")
+    print(f"게임 {report['games']}개 (승리 {report['wins']}), 클릭 {report['clicks']}개, {report['seconds']:.2f}초")
+    print(f"처리량: {report['clicks_per_second']:.0f} 클릭/초")
+    latency = report["latency_us"]
+    if latency:
+        print(f"왕복 지연: p50 {latency['p50']:.0f}us  p95 {latency['p95']:.0f}us  p99 {latency['p99']:.0f}us")
+    print("서버:")
+    print_stats(report["server"])
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--local", action="store_true", help="같은 프로세스에 서버를 띄워서 측정")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--games", type=int, default=10, help="플레이어당 게임 수")
+    parser.add_argument("--difficulty", default="고급", choices=list(DIFFICULTY_LEVELS))
+    parser.add_argument("--policy", default="deduction", choices=list(POLICIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과를 JSON으로 저장할 파일")
+
+
+async def load_test(args):
+    host, port = args.host, args.port
+    listener = None
+    if args.local:
+        listener = await GameServer().start(host, 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+    try:
+        return await run_load_test(host, port, args.players, max(1, min(args.connections, args.players)),
+                                   args.games, DIFFICULTY_LEVELS[args.difficulty], args.policy, args.seed)
+    finally:
+        if listener:
+            listener.close()
+            await listener.wait_closed()
+
+
+def main(args):
+    report = asyncio.run(load_test(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
@@ -1,8 +1,10 @@
 import pygame
 import sys
-import random
 import math
-import time
+import numpy as np
+from minesweeper_display import display
+from minesweeper_scene import Scene, SceneManager
+from minesweeper_perf import perf
 
 # 색상 정의
 WHITE = (255, 255, 255)
@@ -11,71 +13,71 @@ GRAY = (192, 192, 192)
 DARK_GRAY = (128, 128, 128)
 BLUE = (0, 0, 255)
 
-class Mine:
-    def __init__(self, screen_width, screen_height):
-        self.x = random.randint(0, screen_width)
-        self.y = random.randint(0, screen_height)
-        self.size = random.randint(10, 30)
-        self.speed = random.uniform(0.5, 2.0)
-        self.angle = random.uniform(0, 2 * math.pi)
+class MineField:
+    # 배경 지뢰들을 배열로 저장하고 한 번에 이동/그리기
+    def __init__(self, screen_width, screen_height, count):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        
+        rng = np.random.default_rng()
+        self.x = rng.uniform(0, screen_width, count)
+        self.y = rng.uniform(0, screen_height, count)
+        self.size = rng.integers(10, 31, count)
+        # 속도 벡터는 생성할 때 한 번만 계산
+        speed = rng.uniform(0.5, 2.0, count)
+        angle = rng.uniform(0, 2 * math.pi, count)
+        self.vx = np.cos(angle) * speed
+        self.vy = np.sin(angle) * speed
+        
+        # 크기별 지뢰 스프라이트 캐시
+        self.sprites = {}
     
     def move(self):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+        self.x += self.vx
+        self.y += self.vy
         
         # 화면 경계 처리
-        if self.x < 0:
-            self.x = self.screen_width
-        elif self.x > self.screen_width:
-            self.x = 0
-        
-        if self.y < 0:
-            self.y = self.screen_height
-        elif self.y > self.screen_height:
-            self.y = 0
+        self.x = np.where(self.x < 0, self.screen_width, np.where(self.x > self.screen_width, 0, self.x))
+        self.y = np.where(self.y < 0, self.screen_height, np.where(self.y > self.screen_height, 0, self.y))
+    
+    def get_sprite(self, size):
+        sprite = self.sprites.get(size)
+        if sprite is None:
+            # 지뢰 그리기 (간단한 원과 십자가)
+            sprite = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+            perf.count_surfaces()
+            center = size
+            pygame.draw.circle(sprite, BLACK, (center, center), size)
+            pygame.draw.line(sprite, GRAY, (center - size/2, center), (center + size/2, center), 2)
+            pygame.draw.line(sprite, GRAY, (center, center - size/2), (center, center + size/2), 2)
+            self.sprites[size] = sprite
+        return sprite
     
     def draw(self, screen):
-        # 지뢰 그리기 (간단한 원과 십자가)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.size)
-        pygame.draw.line(screen, GRAY, (self.x - self.size/2, self.y), (self.x + self.size/2, self.y), 2)
-        pygame.draw.line(screen, GRAY, (self.x, self.y - self.size/2), (self.x, self.y + self.size/2), 2)
+        xs = (self.x - self.size).astype(int).tolist()
+        ys = (self.y - self.size).astype(int).tolist()
+        screen.blits(
+            [(self.get_sprite(size), (x, y)) for size, x, y in zip(self.size.tolist(), xs, ys)],
+            doreturn=False,
+        )
+        perf.count_blits(len(xs))
 
-class MainPage:
-    def __init__(self):
-        pygame.init()
-        pygame.display.set_caption("지뢰 찾기")
-        
-        # 화면 설정
+class MainPage(Scene):
+    fps = 60
+    
+    def __init__(self, manager=None):
+        # 화면 설정 (화면과 글꼴은 게임 장면과 함께 씀)
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        
-        # 폰트 초기화
-        pygame.font.init()
-        
-        # macOS에서 한글 지원 폰트 시도
-        try:
-            # macOS 한글 폰트 경로
-            font_path = '/System/Library/Fonts/AppleSDGothicNeo.ttc'
-            self.title_font = pygame.font.Font(font_path, 60)
-            self.button_font = pygame.font.Font(font_path, 30)
-            self.credit_font = pygame.font.Font(font_path, 20)
-        except:
-            try:
-                # 시스템 한글 폰트 시도
-                self.title_font = pygame.font.SysFont('AppleGothic', 60, bold=True)
-                self.button_font = pygame.font.SysFont('AppleGothic', 30)
-                self.credit_font = pygame.font.SysFont('AppleGothic', 20)
-            except:
-                # 기본 폰트로 대체
-                self.title_font = pygame.font.SysFont('Arial', 60, bold=True)
-                self.button_font = pygame.font.SysFont('Arial', 30)
-                self.credit_font = pygame.font.SysFont('Arial', 20)
+        self.screen = display.set_mode((self.screen_width, self.screen_height), "지뢰 찾기")
+        
+        # 폰트 (한글 글꼴은 처음 실행할 때 한 번만 찾아서 설정 파일에 저장)
+        self.title_font = display.font(60)
+        self.button_font = display.font(30)
+        self.credit_font = display.font(20)
         
         # 배경 지뢰 애니메이션
-        self.mines = [Mine(self.screen_width, self.screen_height) for _ in range(15)]
+        self.mines = MineField(self.screen_width, self.screen_height, 15)
         
         # 버튼 설정
         self.button_width = 200
@@ -84,58 +86,75 @@ class MainPage:
         self.button_y = self.screen_height // 2 + 50
         self.button_rect = pygame.Rect(self.button_x, self.button_y, self.button_width, self.button_height)
         
-        self.run()
-    
-    def draw_main_page(self):
-        # 배경 그리기
-        self.screen.fill(GRAY)
+        # 제목, 버튼, 제작자 정보는 한 번만 그려 두는 고정 레이어
+        self.build_static_layer()
         
-        # 배경 지뢰 애니메이션
-        for mine in self.mines:
-            mine.move()
-            mine.draw(self.screen)
+        # 장면 관리자가 없으면 직접 만들어 메인 루프 실행
+        self.manager = manager
+        if manager is None:
+            SceneManager().push(self)
+            self.run()
+    
+    def build_static_layer(self):
+        self.static_layer = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         
         # 제목 그리기
         title_text = self.title_font.render("지뢰 찾기 게임", True, BLACK)
         title_rect = title_text.get_rect(center=(self.screen_width // 2, self.screen_height // 3))
-        self.screen.blit(title_text, title_rect)
+        self.static_layer.blit(title_text, title_rect)
         
         # 시작 버튼 그리기
-        pygame.draw.rect(self.screen, DARK_GRAY, self.button_rect)
-        pygame.draw.rect(self.screen, BLACK, self.button_rect, 2)
+        pygame.draw.rect(self.static_layer, DARK_GRAY, self.button_rect)
+        pygame.draw.rect(self.static_layer, BLACK, self.button_rect, 2)
         
         start_text = self.button_font.render("게임 시작", True, WHITE)
         start_rect = start_text.get_rect(center=self.button_rect.center)
-        self.screen.blit(start_text, start_rect)
+        self.static_layer.blit(start_text, start_rect)
         
         # 제작자 정보
         credit_text = self.credit_font.render("Made by hyeongeol", True, BLACK)
         credit_rect = credit_text.get_rect(bottomright=(self.screen_width - 20, self.screen_height - 20))
-        self.screen.blit(credit_text, credit_rect)
+        self.static_layer.blit(credit_text, credit_rect)
         
+        # 레이어 중 실제로 그려진 영역만 화면에 옮김
+        self.static_areas = [title_rect, self.button_rect, credit_rect]
+    
+    def draw_main_page(self):
+        # 배경 그리기
+        self.screen.fill(GRAY)
+        
+        # 배경 지뢰 애니메이션
+        perf.enter("logic")
+        self.mines.move()
+        perf.leave()
+        self.mines.draw(self.screen)
+        
+        # 제목, 시작 버튼, 제작자 정보 (미리 그려 둔 레이어)
+        self.screen.blits([(self.static_layer, area, area) for area in self.static_areas], doreturn=False)
+        perf.count_blits(len(self.static_areas))
+        
+        perf.enter("flip")
         pygame.display.update()
+        perf.leave()
+    
+    def draw(self):
+        self.draw_main_page()
+    
+    def frame_delay(self):
+        # 배경 지뢰가 계속 움직이므로 항상 애니메이션 중
+        return 0
+    
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.button_rect.collidepoint(event.pos):
+                # 게임 시작 (같은 장면 관리자에서 게임 장면으로 교체)
+                from minesweeper_game import Minesweeper
+                self.manager.replace(Minesweeper(manager=self.manager))
     
     def run(self):
-        running = True
-        clock = pygame.time.Clock()
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.button_rect.collidepoint(event.pos):
-                        # 게임 시작
-                        running = False
-            
-            self.draw_main_page()
-            clock.tick(60)
-        
-        # 메인 페이지 종료 후 게임 시작
-        from minesweeper_game import Minesweeper
-        game = Minesweeper()
+        self.manager.run()
+        pygame.quit()
+        sys.exit()
 
 if __name__ == "__main__":
     MainPage()
@@ -0,0 +1,159 @@
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from minesweeper_board import Board, REVEALED
+from minesweeper_solver import Solver
+
+# 첫 클릭 영역 크기 (REGION_SIZE x REGION_SIZE 칸 단위로 보드를 나눔)
+# 영역과 그 테두리 한 칸을 모두 안전 구역으로 두면, 영역 안의 어느 칸을 눌러도
+# 같은 칸들이 연쇄로 열리므로 영역당 한 번만 검증하면 됨
+# 대신 안전 구역이 일반 게임(3x3)보다 큰 5x5라서 시작이 조금 쉬움. 영역을 1칸으로 하면
+# 안전 구역은 3x3이 되지만 미리 만들 보드가 9배(고급에서 480개, 보드당 약 0.7초)로 늘어남
+REGION_SIZE = 3
+# 영역마다 미리 만들어 두는 보드 수 (고급에서 60개, 꺼낸 영역은 바로 다시 채움)
+QUEUE_SIZE = 1
+# 보드 하나를 만들 때 최대 시도 횟수
+MAX_ATTEMPTS = 1000
+# 추측 없는 보드를 만드는 최대 보드 크기 (칸 수, 더 크면 일반 무작위 보드 사용)
+MAX_CELLS = 4096
+# 준비된 보드가 없을 때 생성 중인 작업을 기다리는 최대 시간 (초, 넘으면 일반 무작위 보드 사용)
+TAKE_WAIT = 0.05
+
+
+def region_of(row, col):
+    return row // REGION_SIZE, col // REGION_SIZE
+
+
+def region_safe_cells(width, height, region):
+    # 영역과 그 주변 한 칸 (오름차순 인덱스)
+    top = region[0] * REGION_SIZE
+    left = region[1] * REGION_SIZE
+    return [i * width + j
+            for i in range(max(0, top - 1), min(height, top + REGION_SIZE + 1))
+            for j in range(max(0, left - 1), min(width, left + REGION_SIZE + 1))]
+
+
+def is_solvable(board, first_row, first_col, mines):
+    # 추측 없이 추론만으로 모든 안전한 칸을 열 수 있는지 확인
+    # 검증이 끝난 보드는 열림 상태가 남으므로 복사본으로 호출할 것
+    solver = Solver(board, mines)
+    solver.on_reveal(board.reveal(first_row, first_col))
+    while not board.is_won():
+        safe, _ = solver.deduce()
+        if not safe:
+            # 단순 추론으로 안 되면 정확한 확률이 0인 칸을 찾음
+            probabilities, _, _ = solver.probabilities()
+            safe = {cell for cell, p in probabilities.items() if p == 0}
+            if not safe:
+                return False
+        for index in safe:
+            if not board.cells[index] & REVEALED:
+                solver.on_reveal(board.reveal(*divmod(index, board.width)))
+    return True
+
+
+def generate_no_guess_board(width, height, mines, region, rng=None, max_attempts=MAX_ATTEMPTS):
+    # 주어진 첫 클릭 영역에서 추측 없이 풀 수 있는 지뢰 배치를 찾아 반환 (못 찾으면 None)
+    if rng is None:
+        rng = random.Random()
+    safe = region_safe_cells(width, height, region)
+    first_row = min(region[0] * REGION_SIZE, height - 1)
+    first_col = min(region[1] * REGION_SIZE, width - 1)
+    for _ in range(max_attempts):
+        board = Board(width, height)
+        positions = board.place_mines(first_row, first_col, mines, rng, safe=safe)
+        if is_solvable(board, first_row, first_col, mines):
+            return positions
+    return None
+
+
+def generate_task(task):
+    # 작업자 프로세스에서 실행되는 보드 생성 작업
+    width, height, mines, region, seed = task
+    return generate_no_guess_board(width, height, mines, region, random.Random(seed))
+
+
+class NoGuessPool:
+    # 추측이 필요 없는 보드를 백그라운드 프로세스에서 미리 만들어 두는 풀
+    # (가로, 세로, 지뢰 수, 첫 클릭 영역)마다 최대 queue_size개의 보드를 보관
+    def __init__(self, workers=None, queue_size=QUEUE_SIZE, seed=None):
+        self.queue_size = queue_size
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.rng = random.Random(seed)
+        self.lock = threading.RLock()  # 완료 콜백이 fill() 안에서 바로 실행될 수 있음
+        self.ready = {}
+        self.pending = {}  # 키 -> 생성 중인 작업 집합
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, width, height, mines, row, col):
+        return width, height, mines, region_of(row, col)
+
+    def regions(self, width, height):
+        return [(r, c)
+                for r in range((height + REGION_SIZE - 1) // REGION_SIZE)
+                for c in range((width + REGION_SIZE - 1) // REGION_SIZE)]
+
+    def prefetch(self, width, height, mines):
+        # 보드 크기의 모든 첫 클릭 영역에 대해 보드 생성을 예약
+        if width * height > MAX_CELLS:
+            return
+        for region in self.regions(width, height):
+            self.fill((width, height, mines, region))
+
+    def fill(self, key):
+        # 보관 중인 보드와 생성 중인 작업이 queue_size개가 되도록 작업 추가
+        with self.lock:
+            queue = self.ready.setdefault(key, deque())
+            pending = self.pending.setdefault(key, set())
+            missing = self.queue_size - len(queue) - len(pending)
+            for _ in range(missing):
+                future = self.executor.submit(generate_task, key[:3] + (key[3], self.rng.getrandbits(64)))
+                pending.add(future)
+                future.add_done_callback(lambda f, key=key: self.on_done(key, f))
+
+    def on_done(self, key, future):
+        with self.lock:
+            self.pending[key].discard(future)
+            if future.cancelled() or future.exception() is not None:
+                return
+            positions = future.result()
+            if positions is not None:
+                self.ready[key].append(positions)
+
+    def take(self, width, height, mines, row, col):
+        # 첫 클릭 위치에 맞는 준비된 보드의 지뢰 위치
+        # 없으면 생성 중인 작업을 TAKE_WAIT초까지만 기다림 (게임 루프에서 보드를 직접 만들지 않음)
+        # 지원하지 않는 크기이거나 제때 준비되지 않으면 None (일반 무작위 보드 사용)
+        if width * height > MAX_CELLS:
+            return None
+        key = self.key(width, height, mines, row, col)
+        positions = self.pop_ready(key)
+        if positions is None:
+            with self.lock:
+                pending = set(self.pending.get(key, ()))
+            if pending:
+                wait(pending, timeout=TAKE_WAIT, return_when=FIRST_COMPLETED)
+                positions = self.pop_ready(key)
+        if positions is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.fill(key)
+        return positions
+
+    def pop_ready(self, key):
+        with self.lock:
+            queue = self.ready.get(key)
+            return queue.popleft() if queue else None
+
+    def stats(self):
+        with self.lock:
+            ready = sum(len(queue) for queue in self.ready.values())
+        return {"hits": self.hits, "misses": self.misses, "ready": ready}
+
+    def shutdown(self):
+        # 대기 중인 작업은 취소하고 실행 중인 작업만 끝나길 기다림
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# 설정, 저장, 통계, 리플레이 파일을 모아 두는 사용자별 데이터 폴더 (MINESWEEPER_DATA_DIR로 변경)
+# 실행한 폴더와 관계없이 같은 파일을 쓰도록 운영체제별 기본 위치를 사용
+APP_NAME = "minesweeper"
+
+
+def data_dir():
+    path = os.environ.get("MINESWEEPER_DATA_DIR")
+    if path:
+        return path
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_NAME)
+
+
+def data_path(name):
+    # 데이터 폴더 안의 파일 경로 (폴더가 없으면 만듦)
+    path = data_dir()
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, name)
@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+# 프레임 구간 (overlay, idle은 오버레이 자체 비용과 이벤트 대기 시간)
+PHASES = ("events", "logic", "render", "flip", "overlay", "idle")
+# 오버레이에 표시하는 구간
+SHOWN_PHASES = ("events", "logic", "render", "flip")
+# 통계에 사용하는 최근 프레임 수
+HISTORY = 300
+# 오버레이가 켜져 있으면 화면 변화가 없어도 이 간격(ms)마다 다시 그림
+REFRESH_MS = 500
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+
+class PerfMonitor:
+    # 프레임별 구간 시간과 blit/표면 생성 횟수를 모으는 성능 측정기
+    # 꺼져 있으면 모든 기록 함수가 바로 반환하므로 비용이 거의 없음
+    # 구간은 중첩할 수 있고, 안쪽 구간의 시간은 바깥 구간에서 빠짐
+    # (예: events 안의 left_click은 logic으로만 집계)
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = os.environ.get("MINESWEEPER_PERF_TRACE")
+        # 추적 파일을 지정하면 모든 프레임을 보관했다가 종료할 때 저장
+        self.trace = [] if self.trace_path else None
+        self.history = deque(maxlen=HISTORY)
+        self.font = None
+        self.overlay_rect = None
+        self.frame = 0
+        self.stack = []
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.blit_count = 0
+        self.surface_count = 0
+        # 시작 시간 측정 (--profile-startup): (단계 이름, 시각) 목록, 측정 중이 아니면 None
+        self.startup = None
+        if os.environ.get("MINESWEEPER_PERF") == "1" or self.trace_path:
+            self.set_enabled(True)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.stack = []
+        self.history.clear()
+        self.started = time.perf_counter()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.mark = time.perf_counter()
+        self.stack = []
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.blit_count = 0
+        self.surface_count = 0
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        times = self.times
+        self.frame += 1
+        record = {
+            "frame": self.frame,
+            "time": self.frame_start - self.started,
+            "frame_ms": (now - self.frame_start - times["idle"]) * 1000,
+        }
+        for phase in PHASES:
+            record[f"{phase}_ms"] = times[phase] * 1000
+        record["blits"] = self.blit_count
+        record["surfaces"] = self.surface_count
+        self.history.append(record)
+        if self.trace is not None:
+            self.trace.append(record)
+
+    def enter(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.stack:
+            self.times[self.stack[-1]] += now - self.mark
+        self.stack.append(phase)
+        self.mark = now
+
+    def leave(self):
+        if not self.enabled or not self.stack:
+            return
+        now = time.perf_counter()
+        self.times[self.stack.pop()] += now - self.mark
+        self.mark = now
+
+    def count_blits(self, count=1):
+        if self.enabled:
+            self.blit_count += count
+
+    def count_surfaces(self, count=1):
+        if self.enabled:
+            self.surface_count += count
+
+    def refresh_delay(self, delay):
+        # 오버레이가 켜져 있으면 대기 시간을 REFRESH_MS 이하로 제한
+        if not self.enabled or delay == 0:
+            return delay
+        return REFRESH_MS if delay is None else min(delay, REFRESH_MS)
+
+    def stats(self):
+        # 최근 프레임 통계: fps, 프레임 시간 백분위수, 구간별 평균, 프레임당 평균 횟수
+        frames = list(self.history)
+        if not frames:
+            return None
+        span = frames[-1]["time"] - frames[0]["time"]
+        frame_times = sorted(f["frame_ms"] for f in frames)
+        n = len(frames)
+        return {
+            "fps": (n - 1) / span if span > 0 else 0.0,
+            "p50": frame_times[n // 2],
+            "p95": frame_times[min(n - 1, n * 95 // 100)],
+            "p99": frame_times[min(n - 1, n * 99 // 100)],
+            "phases": {phase: sum(f[f"{phase}_ms"] for f in frames) / n for phase in SHOWN_PHASES},
+            "blits": sum(f["blits"] for f in frames) / n,
+            "surfaces": sum(f["surfaces"] for f in frames) / n,
+        }
+
+    def draw_overlay(self, screen):
+        # 화면 왼쪽 위에 통계 표시 (반투명하지 않은 상자라 이전 내용을 지울 필요 없음)
+        if not self.enabled or screen is None:
+            return
+        self.enter("overlay")
+        stats = self.stats()
+        if self.font is None:
+            # 한글 글꼴을 쓰는 화면 글꼴 (이 모듈을 먼저 불러오는 모듈이라 여기서 불러옴)
+            from minesweeper_display import display
+            self.font = display.font(14)
+        if stats is None:
+            lines = ["perf: 측정 중..."]
+        else:
+            lines = [
+                f"fps {stats['fps']:.1f}  frame p50 {stats['p50']:.2f} p95 {stats['p95']:.2f} p99 {stats['p99']:.2f} ms",
+                "  ".join(f"{phase} {ms:.2f}" for phase, ms in stats["phases"].items()),
+                f"blits/frame {stats['blits']:.1f}  surfaces/frame {stats['surfaces']:.2f}",
+            ]
+        rendered = [self.font.render(line, True, WHITE) for line in lines]
+        width = max(text.get_width() for text in rendered) + 8
+        height = sum(text.get_height() for text in rendered) + 8
+        rect = pygame.Rect(0, 0, width, height)
+        # 이전 상자가 더 컸으면 그 영역까지 덮음
+        if self.overlay_rect:
+            rect.union_ip(self.overlay_rect)
+        screen.fill(BLACK, rect)
+        y = 4
+        for text in rendered:
+            screen.blit(text, (4, y))
+            y += text.get_height()
+        self.overlay_rect = rect
+        pygame.display.update(rect)
+        self.leave()
+
+    def export(self, path, frames=None):
+        # 프레임 기록을 CSV 또는 JSON(.json 확장자) 파일로 저장
+        if frames is None:
+            frames = self.trace if self.trace is not None else list(self.history)
+        if path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(frames, f, indent=1)
+            return
+        fields = ["frame", "time", "frame_ms"] + [f"{phase}_ms" for phase in PHASES] + ["blits", "surfaces"]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(frames)
+
+    def start_profile(self, start):
+        # start(time.perf_counter 값)부터 첫 프레임까지 단계별 시간 측정 시작
+        self.startup = [("시작", start)]
+
+    def startup_mark(self, name):
+        if self.startup is not None:
+            self.startup.append((name, time.perf_counter()))
+
+    def first_frame(self):
+        # 첫 프레임을 그린 뒤 호출, 시작 시간을 측정 중이었으면 결과를 출력하고 True
+        if self.startup is None:
+            return False
+        self.startup_mark("첫 프레임")
+        marks = self.startup
+        self.startup = None
+        start = marks[0][1]
+        for (_, previous), (name, at) in zip(marks, marks[1:]):
+            print(f"{name:<16} +{(at - previous) * 1000:8.1f} ms  {(at - start) * 1000:8.1f} ms")
+        print(f"첫 프레임까지 {(marks[-1][1] - start) * 1000:.1f} ms")
+        return True
+
+    def close(self):
+        if self.trace_path and self.trace:
+            self.export(self.trace_path)
+
+
+# 모든 모듈이 함께 쓰는 측정기
+perf = PerfMonitor()
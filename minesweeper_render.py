@@ -0,0 +1,500 @@
+import pygame
+import numpy as np
+
+from minesweeper_board import MINE, FLAG, REVEALED, NUMBER_MASK
+from minesweeper_perf import perf
+
+# 색상 정의
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GRAY = (192, 192, 192)
+DARK_GRAY = (128, 128, 128)
+BLUE = (0, 0, 255)
+GREEN = (0, 128, 0)
+RED = (255, 0, 0)
+PURPLE = (128, 0, 128)
+MAROON = (128, 0, 0)
+TURQUOISE = (64, 224, 208)
+ORANGE = (255, 165, 0)
+
+# 숫자에 따른 색상
+NUMBER_COLORS = [BLUE, GREEN, RED, PURPLE, MAROON, TURQUOISE, BLACK, DARK_GRAY]
+
+# 타일 번호 (1~8은 숫자 타일)
+TILE_OPEN = 0
+TILE_CLOSED = 9
+TILE_FLAG = 10
+TILE_MINE = 11
+TILE_EXPLODED = 12
+TILE_WRONG = 13
+# 지뢰 확률 표시: 닫힌 칸을 확률 단계별 색으로 칠한 타일 (TILE_HEAT + 단계)
+TILE_HEAT = 14
+HEAT_LEVELS = 11
+TILE_COUNT = TILE_HEAT + HEAT_LEVELS
+# 확률을 표시하지 않는 칸의 단계 값
+NO_HEAT = 255
+
+# 변경 영역이 이보다 많으면 하나의 영역으로 합쳐서 화면 갱신
+MAX_UPDATE_RECTS = 64
+# 바뀐 칸이 이보다 많으면 칸별로 그리지 않고 보드 영역 전체를 다시 그림
+MAX_DIRTY_CELLS = 4096
+
+# 확대 단계 (셀 한 칸의 픽셀 크기)
+ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 20, 24, 30, 40)
+# 셀이 이보다 작으면 타일 대신 칸당 1픽셀 미니맵을 확대해서 그림
+MINIMAP_ZOOM = 6
+# 보드 영역 크기 제한 (보드가 더 크면 카메라로 이동하며 봄)
+MIN_VIEW_WIDTH = 360
+MAX_VIEW_WIDTH = 900
+MAX_VIEW_HEIGHT = 720
+
+
+def heat_color(level):
+    # 확률 단계의 색 (0%: 초록 -> 50%: 노랑 -> 100%: 빨강, 닫힌 칸의 회색과 반씩 섞음)
+    p = level / (HEAT_LEVELS - 1)
+    if p < 0.5:
+        start, end, t = (0, 200, 0), (255, 220, 0), p * 2
+    else:
+        start, end, t = (255, 220, 0), (230, 0, 0), p * 2 - 1
+    return tuple((g + round(a + (b - a) * t)) // 2 for g, a, b in zip(GRAY, start, end))
+
+
+HEAT_COLORS = [heat_color(level) for level in range(HEAT_LEVELS)]
+
+# 미니맵의 타일별 색 (숫자는 흰색과 섞어 옅게)
+MINIMAP_COLORS = (
+    [WHITE]
+    + [tuple((c + 255) // 2 for c in color) for color in NUMBER_COLORS]
+    + [GRAY, RED, BLACK, MAROON, PURPLE]
+    + HEAT_COLORS
+)
+MINIMAP_PALETTE = np.array(MINIMAP_COLORS, dtype=np.uint8)
+
+
+def tile_of(state, game_over):
+    # 셀 상태 바이트에 해당하는 타일 번호
+    if state & REVEALED:
+        if state & MINE:
+            return TILE_EXPLODED if game_over else TILE_OPEN
+        return state & NUMBER_MASK
+    if state & FLAG:
+        return TILE_WRONG if game_over and not state & MINE else TILE_FLAG
+    if game_over and state & MINE:
+        return TILE_MINE
+    return TILE_CLOSED
+
+
+class TileAtlas:
+    # 셀 크기별로 한 번만 만들어 두는 타일 모음 (한 장의 표면에 가로로 나열)
+    def __init__(self, cell_size, font, images):
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((cell_size * TILE_COUNT, cell_size))
+        perf.count_surfaces()
+        self.areas = [pygame.Rect(i * cell_size, 0, cell_size, cell_size) for i in range(TILE_COUNT)]
+
+        self.draw_tile(TILE_OPEN, WHITE)
+        for number in range(1, 9):
+            text = font.render(str(number), True, NUMBER_COLORS[number-1])
+            perf.count_surfaces()
+            self.draw_tile(number, WHITE, text)
+        self.draw_tile(TILE_CLOSED, GRAY)
+        self.draw_tile(TILE_FLAG, GRAY, images['flag'])
+        self.draw_tile(TILE_MINE, GRAY, images['mine'])
+        self.draw_tile(TILE_EXPLODED, RED, images['explosion'])
+        # 잘못된 깃발은 깃발 위에 X 표시
+        self.draw_tile(TILE_WRONG, GRAY, images['flag'], images['wrong'])
+        for level, color in enumerate(HEAT_COLORS):
+            self.draw_tile(TILE_HEAT + level, color)
+
+    def draw_tile(self, tile, fill, *images):
+        cell_size = self.cell_size
+        area = self.areas[tile]
+        # 이미지가 옆 타일로 넘치지 않도록 타일 안으로 제한
+        self.surface.set_clip(area)
+        pygame.draw.rect(self.surface, DARK_GRAY, area, 1)
+        pygame.draw.rect(self.surface, fill, (area.x+1, area.y+1, cell_size-2, cell_size-2))
+        for image in images:
+            image_rect = image.get_rect()
+            image_rect.center = area.center
+            self.surface.blit(image, image_rect)
+            perf.count_blits()
+        self.surface.set_clip(None)
+
+
+class Camera:
+    # 보드의 어느 부분을 어떤 확대 단계로 보여 주는지 (보드 영역 좌표 <-> 칸 좌표 변환)
+    # x, y: 보드 영역 왼쪽 위에 오는 보드 픽셀 좌표 (보드가 영역보다 작으면 음수가 되어 가운데 정렬)
+    def __init__(self, width, height, view_width, view_height, zoom):
+        self.width = width
+        self.height = height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.zoom = zoom
+        self.x = 0
+        self.y = 0
+        self.clamp()
+
+    def clamp(self):
+        # 보드 밖이 보이지 않도록 위치 제한
+        board_width = self.width * self.zoom
+        board_height = self.height * self.zoom
+        if board_width <= self.view_width:
+            self.x = -((self.view_width - board_width) // 2)
+        else:
+            self.x = min(max(self.x, 0), board_width - self.view_width)
+        if board_height <= self.view_height:
+            self.y = -((self.view_height - board_height) // 2)
+        else:
+            self.y = min(max(self.y, 0), board_height - self.view_height)
+
+    def pan(self, dx, dy):
+        # 화면 이동, 실제로 움직였으면 True
+        old = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self.clamp()
+        return (self.x, self.y) != old
+
+    def set_zoom(self, zoom, anchor=None):
+        # 확대 단계 변경, anchor(보드 영역 좌표) 아래의 보드 위치는 그대로 유지
+        if zoom == self.zoom:
+            return False
+        if anchor is None:
+            anchor = (self.view_width // 2, self.view_height // 2)
+        ax, ay = anchor
+        self.x = (self.x + ax) * zoom // self.zoom - ax
+        self.y = (self.y + ay) * zoom // self.zoom - ay
+        self.zoom = zoom
+        self.clamp()
+        return True
+
+    def zoom_step(self, step, anchor=None):
+        # 확대 단계를 한 단계 올리거나 (step > 0) 내림
+        if step > 0:
+            larger = [zoom for zoom in ZOOM_LEVELS if zoom > self.zoom]
+            return bool(larger) and self.set_zoom(larger[0], anchor)
+        smaller = [zoom for zoom in ZOOM_LEVELS if zoom < self.zoom]
+        return bool(smaller) and self.set_zoom(smaller[-1], anchor)
+
+    def cell_at(self, x, y):
+        # 보드 영역 좌표의 (행, 열), 보드 밖이면 None
+        if not (0 <= x < self.view_width and 0 <= y < self.view_height):
+            return None
+        col = (x + self.x) // self.zoom
+        row = (y + self.y) // self.zoom
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return (row, col)
+        return None
+
+    def cell_rect(self, row, col):
+        # 칸의 보드 영역 좌표 사각형 (영역 밖일 수 있음)
+        zoom = self.zoom
+        return pygame.Rect(col * zoom - self.x, row * zoom - self.y, zoom, zoom)
+
+    def visible_range(self):
+        # 보드 영역에 일부라도 보이는 (첫 행, 끝 행, 첫 열, 끝 열), 끝은 포함하지 않음
+        zoom = self.zoom
+        first_col = max(0, self.x // zoom)
+        last_col = min(self.width, (self.x + self.view_width + zoom - 1) // zoom)
+        first_row = max(0, self.y // zoom)
+        last_row = min(self.height, (self.y + self.view_height + zoom - 1) // zoom)
+        return first_row, last_row, first_col, last_col
+
+
+class BoardRenderer:
+    # 보드 영역 크기의 표면에 카메라에 보이는 칸만 그리고, 바뀐 칸과 상단 정보 영역만 다시 그리는 렌더러
+    # 셀이 MINIMAP_ZOOM보다 작게 보이면 칸당 1픽셀 미니맵을 확대해서 그림 (미니맵은 바뀐 칸만 갱신)
+    def __init__(self, game):
+        self.game = game
+        self.hud = {}
+        self.atlases = {}
+        self.explosion_rect = None
+        self.modal_rect = None
+        self.hint_drawn = None
+        self.resize()
+
+    def resize(self):
+        # 보드 크기나 화면 크기가 바뀌면 보드 영역 표면과 미니맵을 새로 만들고 전체 다시 그리기
+        camera = self.game.camera
+        self.view_surface = pygame.Surface((camera.view_width, camera.view_height))
+        perf.count_surfaces()
+        self.scaled = None
+        self.minimap = None
+        self.minimap_mode = camera.zoom < MINIMAP_ZOOM
+        self.invalidate()
+
+    def invalidate(self):
+        # 다음 프레임에 화면 전체 다시 그리기
+        self.full_redraw = True
+        self.view_dirty = True
+        self.dirty_cells = []
+        self.minimap = None
+
+    def camera_changed(self):
+        # 화면 이동이나 확대 단계 변경: 보드 영역만 다시 그림
+        minimap_mode = self.game.camera.zoom < MINIMAP_ZOOM
+        if minimap_mode and not self.minimap_mode:
+            # 타일로 그리는 동안에는 미니맵을 갱신하지 않았으므로 새로 만듦
+            self.minimap = None
+        self.minimap_mode = minimap_mode
+        self.view_dirty = True
+
+    def atlas(self):
+        # 타일 모음은 확대 단계별로 처음 쓸 때 한 번만 만듦
+        zoom = self.game.camera.zoom
+        atlas = self.atlases.get(zoom)
+        if atlas is None:
+            game = self.game
+            atlas = self.atlases[zoom] = TileAtlas(zoom, game.font, game.images)
+        return atlas
+
+    def mark_cells(self, indices):
+        self.dirty_cells.extend(indices)
+
+    def mark_cell(self, row, col):
+        self.dirty_cells.append(row * self.game.width + col)
+
+    def mark_game_over(self):
+        # 게임 오버 시 지뢰와 깃발 칸의 모양이 바뀜
+        grid = self.game.board.grid()
+        self.mark_cells(np.flatnonzero(grid & (MINE | FLAG)).tolist())
+
+    def tile_of(self, state):
+        return tile_of(state, self.game.game_over)
+
+    def tile_grid(self, first_row=0, last_row=None, first_col=0, last_col=None):
+        # 주어진 범위 셀의 타일 번호를 한 번에 계산 (tile_of와 같은 규칙)
+        grid = self.game.board.grid()[first_row:last_row, first_col:last_col]
+        game_over = self.game.game_over
+        revealed = (grid & REVEALED) != 0
+        mine = (grid & MINE) != 0
+        flag = (grid & FLAG) != 0
+        tiles = np.select(
+            [revealed & mine, revealed, flag & game_over & ~mine, flag, mine & game_over],
+            [TILE_EXPLODED if game_over else TILE_OPEN, (grid & NUMBER_MASK).astype(np.int64), TILE_WRONG, TILE_FLAG, TILE_MINE],
+            TILE_CLOSED,
+        )
+        # 지뢰 확률 표시 중이면 닫힌 칸을 확률 단계 타일로
+        heat = self.game.heat
+        if heat is not None:
+            heat = heat[first_row:last_row, first_col:last_col]
+            tiles = np.where((tiles == TILE_CLOSED) & (heat != NO_HEAT), TILE_HEAT + heat.astype(np.int64), tiles)
+        return tiles
+
+    def build_minimap(self):
+        # 모든 칸을 칸당 1픽셀로 그린 미니맵
+        game = self.game
+        if self.minimap is None:
+            self.minimap = pygame.Surface((game.width, game.height))
+            perf.count_surfaces()
+        colors = MINIMAP_PALETTE[self.tile_grid()]
+        pygame.surfarray.blit_array(self.minimap, colors.transpose(1, 0, 2))
+
+    def draw_cell(self, row, col):
+        # 칸 하나를 다시 그리고 화면에서 바뀐 영역을 반환 (보이지 않으면 None)
+        game = self.game
+        index = row * game.width + col
+        tile = self.tile_of(game.board.cells[index])
+        if tile == TILE_CLOSED and game.heat is not None:
+            level = game.heat.item(index)
+            if level != NO_HEAT:
+                tile = TILE_HEAT + level
+        rect = game.camera.cell_rect(row, col)
+        visible = rect.colliderect(self.view_surface.get_rect())
+        if self.minimap_mode:
+            self.minimap.set_at((col, row), MINIMAP_COLORS[tile])
+            if visible:
+                self.view_surface.fill(MINIMAP_COLORS[tile], rect)
+        elif visible:
+            atlas = self.atlas()
+            self.view_surface.blit(atlas.surface, rect, atlas.areas[tile])
+            perf.count_blits()
+        if not visible:
+            return None
+        hint = game.hint
+        if hint and hint[1] == index:
+            self.draw_hint()
+        return rect.move(0, game.top_height)
+
+    def draw_hint(self):
+        # 힌트 칸 테두리 (안전: 초록, 지뢰: 빨강, 추측: 주황)
+        kind, index = self.game.hint[:2]
+        rect = self.game.camera.cell_rect(*divmod(index, self.game.width))
+        color = {'safe': GREEN, 'mine': RED, 'guess': ORANGE}[kind]
+        if self.minimap_mode:
+            # 작은 칸은 테두리를 칸 밖에 그림 (지울 때는 보드 영역 전체를 다시 그림)
+            pygame.draw.rect(self.view_surface, color, rect.inflate(6, 6), 2)
+        else:
+            pygame.draw.rect(self.view_surface, color, rect, 3)
+        self.hint_drawn = self.game.hint
+
+    def redraw_view(self):
+        # 보이는 칸만 다시 그림 (비용은 보드 크기가 아니라 보드 영역 크기에 비례)
+        game = self.game
+        camera = game.camera
+        view = self.view_surface
+        view.fill(GRAY)
+        self.view_dirty = False
+        self.hint_drawn = None
+        first_row, last_row, first_col, last_col = camera.visible_range()
+        if first_row < last_row and first_col < last_col:
+            zoom = camera.zoom
+            if self.minimap_mode:
+                # 미니맵의 보이는 부분을 미리 만든 표면에 확대한 뒤 한 번에 복사
+                if self.minimap is None:
+                    self.build_minimap()
+                area = pygame.Rect(first_col, first_row, last_col - first_col, last_row - first_row)
+                size = (area.width * zoom, area.height * zoom)
+                if self.scaled is None or self.scaled.get_size() != size:
+                    self.scaled = pygame.Surface(size)
+                    perf.count_surfaces()
+                pygame.transform.scale(self.minimap.subsurface(area), size, self.scaled)
+                view.blit(self.scaled, (first_col * zoom - camera.x, first_row * zoom - camera.y))
+                perf.count_blits()
+            else:
+                # 보이는 칸을 타일 모음에서 한 번의 blits 호출로 그림
+                atlas = self.atlas()
+                atlas_surface = atlas.surface
+                areas = atlas.areas
+                tiles = self.tile_grid(first_row, last_row, first_col, last_col).tolist()
+                left = first_col * zoom - camera.x
+                top = first_row * zoom - camera.y
+                view.blits(
+                    [(atlas_surface, (left + i * zoom, top + j * zoom), areas[tile])
+                     for j, row in enumerate(tiles) for i, tile in enumerate(row)],
+                    doreturn=False,
+                )
+                perf.count_blits((last_row - first_row) * (last_col - first_col))
+        if game.hint:
+            self.draw_hint()
+
+    def update_hud(self, relayout=False):
+        # 상단 정보 영역에서 값이 바뀐 항목만 다시 렌더링하고 바뀐 영역을 반환
+        # relayout이면 화면 크기가 바뀐 것이므로 위치만 다시 계산
+        game = self.game
+        items = {
+            'mines': (game.mines_left, lambda: game.font.render(f"지뢰: {game.mines_left}", True, WHITE),
+                      lambda rect: setattr(rect, 'topleft', (10, 20))),
+            'timer': (game.elapsed_time, lambda: game.font.render(f"시간: {game.elapsed_time}", True, WHITE),
+                      lambda rect: setattr(rect, 'midtop', (game.screen_width // 2, 20))),
+            'credit': (None, lambda: game.small_font.render("Made by hyeongeol", True, WHITE),
+                       lambda rect: setattr(rect, 'topright', (game.screen_width - 10, 10))),
+            'face': (game.face_button, lambda: game.images[game.face_button],
+                     lambda rect: setattr(rect, 'midtop', (game.screen_width // 2, 45))),
+        }
+
+        dirty = []
+        for name, (value, render, place) in items.items():
+            old = self.hud.get(name)
+            if old is not None and old[0] == value:
+                if relayout:
+                    place(old[2])
+                continue
+            surface = render()
+            if name != 'face':  # 얼굴은 미리 만든 이미지를 그대로 씀
+                perf.count_surfaces()
+            rect = surface.get_rect()
+            place(rect)
+            self.hud[name] = (value, surface, rect)
+            dirty.append(rect if old is None else rect.union(old[2]))
+        return dirty
+
+    def compose(self, rect):
+        # 화면의 주어진 영역을 상단 정보 영역과 보드 표면으로 다시 합성
+        game = self.game
+        screen = game.screen
+        screen.set_clip(rect)
+        screen.fill(GRAY)
+        pygame.draw.rect(screen, DARK_GRAY, (0, 0, game.screen_width, game.top_height))
+        for name in ('mines', 'timer', 'credit', 'face'):
+            _, surface, hud_rect = self.hud[name]
+            screen.blit(surface, hud_rect)
+            perf.count_blits()
+        screen.blit(self.view_surface, (0, game.top_height))
+        perf.count_blits()
+        screen.set_clip(None)
+
+    def render(self):
+        # 바뀐 부분만 다시 그리고, 화면 갱신이 필요한 영역 목록을 반환
+        game = self.game
+        screen = game.screen
+        screen_rect = screen.get_rect()
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.dirty_cells = []
+            self.update_hud(relayout=True)
+            self.redraw_view()
+            self.compose(screen_rect)
+            self.explosion_rect = game.explosion.get_rect().clip(screen_rect) if game.explosion else None
+            self.modal_rect = None
+            self.draw_overlays()
+            return [screen_rect]
+
+        dirty = []
+
+        # 바뀐 칸 다시 그리기 (너무 많거나 화면이 움직였으면 보드 영역 전체)
+        cells = set(self.dirty_cells)
+        self.dirty_cells = []
+        if len(cells) > MAX_DIRTY_CELLS:
+            if self.minimap_mode:
+                self.build_minimap()
+            self.view_dirty = True
+        elif self.minimap_mode and self.minimap is not None:
+            # 미니맵은 보이지 않는 칸도 갱신
+            for i in cells:
+                rect = self.draw_cell(*divmod(i, game.width))
+                if rect and not self.view_dirty:
+                    dirty.append(rect)
+        elif not self.minimap_mode and not self.view_dirty:
+            for i in cells:
+                rect = self.draw_cell(*divmod(i, game.width))
+                if rect:
+                    dirty.append(rect)
+        # 미니맵의 힌트 테두리는 칸 밖에 그리므로 지울 때 보드 영역 전체를 다시 그림
+        if self.minimap_mode and self.hint_drawn and self.hint_drawn != game.hint:
+            self.view_dirty = True
+        if self.view_dirty:
+            self.redraw_view()
+            dirty = [pygame.Rect(0, game.top_height, game.screen_width, game.screen_height - game.top_height)]
+
+        # 상단 정보 영역
+        dirty.extend(self.update_hud())
+
+        # 폭발 효과는 이전 위치를 지우고 새 위치에 그림
+        if self.explosion_rect:
+            dirty.append(self.explosion_rect)
+        self.explosion_rect = None
+        if game.explosion:
+            self.explosion_rect = game.explosion.get_rect().clip(screen_rect)
+            dirty.append(self.explosion_rect)
+
+        # 재시작 모달이 나타나거나 사라지거나 가려지면 다시 그림
+        modal_rect = game.get_restart_modal_rect() if game.show_restart_modal else None
+        if modal_rect != self.modal_rect:
+            if self.modal_rect:
+                dirty.append(self.modal_rect)
+            if modal_rect:
+                dirty.append(modal_rect)
+        elif modal_rect and modal_rect.collidelist(dirty) != -1:
+            dirty.append(modal_rect)
+        self.modal_rect = modal_rect
+
+        if not dirty:
+            return []
+
+        if len(dirty) > MAX_UPDATE_RECTS:
+            dirty = [dirty[0].unionall(dirty[1:])]
+
+        for rect in dirty:
+            self.compose(rect)
+        self.draw_overlays()
+        return dirty
+
+    def draw_overlays(self):
+        game = self.game
+        if game.explosion:
+            game.explosion.draw(game.screen)
+        if game.show_restart_modal:
+            game.draw_restart_modal()
+            self.modal_rect = game.get_restart_modal_rect()
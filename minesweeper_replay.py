@@ -0,0 +1,287 @@
+import os
+import random
+import time
+from collections import deque
+
+from minesweeper_engine import GameEngine
+from minesweeper_paths import data_path
+
+# 리플레이 파일 형식
+# 파일 머리말(MAGIC) 뒤에 게임 기록이 이어서 추가됨. 모든 값은 부호 없는 varint(LEB128)
+# 기록마다 첫 varint는 (값 << 3) | 종류
+#   GAME:  값 = 플래그(1: 추측 없는 모드), 뒤에 시드, 가로, 세로, 지뢰 수
+#   LEFT:  값 = 이전 기록 이후 경과 시간(ms), 뒤에 칸 인덱스
+#   RIGHT: LEFT와 같음
+#   MINES: 값 = 지뢰 수, 뒤에 정렬된 지뢰 위치의 차이값 (시드로 재현할 수 없는 보드)
+#   END:   값 = 결과 (LOST, WON, ABANDONED)
+MAGIC = b"MSRP\x01"
+
+GAME = 0
+LEFT = 1
+RIGHT = 2
+MINES = 3
+END = 4
+
+LOST = 0
+WON = 1
+ABANDONED = 2
+
+FLAG_NO_GUESS = 1
+
+# 읽기 단위 (파일 전체를 메모리에 올리지 않음)
+CHUNK_SIZE = 1 << 16
+
+# 기록을 모아 두었다가 파일에 쓰는 기준 (기록 수, 마지막으로 쓴 뒤 지난 초)
+# 게임이 끝날 때는 항상 씀. 프로그램이 비정상 종료되면 진행 중인 게임의 마지막 기록 일부를 잃을 수 있음
+FLUSH_RECORDS = 64
+FLUSH_SECONDS = 5.0
+
+# 기본 기록 파일 (데이터 폴더 안, MINESWEEPER_REPLAY_FILE로 변경, 빈 값이면 기록하지 않음)
+DEFAULT_REPLAY_FILE = "replays.msr"
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varints(f, chunk_size=CHUNK_SIZE):
+    # 파일에서 varint를 하나씩 읽음 (조각 경계에 걸친 값도 처리, 끝이 잘린 값은 버림)
+    value = shift = 0
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        for byte in chunk:
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+            else:
+                yield value
+                value = shift = 0
+
+
+class Replay:
+    # 게임 하나의 기록: 시드, 보드 설정, (경과 ms, 종류, 칸 인덱스) 클릭 목록, 결과
+    def __init__(self, seed, width, height, mines, no_guess=False):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.no_guess = no_guess
+        self.mine_positions = None
+        self.clicks = []
+        self.result = None  # 기록이 끝나기 전에 프로그램이 종료되면 None
+
+    def duration_ms(self):
+        return sum(delay for delay, _, _ in self.clicks)
+
+
+class ReplayWriter:
+    # 게임이 진행되는 동안 기록을 모아 두었다가 파일 끝에 추가
+    # (게임이 끝날 때, FLUSH_RECORDS개가 모이거나 FLUSH_SECONDS초가 지났을 때)
+    # 게임 시작 기록은 첫 클릭 때 써서 클릭하지 않은 게임은 남기지 않음
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+            self.file.flush()
+        self.recording = False
+        self.last_time = None
+        self.pending = bytearray()
+        self.pending_records = 0
+        self.last_flush = time.perf_counter()
+
+    def write(self, *values):
+        for value in values:
+            encode_varint(value, self.pending)
+        self.pending_records += 1
+        if (self.pending_records >= FLUSH_RECORDS
+                or time.perf_counter() - self.last_flush >= FLUSH_SECONDS):
+            self.flush()
+
+    def flush_due(self):
+        # 모아 둔 기록이 FLUSH_SECONDS초 넘게 쓰이지 않았으면 씀 (클릭 사이가 길 때를 위해 주기적으로 호출)
+        if self.pending and time.perf_counter() - self.last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.pending)
+            self.file.flush()
+            self.pending.clear()
+        self.pending_records = 0
+        self.last_flush = time.perf_counter()
+
+    def start_game(self, seed, width, height, mines, no_guess=False):
+        self.finish(ABANDONED)
+        self.write((FLAG_NO_GUESS if no_guess else 0) << 3 | GAME, seed, width, height, mines)
+        self.recording = True
+
+    def mines(self, positions):
+        # 시드로 재현할 수 없는 지뢰 배치 (첫 클릭 전에 기록)
+        out = [len(positions) << 3 | MINES]
+        previous = 0
+        for position in sorted(positions):
+            out.append(position - previous)
+            previous = position
+        self.write(*out)
+
+    def reset_clock(self):
+        # 새 게임 화면이 준비된 시점 (첫 클릭까지의 시간도 기록하기 위함)
+        self.last_time = time.perf_counter()
+
+    def click(self, kind, index):
+        now = time.perf_counter()
+        delay = int((now - self.last_time) * 1000) if self.last_time is not None else 0
+        self.last_time = now
+        self.write(delay << 3 | kind, index)
+
+    def finish(self, result):
+        if self.recording:
+            self.write(result << 3 | END)
+            self.recording = False
+            self.flush()
+
+    def close(self):
+        self.finish(ABANDONED)
+        self.flush()
+        self.file.close()
+
+
+def replay_path():
+    # 기본 기록 파일 경로 (기록이 꺼져 있으면 빈 문자열)
+    path = os.environ.get("MINESWEEPER_REPLAY_FILE")
+    return path if path is not None else data_path(DEFAULT_REPLAY_FILE)
+
+
+def open_writer(path=None):
+    # 기본 기록 파일의 작성기 (기록이 꺼져 있으면 None)
+    if path is None:
+        path = replay_path()
+    if not path:
+        return None
+    return ReplayWriter(path)
+
+
+def iter_replays(path):
+    # 파일의 게임 기록을 하나씩 읽어서 반환 (수백만 개의 기록도 파일 전체를 읽지 않고 처리)
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"리플레이 파일이 아닙니다: {path}")
+        values = read_varints(f)
+        replay = None
+        for record in values:
+            kind = record & 7
+            value = record >> 3
+            if kind == GAME:
+                if replay is not None:
+                    yield replay
+                header = [next(values, None) for _ in range(4)]
+                if None in header:
+                    return
+                replay = Replay(*header, no_guess=bool(value & FLAG_NO_GUESS))
+            elif replay is None:
+                raise ValueError(f"게임 시작 기록이 없습니다: {path}")
+            elif kind in (LEFT, RIGHT):
+                index = next(values, None)
+                if index is None:
+                    break
+                replay.clicks.append((value, kind, index))
+            elif kind == MINES:
+                positions = []
+                position = 0
+                for _ in range(value):
+                    delta = next(values, None)
+                    if delta is None:
+                        break
+                    position += delta
+                    positions.append(position)
+                if len(positions) < value:
+                    break
+                replay.mine_positions = positions
+            elif kind == END:
+                replay.result = value
+                yield replay
+                replay = None
+            else:
+                raise ValueError(f"알 수 없는 기록 종류 {kind}: {path}")
+        if replay is not None:
+            yield replay
+
+
+def make_engine(replay):
+    # 기록과 같은 보드가 만들어지는 엔진
+    engine = GameEngine(replay.width, replay.height, replay.mines, random.Random(replay.seed))
+    engine.preset_mines = replay.mine_positions
+    return engine
+
+
+def play_headless(replay):
+    # 창 없이 최대 속도로 클릭을 다시 실행한 엔진 반환
+    engine = make_engine(replay)
+    width = replay.width
+    for _, kind, index in replay.clicks:
+        row, col = divmod(index, width)
+        if kind == LEFT:
+            engine.left_click(row, col)
+        else:
+            engine.right_click(row, col)
+    return engine
+
+
+def outcome(engine):
+    if not engine.game_over:
+        return ABANDONED
+    return WON if engine.won else LOST
+
+
+def verify(replay):
+    # 다시 실행한 결과가 기록된 결과와 같은지 (결과가 없는 기록은 통과)
+    result = outcome(play_headless(replay))
+    return replay.result is None or result == replay.result
+
+
+def add_arguments(parser):
+    parser.add_argument("file", nargs="?", default=None, help="리플레이 파일 (기본: 게임이 기록하는 파일)")
+    parser.add_argument("--headless", action="store_true", help="창 없이 모든 기록을 다시 실행해서 결과 검증")
+    parser.add_argument("--game", type=int, default=-1, help="창에서 재생할 게임 번호 (기본: 마지막 게임)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 속도 배율")
+
+
+def main(args):
+    if args.file is None:
+        args.file = replay_path()
+    if args.headless:
+        start = time.perf_counter()
+        games = failures = 0
+        for number, replay in enumerate(iter_replays(args.file)):
+            games += 1
+            if not verify(replay):
+                failures += 1
+                print(f"불일치: 게임 {number} (시드 {replay.seed}, {replay.width}x{replay.height}/{replay.mines})")
+        seconds = time.perf_counter() - start
+        print(f"게임 {games}개 재생, 불일치 {failures}개, {seconds:.2f}초 ({games / seconds if seconds else 0:.0f}게임/초)")
+        return 1 if failures else 0
+
+    if args.game < 0:
+        # 뒤에서부터 센 번호: 마지막 몇 개만 보관하며 끝까지 읽음
+        last = deque(iter_replays(args.file), maxlen=-args.game)
+        replay = last[0] if len(last) == -args.game else None
+    else:
+        replay = next((r for n, r in enumerate(iter_replays(args.file)) if n == args.game), None)
+    if replay is None:
+        print(f"게임 {args.game}이 없습니다")
+        return 1
+
+    from minesweeper_game import Minesweeper, ReplayPlayer
+    from minesweeper_scene import SceneManager
+    manager = SceneManager()
+    game = Minesweeper(manager=manager, record=False, save=False, stats=False)
+    manager.push(game)
+    manager.push(ReplayPlayer(game, replay, args.speed))
+    game.main_loop()
+    return 0
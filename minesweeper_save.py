@@ -0,0 +1,289 @@
+import os
+import struct
+
+import numpy as np
+
+from minesweeper_board import Board, MINE, REVEALED, FLAG, NUMBER_MASK
+from minesweeper_paths import data_path
+
+# 저장 파일 형식
+# 머리말 뒤에 세 영역이 이어짐 (칸 인덱스 순서)
+#   숫자 격자: 칸당 4비트 (0~8: 주변 지뢰 수, 9: 지뢰), 한 바이트의 아래 4비트가 짝수 칸
+#   열림 평면: 칸당 1비트 (바이트 안에서 낮은 비트부터)
+#   깃발 평면: 열림 평면과 같음
+MAGIC = b"MSSV"
+VERSION = 1
+HEADER = struct.Struct("<4sHH III QQ IiI IIIII 32s")
+MINE_NIBBLE = 9
+
+FLAG_FIRST_CLICK = 1
+FLAG_GAME_OVER = 2
+FLAG_WON = 4
+FLAG_NO_GUESS = 8
+
+# 자동 저장 단위 (칸 수, 8의 배수여야 영역 경계가 바이트 경계와 맞음)
+REGION_CELLS = 8192
+# 바뀐 칸이 이보다 많으면 NumPy로 영역 번호 계산
+VECTOR_MARK_THRESHOLD = 1024
+
+# 부분 저장 기록 파일 (저장 파일 이름 뒤에 붙음)
+# 덮어쓸 구간들을 먼저 기록 파일에 다 쓰고 끝 표시를 붙인 뒤 저장 파일에 반영하고 지움
+# 반영 중에 종료되면 다음에 불러올 때 끝 표시가 있는 기록을 다시 반영하고, 끝 표시가 없으면 버림
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAGIC = b"MSJ1"
+JOURNAL_END = b"MSJE"
+JOURNAL_RECORD = struct.Struct("<II")  # (파일 내 위치, 길이) 뒤에 내용
+
+# 기본 저장 파일 (데이터 폴더 안, MINESWEEPER_SAVE_FILE로 변경, 빈 값이면 저장하지 않음)
+DEFAULT_SAVE_FILE = "savegame.mss"
+
+
+def layout(cells):
+    # (숫자 격자, 열림 평면, 깃발 평면)의 파일 내 시작 위치와 전체 크기
+    numbers = HEADER.size
+    revealed = numbers + (cells + 1) // 2
+    flags = revealed + (cells + 7) // 8
+    return numbers, revealed, flags, flags + (cells + 7) // 8
+
+
+def encode_cells(cells):
+    # 셀 상태 바이트 배열(NumPy) -> (숫자 격자, 열림 평면, 깃발 평면) 바이트
+    nibbles = np.where(cells & MINE, MINE_NIBBLE, cells & NUMBER_MASK).astype(np.uint8)
+    if len(nibbles) % 2:
+        nibbles = np.append(nibbles, np.uint8(0))
+    numbers = nibbles[0::2] | (nibbles[1::2] << 4)
+    revealed = np.packbits((cells & REVEALED) != 0, bitorder="little")
+    flags = np.packbits((cells & FLAG) != 0, bitorder="little")
+    return numbers.tobytes(), revealed.tobytes(), flags.tobytes()
+
+
+def decode_cells(buffer, count):
+    # 저장 파일 내용 -> 셀 상태 바이트 배열 (칸별 파이썬 반복 없이 한 번에 변환)
+    numbers_at, revealed_at, flags_at, _ = layout(count)
+    numbers = np.frombuffer(buffer, np.uint8, (count + 1) // 2, numbers_at)
+    nibbles = np.empty(len(numbers) * 2, dtype=np.uint8)
+    nibbles[0::2] = numbers & 0x0F
+    nibbles[1::2] = numbers >> 4
+    cells = nibbles[:count]
+    cells = np.where(cells == MINE_NIBBLE, np.uint8(MINE), cells)
+    revealed = np.frombuffer(buffer, np.uint8, (count + 7) // 8, revealed_at)
+    flags = np.frombuffer(buffer, np.uint8, (count + 7) // 8, flags_at)
+    cells |= np.unpackbits(revealed, count=count, bitorder="little") << 5
+    cells |= np.unpackbits(flags, count=count, bitorder="little") << 6
+    return bytearray(cells)
+
+
+def pack_header(state, board):
+    flags = ((FLAG_FIRST_CLICK if state["first_click"] else 0)
+             | (FLAG_GAME_OVER if state["game_over"] else 0)
+             | (FLAG_WON if state["won"] else 0)
+             | (FLAG_NO_GUESS if state["no_guess"] else 0))
+    return HEADER.pack(
+        MAGIC, VERSION, flags,
+        board.width, board.height, state["mines"],
+        state["seed"], state["elapsed_ms"],
+        state["clicks"], state["mines_left"], state["cell_size"],
+        board.mine_count, board.revealed_safe, board.revealed_mines, board.flag_count, board.wrong_flags,
+        state["difficulty"].encode("utf-8")[:32],
+    )
+
+
+def unpack_header(buffer):
+    (magic, version, flags, width, height, mines, seed, elapsed_ms, clicks, mines_left, cell_size,
+     mine_count, revealed_safe, revealed_mines, flag_count, wrong_flags, difficulty) = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("저장 파일 형식이 아닙니다")
+    state = {
+        "difficulty": difficulty.rstrip(b"\0").decode("utf-8", "replace"),
+        "width": width,
+        "height": height,
+        "mines": mines,
+        "cell_size": cell_size,
+        "first_click": bool(flags & FLAG_FIRST_CLICK),
+        "game_over": bool(flags & FLAG_GAME_OVER),
+        "won": bool(flags & FLAG_WON),
+        "no_guess": bool(flags & FLAG_NO_GUESS),
+        "seed": seed,
+        "elapsed_ms": elapsed_ms,
+        "clicks": clicks,
+        "mines_left": mines_left,
+    }
+    counters = {
+        "mine_count": mine_count,
+        "revealed_safe": revealed_safe,
+        "revealed_mines": revealed_mines,
+        "flag_count": flag_count,
+        "wrong_flags": wrong_flags,
+    }
+    return state, counters
+
+
+def save_snapshot(path, state, board):
+    # 전체 저장 (임시 파일에 쓴 뒤 교체해서 저장 중 종료되어도 이전 파일이 남음)
+    numbers, revealed, flags = encode_cells(board.grid().ravel())
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(pack_header(state, board))
+        f.write(numbers)
+        f.write(revealed)
+        f.write(flags)
+    # 남아 있는 부분 저장 기록은 이전 파일 기준이므로 교체 전에 지움
+    journal = path + JOURNAL_SUFFIX
+    if os.path.exists(journal):
+        os.remove(journal)
+    os.replace(temp, path)
+
+
+def write_journal(path, writes):
+    # (위치, 내용) 목록을 기록 파일에 쓰고 끝 표시를 붙임 (임시 파일에 쓴 뒤 교체)
+    journal = path + JOURNAL_SUFFIX
+    temp = journal + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(JOURNAL_MAGIC)
+        for offset, data in writes:
+            f.write(JOURNAL_RECORD.pack(offset, len(data)))
+            f.write(data)
+        f.write(JOURNAL_END)
+    os.replace(temp, journal)
+
+
+def read_journal(journal):
+    # 기록 파일 -> (위치, 내용) 목록 (끝 표시가 없거나 깨졌으면 None)
+    with open(journal, "rb") as f:
+        data = f.read()
+    if not data.startswith(JOURNAL_MAGIC) or not data.endswith(JOURNAL_END):
+        return None
+    writes = []
+    at = len(JOURNAL_MAGIC)
+    end = len(data) - len(JOURNAL_END)
+    while at < end:
+        if at + JOURNAL_RECORD.size > end:
+            return None
+        offset, length = JOURNAL_RECORD.unpack_from(data, at)
+        at += JOURNAL_RECORD.size
+        if at + length > end:
+            return None
+        writes.append((offset, data[at:at + length]))
+        at += length
+    return writes
+
+
+def apply_writes(path, writes):
+    with open(path, "r+b") as f:
+        for offset, data in writes:
+            f.seek(offset)
+            f.write(data)
+
+
+def recover_journal(path):
+    # 반영이 끝나지 않은 부분 저장이 있으면 저장 파일에 마저 반영 (끝 표시가 없으면 버림)
+    journal = path + JOURNAL_SUFFIX
+    if not os.path.exists(journal):
+        return False
+    writes = read_journal(journal)
+    if writes is not None and os.path.exists(path):
+        apply_writes(path, writes)
+    os.remove(journal)
+    return writes is not None
+
+
+def load_snapshot(path):
+    # 저장 파일을 읽어서 (상태, 보드) 반환
+    # 보드 전체를 바로 셀 상태 배열로 변환함 (1000x1000 보드에서 수 밀리초)
+    # 카운터는 머리말에 있으므로 보드를 다시 스캔하지 않음
+    recover_journal(path)
+    with open(path, "rb") as f:
+        buffer = f.read()
+    state, counters = unpack_header(buffer)
+    count = state["width"] * state["height"]
+    if len(buffer) != layout(count)[3]:
+        raise ValueError("저장 파일 크기가 맞지 않습니다")
+    cells = decode_cells(buffer, count)
+    board = Board(state["width"], state["height"])
+    board.cells = cells
+    for name, value in counters.items():
+        setattr(board, name, value)
+    return state, board
+
+
+class AutoSaver:
+    # 마지막 저장 이후 바뀐 영역만 저장 파일에 덮어쓰는 자동 저장
+    # 보드가 통째로 바뀌면(새 게임, 지뢰 배치) 다음 저장은 전체 저장
+    def __init__(self, path):
+        self.path = path
+        self.dirty = set()
+        self.full = True
+        self.changed = False
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def mark(self, indices):
+        # 바뀐 칸 인덱스 목록으로 바뀐 영역 표시
+        if len(indices) > VECTOR_MARK_THRESHOLD:
+            self.dirty.update((np.unique(np.asarray(indices) // REGION_CELLS)).tolist())
+        else:
+            self.dirty.update(i // REGION_CELLS for i in indices)
+        self.changed = True
+
+    def mark_all(self):
+        self.full = True
+        self.changed = True
+
+    def mark_state(self):
+        # 보드는 그대로이고 머리말(타이머 등)만 바뀜
+        self.changed = True
+
+    def save(self, state, board):
+        if self.full or not self.exists():
+            save_snapshot(self.path, state, board)
+        else:
+            grid = board.grid().ravel()
+            numbers_at, revealed_at, flags_at, size = layout(len(grid))
+            if os.path.getsize(self.path) != size:
+                save_snapshot(self.path, state, board)
+            else:
+                writes = []
+                for region in sorted(self.dirty):
+                    start = region * REGION_CELLS
+                    numbers, revealed, flags = encode_cells(grid[start:start + REGION_CELLS])
+                    writes.append((numbers_at + start // 2, numbers))
+                    writes.append((revealed_at + start // 8, revealed))
+                    writes.append((flags_at + start // 8, flags))
+                # 머리말은 영역을 모두 쓴 뒤에 갱신
+                writes.append((0, pack_header(state, board)))
+                # 기록 파일에 먼저 다 쓴 뒤 반영해서, 반영 중에 종료되어도 저장 파일이 반쯤 바뀐 채로 남지 않음
+                write_journal(self.path, writes)
+                apply_writes(self.path, writes)
+                os.remove(self.path + JOURNAL_SUFFIX)
+        self.dirty.clear()
+        self.full = False
+        self.changed = False
+
+    def load(self):
+        state, board = load_snapshot(self.path)
+        # 불러온 파일과 보드가 같으므로 이후에는 바뀐 영역만 저장
+        self.dirty.clear()
+        self.full = False
+        self.changed = False
+        return state, board
+
+    def delete(self):
+        if self.exists():
+            os.remove(self.path)
+        if os.path.exists(self.path + JOURNAL_SUFFIX):
+            os.remove(self.path + JOURNAL_SUFFIX)
+        self.dirty.clear()
+        self.full = True
+        self.changed = False
+
+
+def open_saver(path=None):
+    # 기본 저장 파일의 자동 저장기 (저장이 꺼져 있으면 None)
+    if path is None:
+        path = os.environ.get("MINESWEEPER_SAVE_FILE")
+        if path is None:
+            path = data_path(DEFAULT_SAVE_FILE)
+    if not path:
+        return None
+    return AutoSaver(path)
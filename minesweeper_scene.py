@@ -0,0 +1,122 @@
+import pygame
+
+from minesweeper_perf import perf
+
+
+class Scene:
+    # 장면 기본 클래스 (메인 페이지, 게임, 메뉴 등)
+    fps = 30
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self):
+        pass
+
+    def on_quit(self):
+        # 프로그램 종료 직전 정리 작업 (백그라운드 작업자 종료 등)
+        pass
+
+    def redraw(self):
+        # 다음 프레임에 화면 전체를 다시 그리도록 요청 (성능 오버레이를 끈 뒤 등)
+        pass
+
+    def frame_delay(self):
+        # 다음 프레임까지 기다릴 시간
+        # 0: 애니메이션 중이므로 fps에 맞춰 계속 그림
+        # 양수: 해당 밀리초 동안 이벤트를 기다린 뒤 다시 그림 (예: 타이머)
+        # None: 이벤트가 올 때까지 기다림 (화면 변화 없음)
+        return None
+
+
+class SceneManager:
+    # 모든 장면이 함께 쓰는 하나의 메인 루프
+    # 맨 위 장면만 이벤트를 받고 그려지며, 모달은 장면 위에 쌓아서 처리
+    def __init__(self):
+        self.stack = []
+        self.clock = pygame.time.Clock()
+        self.running = False
+
+    def push(self, scene):
+        scene.manager = self
+        self.stack.append(scene)
+
+    def pop(self):
+        return self.stack.pop()
+
+    def replace(self, scene):
+        if self.stack:
+            self.stack.pop()
+        self.push(scene)
+
+    def quit(self):
+        self.running = False
+
+    def wait_events(self, scene):
+        delay = perf.refresh_delay(scene.frame_delay())
+        if delay == 0:
+            # 애니메이션 중: 일정한 속도로 프레임 진행
+            perf.enter("idle")
+            self.clock.tick(scene.fps)
+            perf.leave()
+            return pygame.event.get()
+
+        # 애니메이션이 없으면 이벤트가 올 때까지 (또는 delay 동안) 잠듦
+        perf.enter("idle")
+        event = pygame.event.wait() if delay is None else pygame.event.wait(delay)
+        perf.leave()
+        events = pygame.event.get()
+        if event.type != pygame.NOEVENT:
+            events.insert(0, event)
+        # 잠들었던 시간이 다음 프레임 간격 계산에 섞이지 않도록 시계 초기화
+        self.clock.tick()
+        return events
+
+    def run(self):
+        self.running = True
+        while self.running and self.stack:
+            scene = self.stack[-1]
+            perf.begin_frame()
+            perf.enter("logic")
+            scene.update()
+            perf.leave()
+            perf.enter("render")
+            scene.draw()
+            perf.leave()
+            perf.draw_overlay(pygame.display.get_surface())
+            if perf.first_frame():
+                # --profile-startup: 첫 프레임까지의 시간만 출력하고 종료
+                break
+
+            toggle_perf = False
+            events = self.wait_events(scene)
+            perf.enter("events")
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    break
+                if event.type == pygame.WINDOWEXPOSED:
+                    # 창이 다시 보이면 유지 중인 화면을 그대로 다시 표시
+                    pygame.display.update()
+                    continue
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    # 성능 오버레이 전환 (프레임 기록이 끝난 뒤 적용)
+                    toggle_perf = True
+                    continue
+                if not self.stack:
+                    break
+                self.stack[-1].handle_event(event)
+            perf.leave()
+            perf.end_frame()
+
+            if toggle_perf:
+                perf.set_enabled(not perf.enabled)
+                if self.stack:
+                    self.stack[-1].redraw()
+
+        for scene in reversed(self.stack):
+            scene.on_quit()
+        perf.close()
@@ -0,0 +1,317 @@
+import asyncio
+import json
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from minesweeper_board import MINE, REVEALED, FLAG, NUMBER_MASK, max_mines
+from minesweeper_engine import GameEngine
+from minesweeper_replay import encode_varint
+
+# 통신 형식 (TCP, 모든 정수는 리틀 엔디언)
+# 메시지마다 u32 본문 길이 뒤에 본문이 이어짐
+# 요청 본문: u8 종류, u32 요청 번호, 종류별 내용
+#   NEW:         u16 가로, u16 세로, u32 지뢰 수, u64 시드 (0이면 서버가 정함)
+#   LEFT, RIGHT: u32 세션 번호, u32 칸 인덱스
+#   CLOSE:       u32 세션 번호
+#   STATS:       없음
+# 응답 본문: u8 종류, u32 요청 번호, u8 상태 (OK, ERROR), 종류별 내용
+#   NEW:         u32 세션 번호
+#   LEFT, RIGHT: u8 게임 상태 (STATE_*), i32 남은 지뢰 수, u32 바뀐 칸 수, 바뀐 칸
+#                바뀐 칸은 인덱스 순서로 varint((이전 칸과의 인덱스 차이) << 4 | 값)
+#   STATS:       UTF-8 JSON
+#   ERROR 상태:  UTF-8 오류 메시지
+# 요청 번호는 응답에 그대로 돌아오므로 클라이언트는 응답을 기다리지 않고 여러 요청을 이어서 보낼 수 있음
+# (한 연결의 요청은 보낸 순서대로 처리됨)
+NEW = 1
+LEFT = 2
+RIGHT = 3
+CLOSE = 4
+STATS = 5
+REQUEST_NAMES = {NEW: "new", LEFT: "left", RIGHT: "right", CLOSE: "close", STATS: "stats"}
+
+OK = 0
+ERROR = 1
+
+STATE_GAME_OVER = 1
+STATE_WON = 2
+
+# 바뀐 칸의 값 (0~8은 열린 숫자 칸)
+CELL_MINE = 9  # 열린 지뢰 (패배)
+CELL_FLAG = 10
+CELL_CLOSED = 11  # 깃발을 뺀 닫힌 칸
+CELL_HIDDEN_MINE = 12  # 게임 오버로 드러난 지뢰
+
+LENGTH = struct.Struct("<I")
+REQUEST = struct.Struct("<BI")
+RESPONSE = struct.Struct("<BIB")
+NEW_GAME = struct.Struct("<HHIQ")
+CLICK = struct.Struct("<II")
+SESSION = struct.Struct("<I")
+CLICK_RESULT = struct.Struct("<BiI")
+
+# 요청 본문의 최대 길이 (가장 긴 요청은 NEW, 더 길다고 알리면 연결을 끊음)
+MAX_FRAME = REQUEST.size + NEW_GAME.size
+
+# 세션 수와 보드 크기 제한 (보드는 셀당 1바이트)
+MAX_SESSIONS = 100_000
+MAX_SESSION_CELLS = 1_000_000
+# 요청 처리 시간 통계에 쓰는 최근 요청 수 (요청 종류별)
+LATENCY_HISTORY = 10_000
+# 한 번에 읽는 최대 바이트 수
+READ_SIZE = 1 << 16
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def cell_value(state):
+    # 셀 상태 바이트 -> 클라이언트에 보내는 값
+    if state & REVEALED:
+        return CELL_MINE if state & MINE else state & NUMBER_MASK
+    return CELL_FLAG if state & FLAG else CELL_CLOSED
+
+
+def encode_cells(indices, values, out):
+    # 바뀐 칸을 인덱스 순서로 정렬해서 차이값과 값을 varint 하나로 기록
+    previous = 0
+    for index, value in sorted(zip(indices, values)):
+        encode_varint((index - previous) << 4 | value, out)
+        previous = index
+
+
+def decode_cells(data, offset, count):
+    # (인덱스, 값) 목록으로 되돌림
+    cells = []
+    index = 0
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        index += value >> 4
+        cells.append((index, value & 0x0F))
+    return cells
+
+
+def percentiles(samples):
+    # 마이크로초 단위 p50/p95/p99 (표본이 없으면 None)
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {f"p{p}": ordered[min(last, last * p // 100)] * 1e6 for p in (50, 95, 99)}
+
+
+class Session:
+    # 서버에 보관하는 게임 하나
+    __slots__ = ("engine", "owner", "created", "requests")
+
+    def __init__(self, engine, owner):
+        self.engine = engine
+        self.owner = owner
+        self.created = time.time()
+        self.requests = 0
+
+    def memory_bytes(self):
+        # 보드, 엔진, 난수 생성기 상태를 합친 대략적인 메모리 사용량
+        engine = self.engine
+        return (engine.board.memory_bytes() + sys.getsizeof(engine.board) + sys.getsizeof(engine)
+                + sys.getsizeof(engine.__dict__) + sys.getsizeof(engine.rng) + sys.getsizeof(self))
+
+
+class GameServer:
+    # 여러 게임 세션을 한 프로세스의 메모리에 보관하고 요청을 처리하는 서버
+    # 게임 규칙은 창 게임과 같은 GameEngine을 사용하고, 클릭 응답에는 바뀐 칸만 담음
+    def __init__(self, max_sessions=MAX_SESSIONS, seed=None):
+        self.max_sessions = max_sessions
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.next_session = 1
+        self.connections = 0
+        self.requests = 0
+        self.started = time.perf_counter()
+        self.latencies = {kind: deque(maxlen=LATENCY_HISTORY) for kind in REQUEST_NAMES}
+
+    def new_session(self, body, owner):
+        width, height, mines, seed = NEW_GAME.unpack_from(body, REQUEST.size)
+        if width < 1 or height < 1 or width * height > MAX_SESSION_CELLS:
+            raise ValueError("보드 크기가 허용 범위를 벗어났습니다")
+        if mines > max_mines(width, height):
+            raise ValueError("지뢰 수가 보드 크기에 맞지 않습니다")
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("세션 수 제한에 도달했습니다")
+        if seed == 0:
+            seed = self.rng.getrandbits(63)
+        session_id = self.next_session
+        self.next_session += 1
+        self.sessions[session_id] = Session(GameEngine(width, height, mines, random.Random(seed)), owner)
+        return SESSION.pack(session_id)
+
+    def session(self, session_id, owner):
+        session = self.sessions.get(session_id)
+        if session is None or session.owner is not owner:
+            raise ValueError(f"세션이 없습니다: {session_id}")
+        session.requests += 1
+        return session
+
+    def click(self, kind, body, owner):
+        session_id, index = CLICK.unpack_from(body, REQUEST.size)
+        engine = self.session(session_id, owner).engine
+        if index >= engine.width * engine.height:
+            raise ValueError(f"칸 인덱스가 보드 밖입니다: {index}")
+        row, col = divmod(index, engine.width)
+        cells = engine.board.cells
+        if kind == LEFT:
+            changed = engine.left_click(row, col)
+            if not engine.first_click:
+                # 지뢰 배치가 끝나면 난수 생성기(약 2.5KB)는 다시 쓰지 않으므로 세션 메모리에서 뺌
+                engine.rng = None
+            values = [cell_value(cells[i]) for i in changed]
+            if engine.game_over and not engine.won:
+                # 패배하면 남은 지뢰 위치를 함께 보냄
+                grid = engine.board.grid().ravel()
+                hidden = np.flatnonzero((grid & (MINE | REVEALED)) == MINE).tolist()
+                changed = changed + hidden
+                values = values + [CELL_HIDDEN_MINE] * len(hidden)
+        else:
+            changed = [index] if engine.right_click(row, col) else []
+            values = [cell_value(cells[index])] if changed else []
+        state = (STATE_GAME_OVER if engine.game_over else 0) | (STATE_WON if engine.won else 0)
+        out = bytearray(CLICK_RESULT.pack(state, engine.mines_left, len(changed)))
+        encode_cells(changed, values, out)
+        return out
+
+    def close_session(self, body, owner):
+        session_id, = SESSION.unpack_from(body, REQUEST.size)
+        self.session(session_id, owner)
+        del self.sessions[session_id]
+        return b""
+
+    def stats(self):
+        # 세션 수, 세션별 메모리 사용량, 요청 종류별 처리 시간 백분위수
+        memory = [session.memory_bytes() for session in self.sessions.values()]
+        elapsed = time.perf_counter() - self.started
+        return {
+            "sessions": len(self.sessions),
+            "connections": self.connections,
+            "requests": self.requests,
+            "requests_per_second": self.requests / elapsed if elapsed > 0 else 0.0,
+            "memory_bytes": sum(memory),
+            "session_memory_mean": sum(memory) / len(memory) if memory else 0,
+            "session_memory_max": max(memory, default=0),
+            "latency_us": {REQUEST_NAMES[kind]: percentiles(samples)
+                           for kind, samples in self.latencies.items() if samples},
+        }
+
+    def handle(self, body, owner):
+        # 요청 본문 하나를 처리해서 응답 본문 반환 (잘못된 요청은 ERROR 상태로 응답)
+        start = time.perf_counter()
+        kind, request_id = REQUEST.unpack_from(body)
+        try:
+            if kind == NEW:
+                payload = self.new_session(body, owner)
+            elif kind in (LEFT, RIGHT):
+                payload = self.click(kind, body, owner)
+            elif kind == CLOSE:
+                payload = self.close_session(body, owner)
+            elif kind == STATS:
+                payload = json.dumps(self.stats(), ensure_ascii=False).encode("utf-8")
+            else:
+                raise ValueError(f"알 수 없는 요청 종류: {kind}")
+            status = OK
+        except (ValueError, struct.error) as error:
+            payload = str(error).encode("utf-8")
+            status = ERROR
+        self.requests += 1
+        if kind in self.latencies:
+            self.latencies[kind].append(time.perf_counter() - start)
+        return RESPONSE.pack(kind, request_id, status) + payload
+
+    async def serve_client(self, reader, writer):
+        # 연결 하나: 받은 데이터에 들어 있는 요청을 모두 처리한 뒤 응답을 한 번에 보냄
+        # 연결이 끊기면 그 연결에서 만든 세션도 정리
+        owner = object()
+        self.connections += 1
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                buffer += data
+                out = bytearray()
+                offset = 0
+                while len(buffer) - offset >= LENGTH.size:
+                    length, = LENGTH.unpack_from(buffer, offset)
+                    # 본문을 받기 전에 길이부터 확인 (잘못된 길이로 버퍼가 끝없이 커지지 않도록)
+                    if length < REQUEST.size:
+                        raise ValueError("요청이 너무 짧습니다")
+                    if length > MAX_FRAME:
+                        raise ValueError("요청이 너무 깁니다")
+                    end = offset + LENGTH.size + length
+                    if len(buffer) < end:
+                        break
+                    response = self.handle(bytes(buffer[offset + LENGTH.size:end]), owner)
+                    out += LENGTH.pack(len(response))
+                    out += response
+                    offset = end
+                del buffer[:offset]
+                if out:
+                    writer.write(out)
+                    await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            for session_id in [i for i, session in self.sessions.items() if session.owner is owner]:
+                del self.sessions[session_id]
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # 서버 시작 (port가 0이면 빈 포트를 골라 server.sockets에서 확인)
+        return await asyncio.start_server(self.serve_client, host, port)
+
+
+def print_stats(stats):
+    print(f"세션 {stats['sessions']}개, 연결 {stats['connections']}개, 요청 {stats['requests']}개 "
+          f"({stats['requests_per_second']:.0f}/초), 메모리 {stats['memory_bytes'] / 1024:.0f}KB "
+          f"(세션 평균 {stats['session_memory_mean']:.0f}B, 최대 {stats['session_memory_max']}B)")
+    for name, values in stats["latency_us"].items():
+        print(f"  {name:<6} p50 {values['p50']:.1f}us  p95 {values['p95']:.1f}us  p99 {values['p99']:.1f}us")
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="통계 출력 간격 (초, 0이면 출력하지 않음)")
+
+
+async def serve(args):
+    server = GameServer(args.max_sessions)
+    listener = await server.start(args.host, args.port)
+    address = listener.sockets[0].getsockname()
+    print(f"{address[0]}:{address[1]}에서 대기 중")
+    async with listener:
+        if args.stats_interval <= 0:
+            await listener.serve_forever()
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print_stats(server.stats())
+
+
+def main(args):
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
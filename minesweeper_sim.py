@@ -0,0 +1,222 @@
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from minesweeper_board import MINE, REVEALED, FLAG, NUMBER_MASK
+from minesweeper_engine import GameEngine, DIFFICULTY_LEVELS
+
+LEFT = 1
+RIGHT = 3
+
+
+def neighbours(index, width, height):
+    # 주변 칸 인덱스 (자기 자신 제외)
+    row, col = divmod(index, width)
+    result = []
+    for i in range(max(0, row-1), min(height, row+2)):
+        for j in range(max(0, col-1), min(width, col+2)):
+            if i != row or j != col:
+                result.append(i * width + j)
+    return result
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(width, height):
+    # 보드 크기별로 한 번만 만드는 주변 칸 목록
+    return [neighbours(i, width, height) for i in range(width * height)]
+
+
+def random_unknown_cell(engine, rng):
+    # 아직 열리지 않았고 깃발도 없는 칸 중 하나를 무작위로 선택
+    cells = engine.board.cells
+    size = len(cells)
+    for _ in range(64):
+        i = rng.randrange(size)
+        if not cells[i] & (REVEALED | FLAG):
+            return i
+    unknown = [i for i in range(size) if not cells[i] & (REVEALED | FLAG)]
+    return rng.choice(unknown)
+
+
+class RandomPolicy:
+    # 닫힌 칸을 무작위로 여는 플레이어
+    def __init__(self, rng):
+        self.rng = rng
+
+    def start(self, engine):
+        pass
+
+    def choose(self, engine):
+        row, col = divmod(random_unknown_cell(engine, self.rng), engine.width)
+        return LEFT, row, col
+
+    def observe(self, engine, button, row, col, changed):
+        pass
+
+
+class DeductionPolicy:
+    # 열린 숫자만 보고 확실한 칸을 여는/깃발을 꽂는 결정적 플레이어
+    # 확실한 칸이 없을 때만 무작위로 추측
+    def __init__(self, rng):
+        self.rng = rng
+
+    def start(self, engine):
+        self.adjacent = neighbour_table(engine.width, engine.height)
+        self.pending = []  # 다시 살펴볼 열린 숫자 칸
+        self.queued = set()
+        self.moves = deque()
+
+    def choose(self, engine):
+        # 첫 클릭은 보드 가운데
+        if engine.first_click:
+            return LEFT, engine.height // 2, engine.width // 2
+
+        cells = engine.board.cells
+        while True:
+            while self.moves:
+                button, i = self.moves.popleft()
+                if not cells[i] & (REVEALED | FLAG):
+                    return (button,) + divmod(i, engine.width)
+            if not self.pending:
+                break
+            i = self.pending.pop()
+            self.queued.discard(i)
+            self.analyze(engine, i)
+
+        # 확실한 칸이 없으면 추측
+        row, col = divmod(random_unknown_cell(engine, self.rng), engine.width)
+        return LEFT, row, col
+
+    def analyze(self, engine, i):
+        cells = engine.board.cells
+        unknown = []
+        flagged = 0
+        for j in self.adjacent[i]:
+            if cells[j] & FLAG:
+                flagged += 1
+            elif not cells[j] & REVEALED:
+                unknown.append(j)
+        if not unknown:
+            return
+        remaining = (cells[i] & NUMBER_MASK) - flagged
+        if remaining == 0:
+            self.moves.extend((LEFT, j) for j in unknown)
+        elif remaining == len(unknown):
+            self.moves.extend((RIGHT, j) for j in unknown)
+
+    def queue(self, engine, i):
+        cells = engine.board.cells
+        if i not in self.queued and cells[i] & REVEALED and not cells[i] & MINE and cells[i] & NUMBER_MASK:
+            self.queued.add(i)
+            self.pending.append(i)
+
+    def observe(self, engine, button, row, col, changed):
+        if button == RIGHT:
+            changed = [row * engine.width + col]
+        # 바뀐 칸과 그 주변의 열린 숫자 칸을 다시 살펴봄
+        for i in changed:
+            self.queue(engine, i)
+            for j in self.adjacent[i]:
+                self.queue(engine, j)
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "deduction": DeductionPolicy,
+}
+
+
+def play_game(engine, policy):
+    # 게임이 끝날 때까지 플레이하고 (승리 여부, 클릭 수) 반환
+    policy.start(engine)
+    while not engine.game_over:
+        button, row, col = policy.choose(engine)
+        if button == LEFT:
+            changed = engine.left_click(row, col)
+        else:
+            engine.right_click(row, col)
+            changed = []
+        policy.observe(engine, button, row, col, changed)
+    return engine.won, engine.clicks
+
+
+def game_rng(seed, game_index):
+    # 게임마다 독립적이고 재현 가능한 난수 생성기
+    return random.Random(seed * 1_000_000_007 + game_index)
+
+
+def simulate_chunk(task):
+    # 프로세스 하나가 처리하는 게임 묶음: (게임 수, 승리 수, 클릭 수) 반환
+    settings, policy_name, seed, start, count = task
+    engine = GameEngine(settings["width"], settings["height"], settings["mines"])
+    wins = 0
+    clicks = 0
+    for game_index in range(start, start + count):
+        rng = game_rng(seed, game_index)
+        engine.rng = rng
+        engine.reset()
+        policy = POLICIES[policy_name](random.Random(rng.getrandbits(64)))
+        won, game_clicks = play_game(engine, policy)
+        wins += won
+        clicks += game_clicks
+    return count, wins, clicks
+
+
+def run_simulation(settings, games, workers=None, policy="deduction", seed=0, chunk_size=None):
+    # 게임을 묶음으로 나눠 프로세스 풀에서 병렬로 실행하고 결과 요약 반환
+    if policy not in POLICIES:
+        raise ValueError(f"알 수 없는 플레이어: {policy}")
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # 작업자마다 여러 묶음을 받아 부하가 고르게 나뉘도록
+        chunk_size = max(1, min(1000, games // (workers * 8) or 1))
+    tasks = [(settings, policy, seed, start, min(chunk_size, games - start))
+             for start in range(0, games, chunk_size)]
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        results = map(simulate_chunk, tasks)
+        totals = [sum(values) for values in zip(*results)] if tasks else [0, 0, 0]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(simulate_chunk, tasks)
+            totals = [sum(values) for values in zip(*results)] if tasks else [0, 0, 0]
+    elapsed = time.perf_counter() - start_time
+
+    played, wins, clicks = totals
+    return {
+        "games": played,
+        "wins": wins,
+        "win_rate": wins / played if played else 0.0,
+        "clicks_per_game": clicks / played if played else 0.0,
+        "seconds": elapsed,
+        "games_per_second": played / elapsed if elapsed > 0 else 0.0,
+        "workers": workers,
+        "policy": policy,
+    }
+
+
+def print_report(level, report):
+    print(f"난이도: {level}, 플레이어: {report['policy']}, 작업자: {report['workers']}")
+    print(f"게임 수: {report['games']}")
+    print(f"승률: {report['win_rate'] * 100:.2f}%")
+    print(f"게임당 클릭 수: {report['clicks_per_game']:.2f}")
+    print(f"초당 게임 수: {report['games_per_second']:.1f} ({report['seconds']:.2f}초)")
+
+
+def add_arguments(parser):
+    parser.add_argument("--difficulty", default="고급", choices=list(DIFFICULTY_LEVELS))
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--policy", default="deduction", choices=list(POLICIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=None)
+
+
+def main(args):
+    report = run_simulation(DIFFICULTY_LEVELS[args.difficulty], args.games, args.workers,
+                            args.policy, args.seed, args.chunk_size)
+    print_report(args.difficulty, report)
@@ -0,0 +1,333 @@
+from math import comb
+
+from minesweeper_board import REVEALED, MINE, FLAG, NUMBER_MASK
+
+# 한 연결 성분에서 탐색할 최대 노드 수 (넘으면 정확한 확률 계산은 건너뜀)
+MAX_SEARCH_NODES = 50000
+# 게임 루프에서 부르는 힌트/자동 풀이의 확률 계산 한 번에 쓸 전체 노드 수 (고급 보드에서 5ms 안쪽)
+HINT_SEARCH_NODES = 1000
+# 연결 성분별 계산 결과 캐시 크기
+MAX_CACHE_ENTRIES = 4096
+
+
+class Solver:
+    # 열린 숫자 칸만 보고 안전한 칸/지뢰와 지뢰 확률을 계산하는 풀이기
+    # 제약 조건(숫자 칸 -> 주변 닫힌 칸)은 칸이 열릴 때마다 갱신하고,
+    # 연결 성분별 계산 결과는 제약 조건이 같으면 다시 쓰도록 캐시함
+    # 깃발은 플레이어가 틀릴 수 있으므로 추론에 사용하지 않음
+    def __init__(self, board, mines, total_nodes=None):
+        self.board = board
+        self.mines = mines
+        # 확률 계산 한 번에 모든 성분을 합쳐 탐색할 최대 노드 수 (None이면 성분마다 MAX_SEARCH_NODES)
+        self.total_nodes = total_nodes
+        self.nodes = 0  # 마지막 enumerate_component가 탐색한 노드 수
+        self.cache = {}
+        self.rebuild()
+
+    def rebuild(self):
+        # 보드 전체를 스캔해서 제약 조건을 처음부터 만듦 (게임 중간에 만들 때)
+        self.constraints = {}  # 숫자 칸 -> [닫힌 주변 칸 집합, 주변 지뢰 수]
+        self.frontier = {}  # 닫힌 칸 -> 이 칸을 포함하는 숫자 칸 집합
+        self.unrevealed = 0
+        cells = self.board.cells
+        for i in range(len(cells)):
+            if cells[i] & REVEALED:
+                self.add_constraint(i)
+            else:
+                self.unrevealed += 1
+
+    def neighbours(self, index):
+        width = self.board.width
+        row, col = divmod(index, width)
+        for i in range(max(0, row-1), min(self.board.height, row+2)):
+            for j in range(max(0, col-1), min(width, col+2)):
+                if i != row or j != col:
+                    yield i * width + j
+
+    def add_constraint(self, index):
+        cells = self.board.cells
+        if cells[index] & MINE:
+            return
+        unknown = {j for j in self.neighbours(index) if not cells[j] & REVEALED}
+        if not unknown:
+            return
+        self.constraints[index] = [unknown, cells[index] & NUMBER_MASK]
+        for j in unknown:
+            self.frontier.setdefault(j, set()).add(index)
+
+    def on_reveal(self, changed):
+        # 새로 열린 칸 목록으로 제약 조건 갱신 (바뀐 부분만)
+        self.unrevealed -= len(changed)
+        for i in changed:
+            for c in self.frontier.pop(i, ()):
+                constraint = self.constraints[c]
+                constraint[0].discard(i)
+                if not constraint[0]:
+                    del self.constraints[c]
+        for i in changed:
+            self.add_constraint(i)
+
+    def components(self):
+        # 제약 조건으로 연결된 닫힌 칸들의 독립 성분 목록
+        seen = set()
+        result = []
+        for start in self.frontier:
+            if start in seen:
+                continue
+            seen.add(start)
+            cells = [start]
+            constraint_ids = set()
+            stack = [start]
+            while stack:
+                cell = stack.pop()
+                for c in self.frontier[cell]:
+                    if c in constraint_ids:
+                        continue
+                    constraint_ids.add(c)
+                    for other in self.constraints[c][0]:
+                        if other not in seen:
+                            seen.add(other)
+                            cells.append(other)
+                            stack.append(other)
+            result.append((cells, [self.constraints[c] for c in constraint_ids]))
+        return result
+
+    def deduce(self):
+        # 단일 칸 추론과 부분집합 추론으로 확실한 안전한 칸/지뢰 찾기
+        safe = set()
+        mines = set()
+        constraints = [(frozenset(cells), count) for cells, count in self.constraints.values()]
+        for cells, count in constraints:
+            if count == 0:
+                safe |= cells
+            elif count == len(cells):
+                mines |= cells
+
+        # 부분집합 추론: A ⊂ B 이면 B - A 에는 (B의 지뢰 수 - A의 지뢰 수)개의 지뢰
+        by_cell = {}
+        for k, (cells, _) in enumerate(constraints):
+            for cell in cells:
+                by_cell.setdefault(cell, []).append(k)
+        for a, (cells_a, count_a) in enumerate(constraints):
+            candidates = set()
+            for cell in cells_a:
+                candidates.update(by_cell[cell])
+            for b in candidates:
+                cells_b, count_b = constraints[b]
+                if b == a or len(cells_b) <= len(cells_a) or not cells_a <= cells_b:
+                    continue
+                rest = cells_b - cells_a
+                if count_b - count_a == 0:
+                    safe |= rest
+                elif count_b - count_a == len(rest):
+                    mines |= rest
+        return safe, mines
+
+    def enumerate_component(self, cells, constraints, max_nodes=MAX_SEARCH_NODES):
+        # 성분의 모든 지뢰 배치를 탐색해서 지뢰 수별 (배치 수, 칸별 지뢰 횟수) 계산
+        # 같은 제약 조건이면 캐시된 결과를 사용 (한도를 넘어 실패한 결과는 더 큰 한도로는 다시 계산)
+        key = frozenset((frozenset(c), count) for c, count in constraints)
+        cached = self.cache.get(key)
+        self.nodes = 0
+        if cached is not None and (cached[0] is not None or cached[1] >= max_nodes):
+            return cached[0]
+
+        # 이웃한 칸끼리 가깝게 배치해서 가지치기가 빨리 일어나도록 정렬
+        order = sorted(cells)
+        position = {cell: k for k, cell in enumerate(order)}
+        need = [count for _, count in constraints]
+        left = [len(c) for c, _ in constraints]
+        var_constraints = [[] for _ in order]
+        for k, (c, _) in enumerate(constraints):
+            for cell in c:
+                var_constraints[position[cell]].append(k)
+
+        n = len(order)
+        placed = []  # 현재 배치에서 지뢰인 칸 번호
+        result = {}
+
+        # 깊이 우선 탐색 (성분이 수천 칸이어도 재귀 한도에 걸리지 않도록 명시적인 상태로 진행)
+        # next_value[pos]: pos 칸에 다음에 놓아 볼 값 (2면 두 값을 모두 해 봄)
+        # applied[pos]: pos 칸에 지금 놓인 값 (없으면 -1)
+        next_value = [0] * n
+        applied = [-1] * n
+        nodes = 1
+        pos = 0
+        while pos >= 0:
+            if pos == n:
+                entry = result.get(len(placed))
+                if entry is None:
+                    entry = result[len(placed)] = [0, [0] * n]
+                entry[0] += 1
+                counts = entry[1]
+                for k in placed:
+                    counts[k] += 1
+                pos -= 1
+                continue
+            # 이 칸에 놓았던 값을 먼저 되돌림
+            value = applied[pos]
+            if value >= 0:
+                for c in var_constraints[pos]:
+                    need[c] += value
+                    left[c] += 1
+                if value:
+                    placed.pop()
+                applied[pos] = -1
+            value = next_value[pos]
+            if value == 2:
+                next_value[pos] = 0
+                pos -= 1
+                continue
+            next_value[pos] = value + 1
+            # value를 놓고 모든 제약 조건을 아직 만족할 수 있는지 확인
+            ok = True
+            for c in var_constraints[pos]:
+                need[c] -= value
+                left[c] -= 1
+                if need[c] < 0 or need[c] > left[c]:
+                    ok = False
+            if not ok:
+                for c in var_constraints[pos]:
+                    need[c] += value
+                    left[c] += 1
+                continue
+            nodes += 1
+            if nodes > max_nodes:
+                break
+            applied[pos] = value
+            if value:
+                placed.append(pos)
+            pos += 1
+
+        self.nodes = nodes
+        if nodes > max_nodes:
+            value = None
+        else:
+            value = {mines: (count, dict(zip(order, counts))) for mines, (count, counts) in result.items()}
+
+        if len(self.cache) >= MAX_CACHE_ENTRIES:
+            self.cache.clear()
+        self.cache[key] = (value, max_nodes)
+        return value
+
+    def probabilities(self, check=None):
+        # 닫힌 칸별 지뢰 확률 (성분별 정확 계산 + 남은 지뢰 수로 가중치)
+        # 반환값: (경계 칸 -> 확률, 경계 밖 닫힌 칸의 확률, 탐색 한도를 넘은 성분의 칸 목록)
+        # 탐색 한도를 넘은 성분의 칸은 확률을 모르므로 결과에 포함되지 않고 세 번째 값으로 따로 알려 줌
+        # check: 성분마다 계산 전에 호출 (예외를 던져 오래 걸리는 계산을 중간에 멈출 수 있음)
+        # total_nodes가 있으면 한도를 다 쓴 뒤의 성분은 캐시된 결과만 사용
+        components = []
+        skipped = []
+        budget = self.total_nodes
+        for cells, constraints in self.components():
+            if check:
+                check()
+            if budget is None:
+                value = self.enumerate_component(cells, constraints)
+            else:
+                value = self.enumerate_component(cells, constraints, min(MAX_SEARCH_NODES, max(budget, 0)))
+                budget -= self.nodes
+            if value is not None:
+                components.append((cells, value))
+            else:
+                skipped.extend(cells)
+
+        frontier_cells = sum(len(cells) for cells, _ in components)
+        # 경계 밖 닫힌 칸 (탐색하지 못한 성분의 칸은 제약 없는 칸으로 근사)
+        other = self.unrevealed - frontier_cells
+        remaining = self.mines
+
+        # 성분별 지뢰 수 분포를 앞/뒤로 곱해 두고, 각 성분을 뺀 나머지 분포를 구함
+        distributions = [{k: count for k, (count, _) in value.items()} for _, value in components]
+        prefix = [{0: 1}]
+        for dist in distributions:
+            prefix.append(convolve(prefix[-1], dist))
+        suffix = [{0: 1}]
+        for dist in reversed(distributions):
+            suffix.append(convolve(suffix[-1], dist))
+        suffix.reverse()
+
+        total_dist = prefix[-1]
+        total = 0
+        other_mines = 0
+        for t, count in total_dist.items():
+            free = remaining - t
+            if 0 <= free <= other:
+                weight = count * comb(other, free)
+                total += weight
+                other_mines += weight * free
+        if total == 0:
+            return {}, None, skipped
+
+        result = {}
+        for index, (cells, value) in enumerate(components):
+            others = convolve(prefix[index], suffix[index + 1])
+            per_cell = dict.fromkeys(cells, 0)
+            for k, (_, cell_counts) in value.items():
+                weight = 0
+                for t, count in others.items():
+                    free = remaining - k - t
+                    if 0 <= free <= other:
+                        weight += count * comb(other, free)
+                if weight:
+                    for cell, cell_count in cell_counts.items():
+                        per_cell[cell] += weight * cell_count
+            for cell, mine_weight in per_cell.items():
+                result[cell] = mine_weight / total
+
+        other_probability = other_mines / total / other if other else None
+        return result, other_probability, skipped
+
+    def safe_cells(self):
+        # 확실히 안전한 칸 (추론으로 못 찾으면 정확한 확률이 0인 칸)
+        safe, _ = self.deduce()
+        if safe:
+            return safe
+        probabilities, _, _ = self.probabilities()
+        return {cell for cell, p in probabilities.items() if p == 0}
+
+    def hint(self):
+        # 다음 수 추천: ('safe', 칸), ('mine', 칸), ('guess', 칸, 지뢰 확률) 또는 None
+        board = self.board
+        safe, mines = self.deduce()
+        if safe:
+            return ('safe', min(safe))
+        unflagged = [cell for cell in mines if not board.cells[cell] & FLAG]
+        if unflagged:
+            return ('mine', min(unflagged))
+
+        probabilities, other_probability, _ = self.probabilities()
+        for cell, p in sorted(probabilities.items()):
+            if p == 0:
+                return ('safe', cell)
+        for cell, p in sorted(probabilities.items()):
+            if p == 1 and not board.cells[cell] & FLAG:
+                return ('mine', cell)
+
+        # 확실한 칸이 없으면 지뢰 확률이 가장 낮은 칸을 추천
+        best = None
+        if probabilities:
+            cell = min(probabilities, key=lambda c: (probabilities[c], c))
+            best = ('guess', cell, probabilities[cell])
+        if other_probability is not None and (best is None or other_probability < best[2]):
+            cell = self.first_other_cell()
+            if cell is not None:
+                best = ('guess', cell, other_probability)
+        return best
+
+    def first_other_cell(self):
+        # 경계 밖의 닫힌 칸 하나 (깃발 없는 칸)
+        cells = self.board.cells
+        for i in range(len(cells)):
+            if not cells[i] & (REVEALED | FLAG) and i not in self.frontier:
+                return i
+        return None
+
+
+def convolve(a, b):
+    # 지뢰 수 분포 두 개의 합성곱
+    result = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            result[i + j] = result.get(i + j, 0) + x * y
+    return result
@@ -0,0 +1,272 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from minesweeper_board import MINE, NUMBER_MASK
+from minesweeper_engine import DIFFICULTY_LEVELS
+from minesweeper_paths import data_path
+
+# 기본 통계 파일 (데이터 폴더 안, MINESWEEPER_STATS_FILE로 변경, 빈 값이면 기록하지 않음)
+DEFAULT_STATS_FILE = "stats.db"
+
+# 기록 묶음 크기와, 첫 기록 뒤 묶음을 채우려고 기다리는 최대 시간 (초)
+BATCH_SIZE = 256
+BATCH_DELAY = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    time_ms INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    bbbv INTEGER NOT NULL,
+    no_guess INTEGER NOT NULL
+);
+-- 난이도별 최고 기록 (승리한 게임을 시간 순으로)
+CREATE INDEX IF NOT EXISTS games_best ON games (difficulty, won, time_ms);
+-- 난이도/결과별 게임 순서 (연승 계산, 인덱스 끝에 id가 함께 들어 있어 마지막 패배를 바로 찾음)
+CREATE INDEX IF NOT EXISTS games_outcome ON games (difficulty, won);
+"""
+
+INSERT = """
+INSERT INTO games (finished_at, difficulty, width, height, mines, won, time_ms, clicks, bbbv, no_guess)
+VALUES (:finished_at, :difficulty, :width, :height, :mines, :won, :time_ms, :clicks, :bbbv, :no_guess)
+"""
+
+# 연속 승리 구간: 전체 순번과 결과별 순번의 차이가 같은 게임들이 하나의 연승 구간
+BEST_STREAK = """
+SELECT COALESCE(MAX(length), 0) FROM (
+    SELECT COUNT(*) AS length FROM (
+        SELECT won,
+               ROW_NUMBER() OVER (ORDER BY id) - ROW_NUMBER() OVER (PARTITION BY won ORDER BY id) AS island
+        FROM games WHERE difficulty = ?
+    ) WHERE won = 1 GROUP BY island
+)
+"""
+
+CURRENT_STREAK = """
+SELECT COUNT(*) FROM games
+WHERE difficulty = ? AND won = 1
+  AND id > COALESCE((SELECT MAX(id) FROM games WHERE difficulty = ? AND won = 0), 0)
+"""
+
+
+def difficulty_key(difficulty, width, height, mines):
+    # 통계에 쓰는 난이도 이름 (기본 난이도가 아니면 보드 크기와 지뢰 수를 붙여서 설정별로 따로 기록)
+    if difficulty in DIFFICULTY_LEVELS:
+        return difficulty
+    return f"{difficulty} {width}x{height}/{mines}"
+
+
+def board_3bv(cells, width, height):
+    # 3BV: 모든 안전한 칸을 여는 데 필요한 최소 클릭 수
+    # = 빈 칸(0) 영역 수 + 어느 빈 칸과도 닿지 않은 숫자 칸 수
+    grid = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(height, width)
+    mine = (grid & MINE) != 0
+    zero = ~mine & ((grid & NUMBER_MASK) == 0)
+
+    # 빈 칸과 그 주변 칸 (빈 칸 영역을 열 때 함께 열림)
+    padded = np.pad(zero, 1)
+    opened = np.zeros_like(zero)
+    for dy in range(3):
+        for dx in range(3):
+            opened |= padded[dy:dy + height, dx:dx + width]
+    isolated = int((~mine & ~opened).sum())
+
+    # 빈 칸 영역 수 (8방향으로 이어진 빈 칸은 한 번의 클릭으로 열림)
+    unvisited = bytearray(zero.astype(np.uint8).tobytes())
+    openings = 0
+    for start in np.flatnonzero(zero).tolist():
+        if not unvisited[start]:
+            continue
+        openings += 1
+        unvisited[start] = 0
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            r, c = divmod(i, width)
+            for nr in range(max(0, r - 1), min(height, r + 2)):
+                base = nr * width
+                for j in range(base + max(0, c - 1), base + min(width, c + 2)):
+                    if unvisited[j]:
+                        unvisited[j] = 0
+                        stack.append(j)
+    return openings + isolated
+
+
+class StatsStore:
+    # 끝난 게임 기록을 SQLite에 저장하는 통계 저장소
+    # 쓰기는 백그라운드 스레드가 묶어서 처리하므로 record()는 게임 루프를 막지 않음
+    # 순위표와 요약은 메모리에 캐시하고, 새 기록이 저장되면 캐시를 비움
+    def __init__(self, path):
+        self.path = path
+        # 읽기용 연결 (게임 루프 스레드), 쓰기용 연결은 작업 스레드에서 만듦
+        self.db = self.connect()
+        self.db.executescript(SCHEMA)
+        self.cache = {}
+        # 난이도별 최고 기록 (ms), 처음 한 번만 읽고 이후에는 record()에서 갱신
+        # 게임이 끝날 때마다 게임 루프에서 읽으므로 저장할 때 비워지는 캐시와 따로 둠
+        self.best_times = {}
+        # 저장할 때마다 올라가는 번호 (저장 전에 시작한 조회 결과는 캐시에 넣지 않음)
+        self.version = 0
+        self.cache_lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.worker = threading.Thread(target=self.write_loop, name="stats-writer", daemon=True)
+        self.worker.start()
+
+    def connect(self):
+        db = sqlite3.connect(self.path)
+        # 쓰는 동안에도 다른 연결에서 읽을 수 있도록
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def record(self, difficulty, board, won, time_ms, clicks, no_guess=False):
+        # 끝난 게임 기록 (보드는 복사해서 넘기고 3BV는 작업 스레드에서 계산)
+        if won:
+            best = self.best_time(difficulty)
+            if best is None or time_ms < best:
+                self.best_times[difficulty] = int(time_ms)
+        self.pending.put({
+            "finished_at": time.time(),
+            "difficulty": difficulty,
+            "width": board.width,
+            "height": board.height,
+            "mines": board.mine_count,
+            "won": int(won),
+            "time_ms": int(time_ms),
+            "clicks": clicks,
+            "cells": bytes(board.cells),
+            "no_guess": int(no_guess),
+        })
+
+    def write_loop(self):
+        db = self.connect()
+        while True:
+            games = [self.pending.get()]
+            # 첫 기록을 받은 뒤 잠시 더 모아서 한 번의 트랜잭션으로 저장
+            deadline = time.monotonic() + BATCH_DELAY
+            while games[-1] is not None and len(games) < BATCH_SIZE:
+                try:
+                    games.append(self.pending.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = games[-1] is None
+            games = [game for game in games if game is not None]
+            if games:
+                for game in games:
+                    game["bbbv"] = board_3bv(game.pop("cells"), game["width"], game["height"])
+                with db:
+                    db.executemany(INSERT, games)
+                with self.cache_lock:
+                    self.version += 1
+                    self.cache.clear()
+            for _ in range(len(games) + stop):
+                self.pending.task_done()
+            if stop:
+                db.close()
+                return
+
+    def flush(self):
+        # 대기 중인 기록이 모두 저장될 때까지 기다림
+        self.pending.join()
+
+    def cached(self, key, query):
+        with self.cache_lock:
+            if key in self.cache:
+                return self.cache[key]
+            version = self.version
+        value = query()
+        with self.cache_lock:
+            if version == self.version:
+                self.cache[key] = value
+        return value
+
+    def best_time(self, difficulty):
+        # 난이도별 가장 빠른 승리 시간 (ms, 없으면 None), games_best 인덱스의 첫 항목만 읽음
+        if difficulty not in self.best_times:
+            self.best_times[difficulty] = self.db.execute(
+                "SELECT MIN(time_ms) FROM games WHERE difficulty = ? AND won = 1", (difficulty,)).fetchone()[0]
+        return self.best_times[difficulty]
+
+    def leaderboard(self, difficulty, limit=10):
+        # 난이도별 가장 빠른 승리 기록 [(시간 ms, 클릭 수, 3BV, 끝난 시각)]
+        return self.cached(("leaderboard", difficulty, limit), lambda: self.db.execute(
+            "SELECT time_ms, clicks, bbbv, finished_at FROM games "
+            "WHERE difficulty = ? AND won = 1 ORDER BY time_ms LIMIT ?", (difficulty, limit)).fetchall())
+
+    def summary(self, difficulty):
+        # 난이도별 게임 수, 승리 수, 최고 기록, 현재/최고 연승
+        def query():
+            games, wins = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(won), 0) FROM games WHERE difficulty = ?", (difficulty,)).fetchone()
+            best = self.db.execute(
+                "SELECT MIN(time_ms) FROM games WHERE difficulty = ? AND won = 1", (difficulty,)).fetchone()[0]
+            return {
+                "games": games,
+                "wins": wins,
+                "win_rate": wins / games if games else 0.0,
+                "best_time_ms": best,
+                "current_streak": self.db.execute(CURRENT_STREAK, (difficulty, difficulty)).fetchone()[0],
+                "best_streak": self.db.execute(BEST_STREAK, (difficulty,)).fetchone()[0],
+            }
+        return self.cached(("summary", difficulty), query)
+
+    def difficulties(self):
+        return self.cached(("difficulties",), lambda: [row[0] for row in self.db.execute(
+            "SELECT DISTINCT difficulty FROM games ORDER BY difficulty")])
+
+    def close(self):
+        self.pending.put(None)
+        self.worker.join()
+        self.db.close()
+
+
+def open_store(path=None):
+    # 기본 통계 파일의 저장소 (기록이 꺼져 있으면 None)
+    if path is None:
+        path = os.environ.get("MINESWEEPER_STATS_FILE")
+        if path is None:
+            path = data_path(DEFAULT_STATS_FILE)
+    if not path:
+        return None
+    return StatsStore(path)
+
+
+def add_arguments(parser):
+    parser.add_argument("--file", default=None, help="통계 파일 (기본: MINESWEEPER_STATS_FILE 또는 데이터 폴더의 stats.db)")
+    parser.add_argument("--difficulty", default=None, help="이 난이도만 출력")
+    parser.add_argument("--limit", type=int, default=10, help="순위표 항목 수")
+
+
+def main(args):
+    store = open_store(args.file)
+    if store is None:
+        print("통계 기록이 꺼져 있습니다")
+        return 1
+    # 기본 난이도 순서, 그 외(사용자 정의 등)는 뒤에
+    order = list(DIFFICULTY_LEVELS)
+    levels = [args.difficulty] if args.difficulty else store.difficulties()
+    levels.sort(key=lambda level: order.index(level) if level in order else len(order))
+    for level in levels:
+        summary = store.summary(level)
+        best = summary["best_time_ms"]
+        best_text = f"{best / 1000:.2f}초" if best is not None else "없음"
+        print(f"[{level}] 게임 {summary['games']}개, 승률 {summary['win_rate'] * 100:.1f}%, 최고 기록 {best_text}")
+        print(f"  현재 연승 {summary['current_streak']}, 최고 연승 {summary['best_streak']}")
+        for rank, (time_ms, clicks, bbbv, finished_at) in enumerate(store.leaderboard(level, args.limit), 1):
+            seconds = time_ms / 1000
+            rate = bbbv / seconds if seconds > 0 else 0.0
+            day = time.strftime("%Y-%m-%d", time.localtime(finished_at))
+            print(f"  {rank:>2}. {seconds:7.2f}초  클릭 {clicks:>4}  3BV {bbbv:>4} ({rate:.2f}/초)  {day}")
+    store.close()
+    return 0
@@ -0,0 +1,240 @@
+import dbm
+import sys
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from minesweeper_board import MINE, REVEALED, FLAG, NUMBER_MASK
+
+# 청크 한 변의 칸 수 (2의 거듭제곱이어야 비트 연산으로 좌표 변환 가능)
+CHUNK_SHIFT = 5
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# 지뢰 밀도 (빈 칸 영역이 무한히 이어지지 않도록 MIN_DENSITY 이상)
+DEFAULT_DENSITY = 0.16
+MIN_DENSITY = 0.12
+MAX_DENSITY = 0.5
+
+# 메모리에 유지하는 청크 수 (청크당 CHUNK_SIZE * CHUNK_SIZE 바이트)
+MAX_CHUNKS = 256
+# 숫자 계산용 지뢰 배치 캐시 크기 (청크 수)
+MAX_MINE_CACHE = 1024
+
+
+def zigzag(n):
+    # 음수 좌표를 시드로 쓸 수 있도록 0 이상의 정수로 변환
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+class ChunkStore:
+    # 플레이어가 바꾼 청크를 디스크에 보관 (지뢰/숫자는 시드로 다시 만들 수 있지만
+    # 열림/깃발 상태는 여기서만 복원됨)
+    # 세계의 시드와 카운터도 함께 보관해서 다음 실행 때 같은 세계를 다시 열 수 있음
+    WORLD_KEY = "world"
+
+    def __init__(self, path):
+        self.path = path
+        self.db = dbm.open(path, "c")
+
+    def key(self, seed, cx, cy):
+        return f"{seed}:{cx}:{cy}"
+
+    def get(self, seed, cx, cy):
+        data = self.db.get(self.key(seed, cx, cy))
+        return bytearray(zlib.decompress(data)) if data is not None else None
+
+    def put(self, seed, cx, cy, cells):
+        self.db[self.key(seed, cx, cy)] = zlib.compress(bytes(cells))
+
+    def load_world(self):
+        # 저장된 세계의 (시드, 밀도, 카운터) (없으면 None)
+        data = self.db.get(self.WORLD_KEY)
+        if data is None:
+            return None
+        seed, density, revealed_safe, revealed_mines, flag_count = data.decode("ascii").split()
+        counters = {
+            "revealed_safe": int(revealed_safe),
+            "revealed_mines": int(revealed_mines),
+            "flag_count": int(flag_count),
+        }
+        return int(seed), float(density), counters
+
+    def save_world(self, world):
+        self.db[self.WORLD_KEY] = (f"{world.seed} {world.density!r} {world.revealed_safe} "
+                                   f"{world.revealed_mines} {world.flag_count}")
+
+    def clear(self):
+        for key in list(self.db.keys()):
+            del self.db[key]
+
+    def close(self):
+        self.db.close()
+
+
+class EndlessBoard:
+    # 크기 제한이 없는 보드. 청크 단위로 필요할 때 시드와 청크 좌표에서 지뢰를 만들고,
+    # 오래 쓰지 않은 청크는 버리거나 (바뀐 청크는) 저장소에 써서 메모리 사용량을 제한함
+    # 셀 상태는 Board와 같은 1바이트 형식, 좌표는 전역 (x, y) 정수 (음수 가능)
+    # (0, 0)과 그 주변은 항상 안전한 시작 지점
+    def __init__(self, seed, density=DEFAULT_DENSITY, store=None, max_chunks=MAX_CHUNKS):
+        if not MIN_DENSITY <= density <= MAX_DENSITY:
+            raise ValueError(f"지뢰 밀도는 {MIN_DENSITY}~{MAX_DENSITY} 사이여야 합니다")
+        self.seed = seed
+        self.density = density
+        self.store = store
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (cx, cy) -> 셀 상태 bytearray (최근 사용 순)
+        self.modified = set()  # 저장소에 아직 쓰지 않은 바뀐 청크
+        self.mine_cache = OrderedDict()
+        self.warned = False
+        self.revealed_safe = 0
+        self.revealed_mines = 0
+        self.flag_count = 0
+
+    @classmethod
+    def reopen(cls, store, max_chunks=MAX_CHUNKS):
+        # 저장소에 보관된 세계를 다시 엶 (저장된 세계가 없으면 None)
+        saved = store.load_world()
+        if saved is None:
+            return None
+        seed, density, counters = saved
+        world = cls(seed, density, store=store, max_chunks=max_chunks)
+        for name, value in counters.items():
+            setattr(world, name, value)
+        return world
+
+    def chunk_mines(self, cx, cy):
+        # 청크의 지뢰 배치 (시드와 청크 좌표로 결정, 같은 청크는 항상 같은 배치)
+        key = (cx, cy)
+        mines = self.mine_cache.get(key)
+        if mines is not None:
+            self.mine_cache.move_to_end(key)
+            return mines
+        rng = np.random.default_rng([self.seed, zigzag(cx), zigzag(cy)])
+        mines = rng.random((CHUNK_SIZE, CHUNK_SIZE)) < self.density
+        if cx in (0, -1) and cy in (0, -1):
+            # 시작 지점 (0, 0) 주변 3x3은 지뢰 없음
+            for y in (-1, 0, 1):
+                for x in (-1, 0, 1):
+                    if x >> CHUNK_SHIFT == cx and y >> CHUNK_SHIFT == cy:
+                        mines[y & CHUNK_MASK, x & CHUNK_MASK] = False
+        self.mine_cache[key] = mines
+        if len(self.mine_cache) > MAX_MINE_CACHE:
+            self.mine_cache.popitem(last=False)
+        return mines
+
+    def generate(self, cx, cy):
+        # 주변 8개 청크의 지뢰까지 보고 경계 칸의 숫자를 계산
+        size = CHUNK_SIZE
+        around = np.block([[self.chunk_mines(cx + dx, cy + dy) for dx in (-1, 0, 1)] for dy in (-1, 0, 1)])
+        padded = around[size - 1:2 * size + 1, size - 1:2 * size + 1].astype(np.uint8)
+        counts = np.zeros((size, size), dtype=np.uint8)
+        for dy in range(3):
+            for dx in range(3):
+                counts += padded[dy:dy + size, dx:dx + size]
+        mines = padded[1:-1, 1:-1] == 1
+        return bytearray(np.where(mines, np.uint8(MINE), counts).astype(np.uint8).tobytes())
+
+    def chunk(self, cx, cy):
+        # 청크의 셀 상태 (저장소에 있으면 불러오고, 없으면 새로 만듦)
+        # 여기서는 다른 청크를 내보내지 않으므로 작업 중에 받은 청크는 계속 유효함
+        key = (cx, cy)
+        cells = self.chunks.get(key)
+        if cells is not None:
+            self.chunks.move_to_end(key)
+            return cells
+        cells = self.store.get(self.seed, cx, cy) if self.store else None
+        if cells is None:
+            cells = self.generate(cx, cy)
+        self.chunks[key] = cells
+        return cells
+
+    def evict(self):
+        # 최근에 쓰지 않은 청크부터 내보내서 max_chunks개만 유지
+        # 저장소가 없으면 바뀐 청크는 내보낼 수 없어서 메모리에 남고, 그것만으로 max_chunks를 넘으면 한 번 경고함
+        if len(self.chunks) <= self.max_chunks:
+            return
+        for key in list(self.chunks):
+            if len(self.chunks) <= self.max_chunks:
+                break
+            if key in self.modified:
+                if not self.store:
+                    continue
+                self.store.put(self.seed, key[0], key[1], self.chunks[key])
+                self.modified.discard(key)
+            del self.chunks[key]
+        if len(self.chunks) > self.max_chunks and not self.warned:
+            self.warned = True
+            print(f"저장소가 없어서 바뀐 청크 {len(self.modified)}개를 모두 메모리에 유지합니다 "
+                  f"(최대 {self.max_chunks}개)", file=sys.stderr)
+
+    def flush(self):
+        # 메모리에 있는 바뀐 청크와 세계의 카운터를 모두 저장소에 씀
+        if self.store:
+            for key in self.modified:
+                self.store.put(self.seed, key[0], key[1], self.chunks[key])
+            self.modified.clear()
+            self.store.save_world(self)
+
+    def cell(self, x, y):
+        return self.chunk(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+
+    def is_lost(self):
+        return self.revealed_mines > 0
+
+    def toggle_flag(self, x, y):
+        # 깃발을 토글했으면 True (열린 칸이면 False)
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        cells = self.chunk(*key)
+        i = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        if cells[i] & REVEALED:
+            return False
+        cells[i] ^= FLAG
+        self.flag_count += 1 if cells[i] & FLAG else -1
+        self.modified.add(key)
+        self.evict()
+        return True
+
+    def reveal(self, x, y):
+        # 연쇄 열기 (청크 경계를 넘어 이웃 청크로 이어짐)
+        # 반환값: 새로 열린 칸의 전역 좌표 목록
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        cells = self.chunk(*key)
+        i = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        if cells[i] & (REVEALED | FLAG):
+            return []
+        cells[i] |= REVEALED
+        self.modified.add(key)
+        changed = [(x, y)]
+        if cells[i] & MINE:
+            self.revealed_mines += 1
+            self.evict()
+            return changed
+
+        # changed 목록 자체를 큐로 사용, 같은 청크가 이어지는 동안은 청크 조회를 건너뜀
+        current = key
+        head = 0
+        while head < len(changed):
+            x, y = changed[head]
+            head += 1
+            key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+            if key != current:
+                cells = self.chunk(*key)
+                current = key
+            if cells[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)] & (MINE | NUMBER_MASK):
+                continue
+            for ny in (y - 1, y, y + 1):
+                for nx in (x - 1, x, x + 1):
+                    nkey = (nx >> CHUNK_SHIFT, ny >> CHUNK_SHIFT)
+                    ncells = cells if nkey == key else self.chunk(*nkey)
+                    j = ((ny & CHUNK_MASK) << CHUNK_SHIFT) | (nx & CHUNK_MASK)
+                    if not ncells[j] & (REVEALED | FLAG):
+                        ncells[j] |= REVEALED
+                        self.modified.add(nkey)
+                        changed.append((nx, ny))
+
+        self.revealed_safe += len(changed)
+        self.evict()
+        return changed
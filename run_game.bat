@@ -28,7 +28,7 @@ if %ERRORLEVEL% NEQ 0 (
 
 REM pygame 설치
 echo 필요한 패키지를 설치합니다...
-pip install pygame
+pip install pygame numpy
 if %ERRORLEVEL% NEQ 0 (
     echo pygame 설치 실패
     pause
@@ -23,7 +23,7 @@ if [[ "$OSTYPE" == "darwin"* ]]; then
     
     # pygame 설치
     echo "필요한 패키지를 설치합니다..."
-    pip install pygame || { echo "pygame 설치 실패"; exit 1; }
+    pip install pygame numpy || { echo "pygame 설치 실패"; exit 1; }
     
     # 게임 실행
     echo "지뢰 찾기 게임을 시작합니다..."
@@ -49,7 +49,7 @@ elif [[ "$OSTYPE" == "msys" ]] || [[ "$OSTYPE" == "win32" ]]; then
     
     # pygame 설치
     echo "필요한 패키지를 설치합니다..."
-    pip install pygame || { echo "pygame 설치 실패"; exit 1; }
+    pip install pygame numpy || { echo "pygame 설치 실패"; exit 1; }
     
     # 게임 실행
     echo "지뢰 찾기 게임을 시작합니다..."
@@ -77,7 +77,7 @@ else
     
     # pygame 설치
     echo "필요한 패키지를 설치합니다..."
-    pip install pygame || { echo "pygame 설치 실패"; exit 1; }
+    pip install pygame numpy || { echo "pygame 설치 실패"; exit 1; }
     
     # 게임 실행
     echo "지뢰 찾기 게임을 시작합니다..."
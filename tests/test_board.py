@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from minesweeper_board import Board, MINE, REVEALED, FLAG, NUMBER_MASK
+
+
+def reference_reveal(cells, width, height, start):
+    # 칸 단위 너비 우선 탐색으로 연 칸 집합 (reveal()과 비교용)
+    if cells[start] & (REVEALED | FLAG):
+        return set()
+    opened = {start}
+    queue = [start]
+    while queue:
+        i = queue.pop()
+        if cells[i] & (MINE | NUMBER_MASK):
+            continue
+        r, c = divmod(i, width)
+        for nr in range(max(0, r - 1), min(height, r + 2)):
+            for nc in range(max(0, c - 1), min(width, c + 2)):
+                j = nr * width + nc
+                if j not in opened and not cells[j] & (REVEALED | FLAG):
+                    opened.add(j)
+                    queue.append(j)
+    return opened
+
+
+def test_cascade_opens_whole_empty_board():
+    board = Board(50, 40, debug=True)
+    board.set_mines([board.index(39, 49)])
+    changed = board.reveal(0, 0)
+    assert len(changed) == len(set(changed)) == 50 * 40 - 1
+    assert board.revealed_safe == 50 * 40 - 1
+    assert board.is_won()
+
+
+def test_flags_block_cascade():
+    board = Board(5, 5, debug=True)
+    board.set_mines([])
+    for col in range(5):
+        board.set_flag(2, col, True)
+    changed = board.reveal(0, 0)
+    assert sorted(changed) == list(range(10))
+    assert not board.is_revealed(3, 0)
+    assert board.revealed_safe == 10
+
+
+def test_number_and_mine_open_single_cell():
+    board = Board(3, 3, debug=True)
+    board.set_mines([board.index(0, 0)])
+    assert board.reveal(1, 1) == [board.index(1, 1)]
+    assert board.revealed_safe == 1
+    assert board.reveal(1, 1) == []
+    assert board.reveal(0, 0) == [0]
+    assert board.revealed_mines == 1
+    assert board.is_lost()
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_reveal_matches_cell_by_cell_search(seed):
+    rng = random.Random(seed)
+    width, height = rng.randint(1, 30), rng.randint(1, 30)
+    board = Board(width, height, debug=True)
+    board.set_mines(rng.sample(range(width * height), rng.randint(0, width * height // 6)))
+    for _ in range(rng.randint(0, width * height // 10)):
+        board.set_flag(rng.randrange(height), rng.randrange(width), True)
+    for _ in range(5):
+        row, col = rng.randrange(height), rng.randrange(width)
+        expected = reference_reveal(board.cells, width, height, row * width + col)
+        changed = board.reveal(row, col)
+        assert len(changed) == len(set(changed))
+        assert set(changed) == expected
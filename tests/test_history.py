@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from minesweeper_board import MINE
+from minesweeper_engine import GameEngine
+from minesweeper_history import History, counters
+
+
+def snapshot(engine):
+    board = engine.board
+    return (bytes(board.cells), counters(engine), board.mine_count, board.flag_count, board.wrong_flags)
+
+
+def play(engine, history, rng, moves):
+    # 게임 화면과 같은 방식으로 수를 기록하면서 무작위로 진행하고, 각 수 뒤의 상태 목록 반환
+    states = [snapshot(engine)]
+    width = engine.width
+    while len(states) <= moves and not engine.game_over:
+        index = rng.randrange(width * engine.height)
+        row, col = divmod(index, width)
+        before = counters(engine)
+        if rng.random() < 0.3:
+            if not engine.right_click(row, col):
+                continue
+            history.record((), (index,), before, counters(engine))
+        else:
+            first_click = engine.first_click
+            if not first_click and engine.board.is_mine(row, col):
+                # 게임이 끝나지 않도록 지뢰는 누르지 않음
+                continue
+            changed = engine.left_click(row, col)
+            if not changed:
+                continue
+            mines = np.flatnonzero(engine.board.grid() & MINE) if first_click else None
+            history.record(changed, (), before, counters(engine), mines)
+        states.append(snapshot(engine))
+    return states
+
+
+def test_undo_redo_without_trim():
+    engine = GameEngine(16, 16, 40, random.Random(1), debug=True)
+    history = History(16 * 16)
+    states = play(engine, history, random.Random(2), 60)
+    assert len(history.undo_moves) == len(states) - 1
+
+    for state in reversed(states[:-1]):
+        history.undo(engine)
+        assert snapshot(engine) == state
+    assert engine.first_click
+    assert history.undo(engine) is None
+    for state in states[1:]:
+        history.redo(engine)
+        assert snapshot(engine) == state
+    assert history.redo(engine) is None
+
+
+def test_undo_redo_after_trim():
+    width, height = 60, 40
+    engine = GameEngine(width, height, 300, random.Random(3), debug=True)
+    # 수 몇 개만 담을 수 있는 예산이라 오래된 수들이 체크포인트로 합쳐짐
+    history = History(width * height, max_bytes=4096)
+    states = play(engine, history, random.Random(4), 200)
+    assert history.bytes <= history.max_bytes
+    assert len(history.undo_moves) < len(states) - 1
+
+    # 되돌릴 때마다 기록된 상태 중 하나로 돌아가고, 순서도 앞으로만 감
+    position = len(states) - 1
+    undone = 0
+    while history.can_undo():
+        history.undo(engine)
+        undone += 1
+        current = snapshot(engine)
+        assert current in states[:position]
+        position = states.index(current)
+    assert undone == len(history.redo_moves)
+
+    # 다시 하면 모든 수를 지나서 마지막 상태로 돌아옴
+    while history.can_redo():
+        history.redo(engine)
+    assert snapshot(engine) == states[-1]
+
+
+def test_trim_keeps_budget_with_many_moves():
+    engine = GameEngine(30, 16, 99, random.Random(5), debug=True)
+    history = History(30 * 16, max_bytes=2048)
+    play(engine, history, random.Random(6), 500)
+    assert history.bytes <= history.max_bytes
+    assert history.bytes == sum(move.nbytes for move in history.undo_moves)
@@ -0,0 +1,81 @@
+import random
+
+from minesweeper_board import Board
+from minesweeper_engine import GameEngine
+from minesweeper_replay import (
+    ReplayWriter, iter_replays, verify, LEFT, RIGHT, WON, LOST, ABANDONED, MAGIC, FLUSH_RECORDS,
+)
+
+
+def play_recorded(writer, seed, width, height, mines, rng, preset=None):
+    # 무작위 클릭으로 게임 하나를 끝까지 진행하면서 기록하고 결과 반환
+    engine = GameEngine(width, height, mines, random.Random(seed))
+    writer.reset_clock()
+    writer.start_game(seed, width, height, mines)
+    if preset is not None:
+        engine.preset_mines = preset
+        writer.mines(preset)
+    while not engine.game_over:
+        index = rng.randrange(width * height)
+        row, col = divmod(index, width)
+        if rng.random() < 0.1:
+            engine.right_click(row, col)
+            writer.click(RIGHT, index)
+        elif not engine.board.is_flagged(row, col):
+            engine.left_click(row, col)
+            writer.click(LEFT, index)
+    result = WON if engine.won else LOST
+    writer.finish(result)
+    return result
+
+
+def test_round_trip_verifies(tmp_path):
+    path = str(tmp_path / "replays.msr")
+    rng = random.Random(1)
+    writer = ReplayWriter(path)
+    results = [play_recorded(writer, rng.getrandbits(32), 9, 9, 10, rng) for _ in range(20)]
+    writer.close()
+
+    replays = list(iter_replays(path))
+    assert [replay.result for replay in replays] == results
+    assert all(verify(replay) for replay in replays)
+
+
+def test_preset_mines_round_trip(tmp_path):
+    path = str(tmp_path / "replays.msr")
+    rng = random.Random(2)
+    board = Board(16, 16)
+    preset = board.place_mines(8, 8, 40, rng)
+    writer = ReplayWriter(path)
+    play_recorded(writer, 0, 16, 16, 40, rng, preset)
+    writer.close()
+
+    replay, = iter_replays(path)
+    assert replay.mine_positions == sorted(preset)
+    assert verify(replay)
+
+
+def test_wrong_result_fails_verify(tmp_path):
+    path = str(tmp_path / "replays.msr")
+    writer = ReplayWriter(path)
+    result = play_recorded(writer, 3, 9, 9, 10, random.Random(3))
+    writer.close()
+
+    replay, = iter_replays(path)
+    replay.result = LOST if result == WON else WON
+    assert not verify(replay)
+
+
+def test_writes_are_batched_until_game_end(tmp_path):
+    path = tmp_path / "replays.msr"
+    writer = ReplayWriter(str(path))
+    writer.reset_clock()
+    writer.start_game(5, 9, 9, 10)
+    for index in range(FLUSH_RECORDS // 2):
+        writer.click(RIGHT, index)
+    assert path.read_bytes() == MAGIC
+    writer.close()
+
+    replay, = iter_replays(str(path))
+    assert replay.result == ABANDONED
+    assert len(replay.clicks) == FLUSH_RECORDS // 2
@@ -0,0 +1,93 @@
+import os
+import random
+
+import pytest
+
+import minesweeper_save
+from minesweeper_board import Board
+from minesweeper_save import AutoSaver, load_snapshot, JOURNAL_SUFFIX, REGION_CELLS
+
+
+def game_state(board, clicks=0):
+    return {
+        "difficulty": "사용자 정의", "width": board.width, "height": board.height,
+        "mines": board.mine_count, "cell_size": 2, "first_click": False, "game_over": False,
+        "won": False, "no_guess": False, "seed": 7, "elapsed_ms": 1234,
+        "clicks": clicks, "mines_left": board.mine_count - board.flag_count,
+    }
+
+
+def make_board():
+    # 자동 저장 영역 여러 개에 걸치는 보드
+    board = Board(200, 150)
+    board.place_mines(75, 100, 3000, random.Random(4))
+    return board
+
+
+def assert_same(loaded, board):
+    assert bytes(loaded.cells) == bytes(board.cells)
+    for name in ("mine_count", "revealed_safe", "revealed_mines", "flag_count", "wrong_flags"):
+        assert getattr(loaded, name) == getattr(board, name)
+
+
+def test_partial_saves_load_back(tmp_path):
+    path = str(tmp_path / "savegame.mss")
+    board = make_board()
+    saver = AutoSaver(path)
+    saver.save(game_state(board), board)
+
+    rng = random.Random(5)
+    for clicks in range(1, 30):
+        row, col = rng.randrange(board.height), rng.randrange(board.width)
+        if rng.random() < 0.3:
+            board.set_flag(row, col, not board.is_flagged(row, col))
+            saver.mark([board.index(row, col)])
+        else:
+            saver.mark(board.reveal(row, col))
+        saver.save(game_state(board, clicks), board)
+        assert not os.path.exists(path + JOURNAL_SUFFIX)
+
+        state, loaded = load_snapshot(path)
+        assert state["clicks"] == clicks
+        assert_same(loaded, board)
+
+
+def test_interrupted_partial_save_is_replayed(tmp_path, monkeypatch):
+    path = str(tmp_path / "savegame.mss")
+    board = make_board()
+    saver = AutoSaver(path)
+    saver.save(game_state(board), board)
+
+    saver.mark(board.reveal(0, 0))
+    saver.mark(board.reveal(board.height - 1, board.width - 1))
+    apply_writes = minesweeper_save.apply_writes
+
+    def crash(target, writes):
+        # 첫 구간만 쓰고 종료된 것처럼
+        apply_writes(target, writes[:1])
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(minesweeper_save, "apply_writes", crash)
+    with pytest.raises(KeyboardInterrupt):
+        saver.save(game_state(board, 2), board)
+    monkeypatch.setattr(minesweeper_save, "apply_writes", apply_writes)
+    assert os.path.exists(path + JOURNAL_SUFFIX)
+
+    state, loaded = load_snapshot(path)
+    assert state["clicks"] == 2
+    assert_same(loaded, board)
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
+
+
+def test_torn_journal_is_discarded(tmp_path):
+    path = str(tmp_path / "savegame.mss")
+    board = make_board()
+    saver = AutoSaver(path)
+    saver.save(game_state(board, 1), board)
+    with open(path + JOURNAL_SUFFIX, "wb") as f:
+        f.write(minesweeper_save.JOURNAL_MAGIC + b"\x00\x00")
+
+    state, loaded = load_snapshot(path)
+    assert state["clicks"] == 1
+    assert_same(loaded, board)
+    assert not os.path.exists(path + JOURNAL_SUFFIX)
@@ -0,0 +1,63 @@
+import pytest
+
+from minesweeper_board import MINE, REVEALED, FLAG, NUMBER_MASK
+from minesweeper_world import EndlessBoard, ChunkStore, CHUNK_SIZE, CHUNK_SHIFT, CHUNK_MASK
+
+
+def is_mine(world, x, y):
+    return bool(world.chunk_mines(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)[y & CHUNK_MASK, x & CHUNK_MASK])
+
+
+@pytest.mark.parametrize("cx, cy", [(0, 0), (-1, 0), (0, -1), (-1, -1), (3, -5)])
+def test_numbers_count_mines_across_chunk_edges(cx, cy):
+    world = EndlessBoard(11)
+    # 청크 테두리 칸 (이웃 칸이 다른 청크에 있음)
+    edge = [0, CHUNK_SIZE - 1]
+    for ly in range(CHUNK_SIZE):
+        for lx in range(CHUNK_SIZE):
+            if lx not in edge and ly not in edge:
+                continue
+            x, y = cx * CHUNK_SIZE + lx, cy * CHUNK_SIZE + ly
+            cell = world.cell(x, y)
+            if is_mine(world, x, y):
+                assert cell & MINE
+                continue
+            expected = sum(is_mine(world, x + dx, y + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+            assert cell & NUMBER_MASK == expected
+
+
+def test_start_is_safe_and_cascade_crosses_chunks():
+    world = EndlessBoard(3, density=0.12)
+    for y in (-1, 0, 1):
+        for x in (-1, 0, 1):
+            assert not is_mine(world, x, y)
+    changed = world.reveal(0, 0)
+    # 시작 지점 (0, 0)은 네 청크가 만나는 곳이라 주변 3x3만 열려도 여러 청크에 걸침
+    assert len({(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT) for x, y in changed}) >= 4
+    assert world.revealed_safe == len(changed) == len(set(changed))
+    for x, y in changed:
+        assert world.cell(x, y) & REVEALED
+        assert not world.cell(x, y) & MINE
+
+
+def test_reopened_world_keeps_changes(tmp_path):
+    path = str(tmp_path / "endless_chunks")
+    store = ChunkStore(path)
+    world = EndlessBoard(21, store=store, max_chunks=4)
+    changed = world.reveal(0, 0)
+    assert world.toggle_flag(5 * CHUNK_SIZE, 5 * CHUNK_SIZE)
+    # 멀리 있는 청크를 읽어서 바뀐 청크가 저장소로 내보내지게 함
+    for i in range(10):
+        world.cell(-20 * CHUNK_SIZE, i * CHUNK_SIZE)
+    world.evict()
+    world.flush()
+    store.close()
+
+    store = ChunkStore(path)
+    reopened = EndlessBoard.reopen(store)
+    assert reopened.seed == 21
+    assert reopened.revealed_safe == world.revealed_safe
+    assert reopened.flag_count == 1
+    assert reopened.cell(5 * CHUNK_SIZE, 5 * CHUNK_SIZE) & FLAG
+    assert all(reopened.cell(x, y) & REVEALED for x, y in changed)
+    store.close()